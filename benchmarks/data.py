@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import datetime
+import json
+import random
+import sqlite3
+from collections.abc import Generator
+
+from growth_job_pipeline.models.enums.crop import Crop
+from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+    TelemetryMeasurementType,
+)
+from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+    TelemetryMeasurementUnit,
+)
+from growth_job_pipeline.models.enums.weight_unit import WeightUnit
+from growth_job_pipeline.telemetry_db.backends.sqlite import (
+    create_telemetry_table,
+    insert_telemetry_rows,
+)
+
+# telemetry is read every 30 seconds in the farms
+TELEMETRY_INTERVAL = datetime.timedelta(seconds=30)
+
+
+def generate_yield_results_and_growth_jobs(
+    start_date: datetime.date,
+    days: int,
+    cycle_days: int = 14,
+    seed: int = 0,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Returns yield results and growth jobs for every crop over days from start_date
+    Each crop grows back to back cycle_days jobs, staggered across crops, each job
+    ending the day before its yield is recorded so the matcher pairs them one to one
+    :param start_date: datetime.date
+    :param days: int
+    :param cycle_days: int
+    :param seed: int, for yield weights
+    :return: tuple[list[dict], list[dict]], yield result and growth job JSON objects
+    """
+    rng = random.Random(seed)
+    end_date = start_date + datetime.timedelta(days=days)
+    yield_results = []
+    growth_jobs = []
+    for crop_index, crop in enumerate(Crop):
+        cycle_start = start_date + datetime.timedelta(
+            days=crop_index * cycle_days // len(Crop)
+        )
+        while True:
+            yield_date = cycle_start + datetime.timedelta(days=cycle_days)
+            if yield_date >= end_date:
+                break
+            growth_jobs.append(
+                {
+                    "id": len(growth_jobs) + 1,
+                    "crop": crop.value,
+                    "start_date": datetime.datetime.combine(
+                        cycle_start, datetime.time(6)
+                    ).isoformat(),
+                    "end_date": datetime.datetime.combine(
+                        yield_date - datetime.timedelta(days=1),
+                        datetime.time(18),
+                    ).isoformat(),
+                }
+            )
+            yield_results.append(
+                {
+                    "date": yield_date.isoformat(),
+                    "crop": crop.value,
+                    "weight": round(rng.uniform(50, 500), 2),
+                    "unit": WeightUnit.kg.value,
+                }
+            )
+            cycle_start = yield_date
+    yield_results.sort(key=lambda result: result["date"])
+    return yield_results, growth_jobs
+
+
+def write_yield_results_tsv(path: str, yield_results: list[dict]) -> None:
+    """
+    Writes yield results in the yield results file format
+    :param path: str
+    :param yield_results: list[dict]
+    :return: None
+    """
+    columns = ["date", "crop", "weight", "unit"]
+    with open(path, "w") as file:
+        file.write("\t".join(columns) + "\n")
+        for result in yield_results:
+            file.write(
+                "\t".join(str(result[column]) for column in columns) + "\n"
+            )
+
+
+def write_growth_jobs_json(path: str, growth_jobs: list[dict]) -> None:
+    """
+    Writes growth jobs as served by the growth jobs API
+    :param path: str
+    :param growth_jobs: list[dict]
+    :return: None
+    """
+    with open(path, "w") as file:
+        json.dump(growth_jobs, file)
+
+
+def generate_telemetry_rows(
+    start_date: datetime.date,
+    days: int,
+    type_to_generate: TelemetryMeasurementType,
+    unit_to_generate: TelemetryMeasurementUnit,
+    seed: int = 0,
+) -> Generator[tuple, None, None]:
+    """
+    Yields (timestamp, type, value, unit) readings every TELEMETRY_INTERVAL over days
+    :param start_date: datetime.date
+    :param days: int
+    :param type_to_generate: TelemetryMeasurementType
+    :param unit_to_generate: TelemetryMeasurementUnit
+    :param seed: int, for reading values
+    :return: Generator[tuple, None, None]
+    """
+    rng = random.Random(seed)
+    timestamp = datetime.datetime.combine(start_date, datetime.time())
+    end_timestamp = timestamp + datetime.timedelta(days=days)
+    while timestamp < end_timestamp:
+        yield (
+            timestamp,
+            type_to_generate,
+            round(rng.gauss(21.0, 1.5), 3),
+            unit_to_generate,
+        )
+        timestamp += TELEMETRY_INTERVAL
+
+
+def write_telemetry_db(
+    path: str,
+    start_date: datetime.date,
+    days: int,
+    type_to_generate: TelemetryMeasurementType,
+    unit_to_generate: TelemetryMeasurementUnit,
+    seed: int = 0,
+) -> int:
+    """
+    Writes a SQLite telemetry DB of readings every TELEMETRY_INTERVAL over days
+    Returns number of readings written
+    :param path: str
+    :param start_date: datetime.date
+    :param days: int
+    :param type_to_generate: TelemetryMeasurementType
+    :param unit_to_generate: TelemetryMeasurementUnit
+    :param seed: int
+    :return: int
+    """
+    connection = sqlite3.connect(path)
+    try:
+        create_telemetry_table(connection)
+        insert_telemetry_rows(
+            connection,
+            generate_telemetry_rows(
+                start_date=start_date,
+                days=days,
+                type_to_generate=type_to_generate,
+                unit_to_generate=unit_to_generate,
+                seed=seed,
+            ),
+        )
+        return connection.execute("SELECT COUNT(*) FROM telemetry").fetchone()[
+            0
+        ]
+    finally:
+        connection.close()
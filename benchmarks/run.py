@@ -0,0 +1,436 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import glob
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.data import (
+    generate_yield_results_and_growth_jobs,
+    write_telemetry_db,
+    write_yield_results_tsv,
+)
+from benchmarks.stub_server import serve_growth_jobs
+from growth_job_pipeline.config import load_settings
+from growth_job_pipeline.main import (
+    main,
+    match_yield_results_growth_jobs_gen_specs,
+    telemetry_entry_to_output_rows,
+)
+from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+    TelemetryMeasurementType,
+)
+from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+    TelemetryMeasurementUnit,
+)
+from growth_job_pipeline.models.records.job_to_output_rows_spec import (
+    JobToOutputRowsSpecRecord,
+)
+from growth_job_pipeline.models.records.telemetry_columns import (
+    TelemetryColumns,
+)
+from growth_job_pipeline.output_writers import (
+    telemetry_columns_to_output_rows,
+)
+from growth_job_pipeline.telemetry_db.backends.sqlite import (
+    SqliteTelemetryBackend,
+)
+from growth_job_pipeline.telemetry_db.columnar import rows_to_columns
+from growth_job_pipeline.telemetry_db.db import get_validated_entries
+from growth_job_pipeline.yield_tsv_reader import get_ascending_yield_results
+
+logger = logging.getLogger(__name__)
+
+START_DATE = datetime.date(2022, 1, 1)
+TYPE_TO_FETCH = TelemetryMeasurementType.temp
+UNIT_TO_FETCH = TelemetryMeasurementUnit.C
+BATCH_SIZE = 1000
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def best_of(repeat: int, func: Callable[[], int]) -> tuple[float, int]:
+    """
+    Runs func repeat times, returns the fastest time and the count func returned
+    :param repeat: int
+    :param func: Callable[[], int], returns number of rows handled
+    :return: tuple[float, int]
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), count
+
+
+def stage_result(seconds: float, rows: int) -> dict[str, Any]:
+    """
+    Returns a stage's timing and throughput
+    :param seconds: float
+    :param rows: int
+    :return: dict[str, Any]
+    """
+    return {
+        "seconds": round(seconds, 6),
+        "rows": rows,
+        "rows_per_second": round(rows / seconds, 1) if seconds else None,
+    }
+
+
+def run_end_to_end(work_dir: str, columnar: bool) -> dict[str, Any]:
+    """
+    Runs the whole pipeline against the configured stand-ins, returns its metrics
+    :param work_dir: str
+    :param columnar: bool
+    :return: dict[str, Any], the metrics written to run data
+    """
+    output_dir = tempfile.mkdtemp(dir=work_dir, prefix="output_")
+    os.environ["OUTPUT_DIR"] = output_dir
+    os.environ["TELEMETRY_DB_COLUMNAR"] = str(columnar).lower()
+    main([])
+    (run_data_path,) = glob.glob(os.path.join(output_dir, "*", "run_data_*"))
+    with open(run_data_path) as file:
+        return json.load(file)["metrics"]
+
+
+def benchmark_scale(days: int, repeat: int, work_dir: str) -> dict[str, Any]:
+    """
+    Generates data for days of telemetry, benchmarks each stage and the whole pipeline
+    :param days: int
+    :param repeat: int
+    :param work_dir: str
+    :return: dict[str, Any]
+    """
+    yield_results, growth_jobs = generate_yield_results_and_growth_jobs(
+        start_date=START_DATE, days=days
+    )
+    yield_results_path = os.path.join(work_dir, "yield_results.tsv")
+    write_yield_results_tsv(yield_results_path, yield_results)
+    telemetry_db_path = os.path.join(work_dir, "telemetry.db")
+    num_readings = write_telemetry_db(
+        telemetry_db_path,
+        start_date=START_DATE,
+        days=days,
+        type_to_generate=TYPE_TO_FETCH,
+        unit_to_generate=UNIT_TO_FETCH,
+    )
+    logger.warning(
+        f"days={days}: {len(yield_results)} yield results,"
+        f" {num_readings} telemetry readings"
+    )
+    os.environ.update(
+        YIELD_RESULTS_FILE=yield_results_path,
+        TELEMETRY_DB_BACKEND="sqlite",
+        TELEMETRY_DB_SQLITE_PATH=telemetry_db_path,
+        TELEMETRY_DB_BATCH_SIZE=str(BATCH_SIZE),
+        MEASUREMENT_TYPE=TYPE_TO_FETCH.value,
+        MEASUREMENT_UNIT=UNIT_TO_FETCH.value,
+        DEBUG="false",
+    )
+
+    stages = {}
+    with serve_growth_jobs(growth_jobs) as growth_jobs_api_url:
+        os.environ["GROWTH_JOBS_API_URL"] = growth_jobs_api_url
+        # main reloads settings per run, the stages below read them directly
+        load_settings()
+
+        all_yield_results = []
+
+        def read_yield_results() -> int:
+            all_yield_results[:] = get_ascending_yield_results(
+                from_timestamp=datetime.datetime.min,
+                to_timestamp=datetime.datetime.max,
+            )
+            return len(all_yield_results)
+
+        stages["yield_results_read"] = stage_result(
+            *best_of(repeat, read_yield_results)
+        )
+
+        specs = []
+
+        def match() -> int:
+            specs[:] = match_yield_results_growth_jobs_gen_specs(
+                all_yield_results_ascending=all_yield_results,
+                from_timestamp=datetime.datetime.min,
+                to_timestamp=datetime.datetime.max,
+            )
+            return len(specs)
+
+        stages["growth_jobs_match"] = stage_result(*best_of(repeat, match))
+
+        backend = SqliteTelemetryBackend(path=telemetry_db_path)
+        cursor = backend.connect()
+        db_rows = backend.execute(
+            cursor,
+            backend.select_query(paged=False),
+            (
+                datetime.datetime.min,
+                datetime.datetime.max,
+                TYPE_TO_FETCH,
+                UNIT_TO_FETCH,
+            ),
+        ).fetchall()
+        cursor.connection.close()
+        db_row_batches = [
+            db_rows[i : i + BATCH_SIZE]
+            for i in range(0, len(db_rows), BATCH_SIZE)
+        ]
+        # as fetched through the DB-API, with timestamps converted from text
+        row_batches = [
+            [(backend.timestamp_from_db(ts), value) for ts, value in batch]
+            for batch in db_row_batches
+        ]
+        constant_fields = {"type": TYPE_TO_FETCH, "unit": UNIT_TO_FETCH}
+        entry_batches = []
+
+        def validate_entries() -> int:
+            entry_batches[:] = [
+                get_validated_entries(
+                    list(backend.select_columns), batch, i, constant_fields
+                )
+                for i, batch in enumerate(row_batches)
+            ]
+            return len(db_rows)
+
+        stages["validate_entries"] = stage_result(
+            *best_of(repeat, validate_entries)
+        )
+
+        spec_records = [
+            JobToOutputRowsSpecRecord.from_spec(spec) for spec in specs
+        ]
+
+        def write_entries() -> int:
+            writer = csv.writer(io.StringIO())
+            return sum(
+                telemetry_entry_to_output_rows(
+                    writer=writer,
+                    telemetry_entry=entry,
+                    job_to_output_rows_specs=spec_records,
+                )
+                for batch in entry_batches
+                for entry in batch
+            )
+
+        # rows per second of telemetry readings in, as for the other stages
+        seconds, output_rows = best_of(repeat, write_entries)
+        stages["entries_to_output_rows"] = {
+            **stage_result(seconds, len(db_rows)),
+            "output_rows": output_rows,
+        }
+
+        column_batches = [
+            TelemetryColumns(
+                *rows_to_columns(
+                    rows=batch,
+                    column_names=backend.select_columns,
+                    backend=backend,
+                ),
+                type=TYPE_TO_FETCH,
+                unit=UNIT_TO_FETCH,
+            )
+            for batch in db_row_batches
+        ]
+
+        def write_columns() -> int:
+            writer = csv.writer(io.StringIO())
+            return sum(
+                telemetry_columns_to_output_rows(
+                    writer=writer,
+                    columns=columns,
+                    job_to_output_rows_specs=spec_records,
+                )
+                for columns in column_batches
+            )
+
+        seconds, output_rows = best_of(repeat, write_columns)
+        stages["columns_to_output_rows"] = {
+            **stage_result(seconds, len(db_rows)),
+            "output_rows": output_rows,
+        }
+
+        for name, columnar in [
+            ("end_to_end", False),
+            ("end_to_end_columnar", True),
+        ]:
+            runs = [run_end_to_end(work_dir, columnar) for _ in range(repeat)]
+            metrics = min(runs, key=lambda run: run["wall_time_seconds"])
+            stages[name] = {
+                **stage_result(
+                    metrics["wall_time_seconds"],
+                    metrics["stages"]["telemetry_fetch"]["rows_fetched"],
+                ),
+                "stages": metrics["stages"],
+            }
+
+    return {
+        "days": days,
+        "yield_results": len(yield_results),
+        "telemetry_readings": num_readings,
+        "stages": stages,
+    }
+
+
+def measure_cold_start(repeat: int) -> float:
+    """
+    Returns the fastest time to import the pipeline in a fresh interpreter, seconds
+    Includes interpreter startup, as paid by every scheduled run
+    :param repeat: int
+    :return: float
+    """
+
+    def import_main() -> int:
+        subprocess.run(
+            [sys.executable, "-c", "import growth_job_pipeline.main"],
+            check=True,
+        )
+        return 0
+
+    seconds, _ = best_of(repeat, import_main)
+    return round(seconds, 6)
+
+
+def get_git_commit() -> str | None:
+    """
+    Returns the checked out commit hash, None if not in a git checkout
+    :return: str | None
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(results: dict, baseline: dict) -> list[str]:
+    """
+    Returns lines comparing rows per second of each stage with a baseline run
+    :param results: dict
+    :param baseline: dict
+    :return: list[str]
+    """
+    baseline_scales = {scale["days"]: scale for scale in baseline["scales"]}
+    lines = [
+        f"{'days':>6} {'stage':<24} {'baseline/s':>12} {'rows/s':>12}"
+        f" {'change':>8}"
+    ]
+    for scale in results["scales"]:
+        baseline_scale = baseline_scales.get(scale["days"])
+        if baseline_scale is None:
+            continue
+        for name, stage in scale["stages"].items():
+            baseline_stage = baseline_scale["stages"].get(name)
+            if baseline_stage is None or not baseline_stage["rows_per_second"]:
+                continue
+            change = (
+                stage["rows_per_second"] / baseline_stage["rows_per_second"]
+                - 1
+            )
+            lines.append(
+                f"{scale['days']:>6} {name:<24}"
+                f" {baseline_stage['rows_per_second']:>12.0f}"
+                f" {stage['rows_per_second']:>12.0f} {change:>+8.1%}"
+            )
+    return lines
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parses command line arguments
+    :param argv: list[str] | None, defaults to sys.argv
+    :return: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(prog="benchmarks.run")
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=[30, 90, 180],
+        metavar="DAYS",
+        help="Days of yield results, growth jobs and telemetry per scale",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output-dir",
+        default=RESULTS_DIR,
+        help="Dir results are stored in, one JSON file per benchmark run",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="RESULTS_FILE",
+        default=None,
+        help="Earlier results file to compare rows per second against",
+    )
+    return parser.parse_args(argv)
+
+
+def run_benchmarks(argv: list[str] | None = None) -> str:
+    """
+    Runs benchmarks at each scale, stores results and returns the results file path
+    :param argv: list[str] | None, defaults to sys.argv
+    :return: str
+    """
+    args = parse_args(argv)
+    # keeps the pipeline's own logger setup from logging every run to stdout
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    created = datetime.datetime.now()
+    commit = get_git_commit()
+    scales = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for days in args.scales:
+            scale_dir = os.path.join(work_dir, f"days_{days}")
+            os.makedirs(scale_dir)
+            scales.append(benchmark_scale(days, args.repeat, scale_dir))
+    results = {
+        "commit": commit,
+        "created": created.isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "cold_start_seconds": measure_cold_start(args.repeat),
+        "scales": scales,
+    }
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    results_path = os.path.join(
+        args.output_dir,
+        f"{created.strftime('%Y%m%dT%H%M%S')}_{commit or 'nocommit'}.json",
+    )
+    with open(results_path, "w") as file:
+        file.write(json.dumps(results, indent=4))
+
+    for scale in scales:
+        for name, stage in scale["stages"].items():
+            print(
+                f"days={scale['days']:<5} {name:<24}"
+                f" {stage['rows']:>9} rows {stage['seconds']:>9.3f}s"
+                f" {stage['rows_per_second'] or 0:>12.0f} rows/s"
+            )
+    print(f"cold start {results['cold_start_seconds']:.3f}s")
+    if args.compare is not None:
+        with open(args.compare) as file:
+            print("\n".join(compare_results(results, json.load(file))))
+    print(f"Results stored in {results_path}")
+    return results_path
+
+
+if __name__ == "__main__":
+    run_benchmarks(sys.argv[1:])
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@contextmanager
+def serve_growth_jobs(growth_jobs: list[dict]) -> Generator[str, None, None]:
+    """
+    Serves growth jobs on a local stub of the growth jobs API, yields its /jobs URL
+    :param growth_jobs: list[dict]
+    :return: Generator[str, None, None]
+    """
+    body = json.dumps(growth_jobs).encode()
+
+    class GrowthJobsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path != "/jobs":
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GrowthJobsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/jobs"
+    finally:
+        server.shutdown()
+        server.server_close()
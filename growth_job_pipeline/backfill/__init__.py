@@ -0,0 +1 @@
+from .backfill import run_backfill_extraction, split_backfill_windows
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import logging
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, TYPE_CHECKING
+from uuid import UUID
+
+from growth_job_pipeline.config import get_settings, use_settings
+from growth_job_pipeline.logger import setup_logger
+from growth_job_pipeline.main import (
+    OUTPUT_COMPRESSION_EXTENSIONS,
+    write_telemetry_batch,
+)
+from growth_job_pipeline.metrics import run_metrics
+from growth_job_pipeline.models.enums.telemetry_pagination import (
+    TelemetryPagination,
+)
+from growth_job_pipeline.models.records.job_to_output_rows_spec import (
+    JobToOutputRowsSpecRecord,
+)
+from growth_job_pipeline.models.validators.output_row import output_columns
+from growth_job_pipeline.output_writers import OutputFile
+from growth_job_pipeline.telemetry_db import (
+    resumable_telemetry_entries_batcher,
+    TelemetryConnection,
+)
+
+if TYPE_CHECKING:
+    from growth_job_pipeline.metrics.metrics import StageMetrics
+    from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+        TelemetryMeasurementType,
+    )
+    from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+        TelemetryMeasurementUnit,
+    )
+    from growth_job_pipeline.models.validators.job_to_output_rows_spec import (
+        JobToOutputRowsSpec,
+    )
+    from growth_job_pipeline.models.validators.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# more windows than workers, so a worker finishing a short window takes another
+WINDOWS_PER_WORKER = 4
+PARTS_DIR_NAME = "parts"
+
+# the worker process's own connection, reused for every window it extracts
+_worker_connection: TelemetryConnection | None = None
+
+
+class BackfillWindow(NamedTuple):
+    """
+    Represents a telemetry range extracted by one worker, covering whole growth jobs
+    Attributes:
+        index: int, position in the output
+        from_timestamp: datetime.datetime
+        to_timestamp: datetime.datetime
+        specs: list[JobToOutputRowsSpecRecord], of jobs in range, in matched order
+    """
+
+    index: int
+    from_timestamp: datetime.datetime
+    to_timestamp: datetime.datetime
+    specs: list[JobToOutputRowsSpecRecord]
+
+
+def split_backfill_windows(
+    job_to_output_rows_specs: list[JobToOutputRowsSpec], num_windows: int
+) -> list[BackfillWindow]:
+    """
+    Splits the specs' telemetry range into up to num_windows windows of similar length
+    Jobs overlapping in time are kept in one window, so no job is split and no
+    telemetry entry is in two windows: output rows from the windows in order are the
+    rows a single run writes. Gaps between jobs, with no rows to write, are skipped
+    :param job_to_output_rows_specs: list[JobToOutputRowsSpec]
+    :param num_windows: int
+    :return: list[BackfillWindow], ascending time
+    """
+    # groups of overlapping jobs: (from, to, indexes into job_to_output_rows_specs)
+    groups: list[tuple[datetime.datetime, datetime.datetime, list[int]]] = []
+    for index, spec in sorted(
+        enumerate(job_to_output_rows_specs),
+        key=lambda item: item[1].growth_job_start_date,
+    ):
+        if groups and spec.growth_job_start_date <= groups[-1][1]:
+            from_timestamp, to_timestamp, indexes = groups[-1]
+            groups[-1] = (
+                from_timestamp,
+                max(to_timestamp, spec.growth_job_end_date),
+                indexes + [index],
+            )
+        else:
+            groups.append(
+                (
+                    spec.growth_job_start_date,
+                    spec.growth_job_end_date,
+                    [index],
+                )
+            )
+
+    target_length = (
+        sum((to - from_ for from_, to, _ in groups), datetime.timedelta())
+        / num_windows
+    )
+    windowed_groups: list[list[tuple]] = [[]]
+    window_length = datetime.timedelta()
+    for group in groups:
+        if (
+            windowed_groups[-1]
+            and window_length >= target_length
+            and len(windowed_groups) < num_windows
+        ):
+            windowed_groups.append([])
+            window_length = datetime.timedelta()
+        windowed_groups[-1].append(group)
+        window_length += group[1] - group[0]
+
+    return [
+        BackfillWindow(
+            index=window_index,
+            from_timestamp=window_groups[0][0],
+            to_timestamp=max(to for _, to, _ in window_groups),
+            # matched order, as a single run writes rows for a timestamp in
+            specs=[
+                JobToOutputRowsSpecRecord.from_spec(
+                    job_to_output_rows_specs[index]
+                )
+                for index in sorted(
+                    index
+                    for _, _, indexes in window_groups
+                    for index in indexes
+                )
+            ],
+        )
+        for window_index, window_groups in enumerate(windowed_groups)
+        if window_groups
+    ]
+
+
+def init_backfill_worker(
+    settings: Settings, run_output_dir_path: str, run_id: UUID
+) -> None:
+    """
+    Sets up a worker process with its parent's settings, the run's log and its own
+    telemetry DB connection
+    :param settings: Settings
+    :param run_output_dir_path: str
+    :param run_id: UUID
+    :return: None
+    """
+    global _worker_connection
+    use_settings(settings)
+    # a forked worker inherits handlers queueing to its parent's listener thread,
+    # which does not run in the worker
+    logging.getLogger().handlers.clear()
+    setup_logger(run_output_dir_path=run_output_dir_path, run_id=run_id)
+    _worker_connection = TelemetryConnection()
+
+
+def extract_backfill_window(
+    window: BackfillWindow,
+    telemetry_type_to_fetch: TelemetryMeasurementType,
+    telemetry_unit_to_fetch: TelemetryMeasurementUnit,
+    part_file: str,
+) -> dict[str, StageMetrics]:
+    """
+    Writes output rows for window to part_file, without header. Run in a worker
+    :param window: BackfillWindow
+    :param telemetry_type_to_fetch: TelemetryMeasurementType
+    :param telemetry_unit_to_fetch: TelemetryMeasurementUnit
+    :param part_file: str
+    :return: dict[str, StageMetrics], the worker's stage metrics for window
+    """
+    settings = get_settings()
+    run_metrics.reset(
+        memory_budget=(
+            settings.memory_budget_mb * 1024 * 1024
+            if settings.memory_budget_mb is not None
+            else None
+        )
+    )
+    columnar = settings.telemetry_db_columnar
+    telemetry_batches = resumable_telemetry_entries_batcher(
+        type_to_fetch=telemetry_type_to_fetch,
+        unit_to_fetch=telemetry_unit_to_fetch,
+        batch_size=settings.telemetry_db_batch_size,
+        from_timestamp=window.from_timestamp,
+        to_timestamp=window.to_timestamp,
+        max_reconnects=settings.telemetry_db_max_reconnects,
+        pagination=TelemetryPagination(settings.telemetry_db_pagination),
+        columnar=columnar,
+        use_arrow=settings.telemetry_db_arrow,
+        connection=_worker_connection,
+    )
+    rows_written = 0
+    with OutputFile(part_file, settings.output_compression) as file:
+        writer = csv.writer(file)
+        for batch in run_metrics.timed_iter(
+            telemetry_batches, "telemetry_fetch"
+        ):
+            with run_metrics.stage("output_write") as stage_metrics:
+                (
+                    batch_rows_fetched,
+                    batch_rows_written,
+                    _,
+                ) = write_telemetry_batch(
+                    writer=writer,
+                    batch=batch,
+                    job_to_output_rows_specs=window.specs,
+                    columnar=columnar,
+                )
+                rows_written += batch_rows_written
+                bytes_written = file.bytes_written
+                file.flush()
+                stage_metrics.counters["rows_written"] += batch_rows_written
+                stage_metrics.counters["bytes_written"] += (
+                    file.bytes_written - bytes_written
+                )
+            fetch_counters = run_metrics.stages["telemetry_fetch"].counters
+            fetch_counters["batches"] += 1
+            fetch_counters["rows_fetched"] += batch_rows_fetched
+    if settings.output_compression != "none":
+        run_metrics.merge_stages({"output_compress": file.compress_metrics})
+    logger.info(
+        f"Window {window.index} from timestamp={window.from_timestamp} to"
+        f" timestamp={window.to_timestamp} done, rows_written={rows_written}"
+    )
+    return run_metrics.stages
+
+
+def run_backfill_extraction(
+    run_id: UUID,
+    run_output_dir_path: str,
+    output_file: str,
+    job_to_output_rows_specs: list[JobToOutputRowsSpec],
+    telemetry_type_to_fetch: TelemetryMeasurementType,
+    telemetry_unit_to_fetch: TelemetryMeasurementUnit,
+) -> list[dict]:
+    """
+    Extracts telemetry for the specs in windows across BACKFILL_WORKERS worker
+    processes set in config, each with its own telemetry DB connection, then merges
+    the windows' rows into output_file and their metrics into run_metrics
+    Raises the first window's error, if any, cancelling windows not started
+    :param run_id: UUID
+    :param run_output_dir_path: str
+    :param output_file: str
+    :param job_to_output_rows_specs: list[JobToOutputRowsSpec]
+    :param telemetry_type_to_fetch: TelemetryMeasurementType
+    :param telemetry_unit_to_fetch: TelemetryMeasurementUnit
+    :return: list[dict], per window, for run data
+    """
+    settings = get_settings()
+    windows = split_backfill_windows(
+        job_to_output_rows_specs=job_to_output_rows_specs,
+        num_windows=settings.backfill_workers * WINDOWS_PER_WORKER,
+    )
+    num_workers = min(settings.backfill_workers, len(windows))
+    logger.info(
+        f"Backfilling {len(job_to_output_rows_specs)} growth jobs in"
+        f" {len(windows)} windows with {num_workers} workers"
+    )
+    parts_dir_path = os.path.join(run_output_dir_path, PARTS_DIR_NAME)
+    os.makedirs(parts_dir_path, exist_ok=True)
+    part_files = [
+        os.path.join(
+            parts_dir_path,
+            f"part_{window.index:05d}.csv"
+            + OUTPUT_COMPRESSION_EXTENSIONS[settings.output_compression],
+        )
+        for window in windows
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers=num_workers,
+        initializer=init_backfill_worker,
+        initargs=(settings, run_output_dir_path, run_id),
+    ) as pool:
+        futures = [
+            pool.submit(
+                extract_backfill_window,
+                window,
+                telemetry_type_to_fetch,
+                telemetry_unit_to_fetch,
+                part_file,
+            )
+            for window, part_file in zip(windows, part_files)
+        ]
+        try:
+            window_stages = [future.result() for future in futures]
+        except Exception as e:
+            logger.error(f"Error: {e}. Backfill window failed")
+            pool.shutdown(cancel_futures=True)
+            raise e
+
+    for stages in window_stages:
+        run_metrics.merge_stages(stages)
+    with run_metrics.stage("output_merge"):
+        with OutputFile(output_file, settings.output_compression) as file:
+            csv.writer(file).writerow(output_columns)
+        # compressed parts are whole gzip members or zstd frames, concatenated as is
+        with open(output_file, "ab") as file:
+            for part_file in part_files:
+                with open(part_file, "rb") as part:
+                    shutil.copyfileobj(part, file)
+        shutil.rmtree(parts_dir_path)
+
+    return [
+        {
+            "from_timestamp": window.from_timestamp.isoformat(),
+            "to_timestamp": window.to_timestamp.isoformat(),
+            "num_growth_jobs": len(window.specs),
+            "rows_written": stages["output_write"].counters["rows_written"]
+            if "output_write" in stages
+            else 0,
+        }
+        for window, stages in zip(windows, window_stages)
+    ]
@@ -0,0 +1 @@
+from .checkpoint import read_checkpoint, write_checkpoint
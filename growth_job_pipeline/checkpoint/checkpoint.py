@@ -0,0 +1,60 @@
+import logging
+import os
+
+from pydantic import ValidationError
+
+from growth_job_pipeline.models.validators.extraction_checkpoint import (
+    ExtractionCheckpoint,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE_NAME = "checkpoint.json"
+
+
+def get_checkpoint_path(run_output_dir_path: str) -> str:
+    """
+    Returns the path of the checkpoint file in run_output_dir
+    :param run_output_dir_path: str
+    :return: str
+    """
+    return os.path.join(run_output_dir_path, CHECKPOINT_FILE_NAME)
+
+
+def write_checkpoint(
+    run_output_dir_path: str, checkpoint: ExtractionCheckpoint
+) -> None:
+    """
+    Atomically writes checkpoint file in run_output_dir
+    Written to a temp file then renamed, so a crash never leaves a partial checkpoint
+    :param run_output_dir_path: str
+    :param checkpoint: ExtractionCheckpoint
+    :return: None
+    """
+    checkpoint_path = get_checkpoint_path(run_output_dir_path)
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, "w") as file:
+        file.write(checkpoint.model_dump_json(indent=4))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+
+def read_checkpoint(run_output_dir_path: str) -> ExtractionCheckpoint | None:
+    """
+    Reads checkpoint file from run_output_dir, returns None if no checkpoint written
+    :param run_output_dir_path: str
+    :return: ExtractionCheckpoint | None
+    """
+    checkpoint_path = get_checkpoint_path(run_output_dir_path)
+    if not os.path.exists(checkpoint_path):
+        return None
+    try:
+        with open(checkpoint_path, "r") as file:
+            return ExtractionCheckpoint.model_validate_json(file.read())
+    except IOError as e:
+        logger.error(f"Cannot read checkpoint file={checkpoint_path}")
+        raise e
+    except ValidationError as e:
+        logger.error(f"Error {e}. Cannot validate checkpoint.")
+        raise e
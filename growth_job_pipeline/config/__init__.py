@@ -1 +1,2 @@
 from .config import config
+from .settings import get_settings, load_settings, use_settings
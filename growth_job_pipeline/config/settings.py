@@ -0,0 +1,54 @@
+import logging
+
+from pydantic import ValidationError
+
+from growth_job_pipeline.config.config import config
+from growth_job_pipeline.models.validators.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# loaded on first use, or again by load_settings at the start of each run
+_settings: Settings | None = None
+
+
+def load_settings() -> Settings:
+    """
+    Reads and validates every config value, environment variables overriding the
+    .env file, and keeps them as the settings get_settings returns
+    Unset and empty keys take the Settings default. Raises ValidationError on
+    misconfiguration, so a run fails before doing any work
+    :return: Settings
+    """
+    global _settings
+    values = {}
+    for name in Settings.model_fields:
+        value = config(name.upper(), default=None)
+        if value is not None and value != "":
+            values[name] = value
+    try:
+        _settings = Settings(**values)
+    except ValidationError as e:
+        logger.error(f"Error: {e}. Invalid config")
+        raise e
+    return _settings
+
+
+def get_settings() -> Settings:
+    """
+    Returns the settings loaded by load_settings, loading them on first call
+    :return: Settings
+    """
+    if _settings is None:
+        return load_settings()
+    return _settings
+
+
+def use_settings(settings: Settings) -> None:
+    """
+    Keeps settings as those get_settings returns, e.g. in a worker process, so it
+    runs with the settings its parent validated
+    :param settings: Settings
+    :return: None
+    """
+    global _settings
+    _settings = settings
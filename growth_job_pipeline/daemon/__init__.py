@@ -0,0 +1 @@
+from .daemon import get_daemon_window, run_daemon
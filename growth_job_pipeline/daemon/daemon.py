@@ -0,0 +1,144 @@
+import datetime
+import logging
+import os
+import signal
+import threading
+from uuid import uuid4
+
+from growth_job_pipeline.config import get_settings
+from growth_job_pipeline.logger import setup_logger
+from growth_job_pipeline.main import execute_run, setup_run_output_dir
+from growth_job_pipeline.models.validators.config_timestamps import (
+    ConfigTimestamps,
+)
+from growth_job_pipeline.telemetry_db import TelemetryConnection
+from growth_job_pipeline.utils import get_incremental_timestamps
+from growth_job_pipeline.yield_tsv_reader import YieldResultsFileCache
+
+logger = logging.getLogger(__name__)
+
+
+def get_daemon_window(
+    output_dir_path: str, now: datetime.datetime
+) -> ConfigTimestamps | None:
+    """
+    Returns the next window of yield results to process, from the watermark (or
+    FROM_TIMESTAMP set in config if none written) to now, capped at TO_TIMESTAMP
+    Returns None if the window is empty
+    :param output_dir_path: str
+    :param now: datetime.datetime
+    :return: ConfigTimestamps | None, incremental
+    """
+    window = get_incremental_timestamps(output_dir_path, now=now)
+    if (
+        window.from_timestamp is not None
+        and window.to_timestamp <= window.from_timestamp
+    ):
+        return None
+    return window
+
+
+def run_daemon(
+    max_runs: int | None = None, stop_event: threading.Event | None = None
+) -> int:
+    """
+    Runs the pipeline every DAEMON_INTERVAL_SECONDS set in config, until stopped by
+    SIGTERM/SIGINT, stop_event or after max_runs. Each run processes the window since
+    the last successful one, advancing the watermark in OUTPUT_DIR on success. A
+    failed run is logged and its window retried on the next. The telemetry DB
+    connection, HTTP session, parsed yield results and growth job index (if
+    GROWTH_JOBS_CACHE_SECONDS is set) are kept between runs
+    :param max_runs: int | None, runs attempted, including any with empty windows
+    :param stop_event: threading.Event | None, set to stop after the current run
+    :return: int, number of runs failed
+    """
+    settings = get_settings()
+    output_dir_path = settings.output_dir
+    os.makedirs(output_dir_path, exist_ok=True)
+    daemon_id = uuid4()
+    # runs share the daemon's log, in OUTPUT_DIR
+    setup_logger(run_output_dir_path=output_dir_path, run_id=daemon_id)
+
+    stop_event = stop_event if stop_event is not None else threading.Event()
+    previous_handlers = {}
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            previous_handlers[signum] = signal.signal(
+                signum, lambda signum, frame: stop_event.set()
+            )
+
+    yield_results_cache = YieldResultsFileCache()
+    telemetry_connection = TelemetryConnection()
+    logger.info(
+        f"Daemon {daemon_id} started, interval="
+        f"{settings.daemon_interval_seconds} seconds"
+    )
+    num_runs = 0
+    num_failed = 0
+    try:
+        while not stop_event.is_set():
+            now = datetime.datetime.now()
+            window = get_daemon_window(output_dir_path, now=now)
+            if window is None:
+                logger.info("No new window to process")
+            else:
+                num_failed += not run_window(
+                    window=window,
+                    run_timestamp=now,
+                    yield_results_cache=yield_results_cache,
+                    telemetry_connection=telemetry_connection,
+                )
+            num_runs += 1
+            if max_runs is not None and num_runs >= max_runs:
+                break
+            stop_event.wait(settings.daemon_interval_seconds)
+    finally:
+        telemetry_connection.close()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        logger.info(
+            f"Daemon {daemon_id} stopped after runs={num_runs},"
+            f" failed={num_failed}"
+        )
+    return num_failed
+
+
+def run_window(
+    window: ConfigTimestamps,
+    run_timestamp: datetime.datetime,
+    yield_results_cache: YieldResultsFileCache,
+    telemetry_connection: TelemetryConnection,
+) -> bool:
+    """
+    Runs the pipeline for window in a new run output dir, which advances the watermark
+    on success. Errors are logged, not raised
+    :param window: ConfigTimestamps
+    :param run_timestamp: datetime.datetime
+    :param yield_results_cache: YieldResultsFileCache
+    :param telemetry_connection: TelemetryConnection
+    :return: bool, succeeded
+    """
+    run_id = uuid4()
+    logger.info(
+        f"Run {run_id} from timestamp={window.from_timestamp} to"
+        f" timestamp={window.to_timestamp}"
+    )
+    try:
+        run_output_dir_path = setup_run_output_dir(
+            run_id=run_id, run_timestamp=run_timestamp
+        )
+        execute_run(
+            run_id=run_id,
+            run_timestamp=run_timestamp,
+            run_output_dir_path=run_output_dir_path,
+            config_timestamps=window,
+            yield_results_cache=yield_results_cache,
+            telemetry_connection=telemetry_connection,
+        )
+    except Exception:
+        logger.exception(
+            f"Run {run_id} failed, window from"
+            f" timestamp={window.from_timestamp} retried on the next run"
+        )
+        return False
+    return True
@@ -0,0 +1 @@
+from .dataset import publish_to_dataset, read_manifest
@@ -0,0 +1,229 @@
+import csv
+import datetime
+import logging
+import os
+import shutil
+from typing import Any
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from growth_job_pipeline.models.validators.dataset_manifest import (
+    DatasetFile,
+    DatasetManifest,
+)
+from growth_job_pipeline.models.validators.output_row import output_columns
+
+logger = logging.getLogger(__name__)
+
+DATASET_DIR_NAME = "dataset"
+MANIFEST_FILE_NAME = "manifest.json"
+
+TIMESTAMP_INDEX = output_columns.index("timestamp")
+CROP_INDEX = output_columns.index("crop")
+GROWTH_JOB_ID_INDEX = output_columns.index("growth_job_id")
+
+
+def get_dataset_dir_path(output_dir_path: str) -> str:
+    """
+    Returns the path of the dataset dir in output_dir
+    :param output_dir_path: str
+    :return: str
+    """
+    return os.path.join(output_dir_path, DATASET_DIR_NAME)
+
+
+def get_partition_path(date: str, crop: str) -> str:
+    """
+    Returns the path of a partition relative to the dataset dir
+    :param date: str, ISO format
+    :param crop: str
+    :return: str
+    """
+    return os.path.join(f"date={date}", f"crop={crop}")
+
+
+def get_partition_file_name(growth_job_id: str) -> str:
+    """
+    Returns the name of a growth job's file in a partition
+    :param growth_job_id: str
+    :return: str
+    """
+    return f"growth_job_{growth_job_id}.csv"
+
+
+def write_manifest(dataset_dir_path: str, manifest: DatasetManifest) -> None:
+    """
+    Atomically writes manifest file in dataset_dir
+    Written to a temp file then renamed, so readers never see a partial manifest
+    :param dataset_dir_path: str
+    :param manifest: DatasetManifest
+    :return: None
+    """
+    manifest_path = os.path.join(dataset_dir_path, MANIFEST_FILE_NAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as file:
+        file.write(manifest.model_dump_json(indent=4))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, manifest_path)
+
+
+def read_manifest(dataset_dir_path: str) -> DatasetManifest:
+    """
+    Reads manifest file from dataset_dir, returns an empty manifest if none written
+    :param dataset_dir_path: str
+    :return: DatasetManifest
+    """
+    manifest_path = os.path.join(dataset_dir_path, MANIFEST_FILE_NAME)
+    if not os.path.exists(manifest_path):
+        return DatasetManifest()
+    try:
+        with open(manifest_path, "r") as file:
+            return DatasetManifest.model_validate_json(file.read())
+    except IOError as e:
+        logger.error(f"Cannot read manifest file={manifest_path}")
+        raise e
+    except ValidationError as e:
+        logger.error(f"Error {e}. Cannot validate manifest.")
+        raise e
+
+
+def stage_partition_files(
+    output_file: str, staging_dir_path: str
+) -> dict[tuple[str, str], int]:
+    """
+    Splits output_file's rows into a file per partition and growth job in staging_dir
+    Relies on rows being ordered by timestamp, so a partition's files are closed
+    once rows move on to the next date
+    :param output_file: str
+    :param staging_dir_path: str
+    :return: dict[tuple[str, str], int], rows by (partition path, file name)
+    """
+    rows_by_file: dict[tuple[str, str], int] = {}
+    # (partition path, file name) -> (file, csv.writer), for the current date
+    open_files: dict[tuple[str, str], tuple[Any, Any]] = {}
+    current_date = None
+    try:
+        with open(output_file, "r", newline="") as file:
+            reader = csv.reader(file)
+            next(reader)
+            for row in reader:
+                date = row[TIMESTAMP_INDEX][:10]
+                if date != current_date:
+                    for partition_file, _ in open_files.values():
+                        partition_file.close()
+                    open_files = {}
+                    current_date = date
+                key = (
+                    get_partition_path(date=date, crop=row[CROP_INDEX]),
+                    get_partition_file_name(row[GROWTH_JOB_ID_INDEX]),
+                )
+                if key not in open_files:
+                    os.makedirs(
+                        os.path.join(staging_dir_path, key[0]), exist_ok=True
+                    )
+                    partition_file = open(
+                        os.path.join(staging_dir_path, *key), "w"
+                    )
+                    open_files[key] = (
+                        partition_file,
+                        csv.writer(partition_file),
+                    )
+                    open_files[key][1].writerow(output_columns)
+                    rows_by_file[key] = 0
+                open_files[key][1].writerow(row)
+                rows_by_file[key] += 1
+    finally:
+        for partition_file, _ in open_files.values():
+            partition_file.close()
+    return rows_by_file
+
+
+def publish_to_dataset(
+    output_file: str, output_dir_path: str, run_id: UUID
+) -> DatasetManifest:
+    """
+    Publishes a run's output_file into the dataset in output_dir, partitioned by
+    telemetry date and crop, a file per growth job in each partition
+    Files are staged, then each renamed into place, replacing the file a previous
+    run wrote for the job and partition, and the manifest written last. Files for the
+    run's growth jobs in partitions the run did not write are removed, so the run's
+    rows replace all those before for its jobs. Other partitions are untouched.
+    output_file is removed once published. Safe to call again if interrupted
+    Assumes runs publish to a dataset one at a time
+    :param output_file: str
+    :param output_dir_path: str
+    :param run_id: UUID
+    :return: DatasetManifest
+    """
+    dataset_dir_path = get_dataset_dir_path(output_dir_path)
+    staging_dir_path = os.path.join(dataset_dir_path, f".staging_{run_id}")
+    if os.path.exists(staging_dir_path):
+        shutil.rmtree(staging_dir_path)
+    os.makedirs(staging_dir_path)
+    rows_by_file = stage_partition_files(output_file, staging_dir_path)
+
+    updated_at = datetime.datetime.now()
+    manifest = read_manifest(dataset_dir_path)
+    partitions = {
+        partition_path: dict(files)
+        for partition_path, files in manifest.partitions.items()
+    }
+    for (partition_path, file_name), rows in rows_by_file.items():
+        os.makedirs(
+            os.path.join(dataset_dir_path, partition_path), exist_ok=True
+        )
+        dataset_file_path = os.path.join(
+            dataset_dir_path, partition_path, file_name
+        )
+        os.replace(
+            os.path.join(staging_dir_path, partition_path, file_name),
+            dataset_file_path,
+        )
+        partitions.setdefault(partition_path, {})[file_name] = DatasetFile(
+            rows=rows,
+            bytes=os.path.getsize(dataset_file_path),
+            run_id=run_id,
+            updated_at=updated_at,
+        )
+
+    file_names_written = {file_name for _, file_name in rows_by_file}
+    for partition_path, files in partitions.items():
+        for file_name in list(files):
+            if (
+                file_name in file_names_written
+                and (partition_path, file_name) not in rows_by_file
+            ):
+                del files[file_name]
+                dataset_file_path = os.path.join(
+                    dataset_dir_path, partition_path, file_name
+                )
+                if os.path.exists(dataset_file_path):
+                    os.remove(dataset_file_path)
+                try:
+                    # the partition's dirs, while empty, never the dataset dir
+                    # as it holds the staging dir
+                    os.removedirs(
+                        os.path.join(dataset_dir_path, partition_path)
+                    )
+                except OSError:
+                    # other jobs' files left in the partition
+                    pass
+    manifest = DatasetManifest(
+        partitions={
+            partition_path: dict(sorted(files.items()))
+            for partition_path, files in sorted(partitions.items())
+            if files
+        },
+        updated_at=updated_at,
+    )
+    write_manifest(dataset_dir_path, manifest)
+    shutil.rmtree(staging_dir_path)
+    os.remove(output_file)
+    logger.info(
+        f"Published {sum(rows_by_file.values())} rows to"
+        f" {len({path for path, _ in rows_by_file})} partitions in dataset"
+        f" {dataset_dir_path}"
+    )
+    return manifest
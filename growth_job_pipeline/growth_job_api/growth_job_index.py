@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import datetime
+from bisect import bisect_left
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from growth_job_pipeline.models.enums.crop import Crop
+    from growth_job_pipeline.models.validators.growth_job import GrowthJob
+
+
+class GrowthJobIndex:
+    """
+    Represents completed growth jobs by crop, sorted by end_date, for range lookups
+    Jobs without an end_date, still running, are left out
+    Attributes:
+        num_jobs: int, number of completed jobs indexed
+    """
+
+    def __init__(self, growth_jobs: list[GrowthJob]) -> None:
+        jobs_by_crop: dict[str, list[GrowthJob]] = defaultdict(list)
+        for job in growth_jobs:
+            if job.end_date is not None:
+                jobs_by_crop[job.crop].append(job)
+        self._jobs_by_crop = {
+            crop: sorted(jobs, key=lambda job: job.end_date)
+            for crop, jobs in jobs_by_crop.items()
+        }
+        self._end_dates_by_crop = {
+            crop: [job.end_date for job in jobs]
+            for crop, jobs in self._jobs_by_crop.items()
+        }
+        self.num_jobs = sum(len(jobs) for jobs in self._jobs_by_crop.values())
+
+    def find(
+        self,
+        from_timestamp: datetime.datetime,
+        to_timestamp: datetime.datetime,
+        crop: Crop,
+    ) -> list[GrowthJob]:
+        """
+        Returns jobs for crop completed in from -> to range, to exclusive
+        :param from_timestamp: datetime.datetime
+        :param to_timestamp: datetime.datetime
+        :param crop: Crop
+        :return: list[GrowthJob], ascending end_date
+        """
+        end_dates = self._end_dates_by_crop.get(crop, [])
+        return self._jobs_by_crop.get(crop, [])[
+            bisect_left(end_dates, from_timestamp) : bisect_left(
+                end_dates, to_timestamp
+            )
+        ]
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import datetime
 import logging
-from typing import TYPE_CHECKING
+import time
+from functools import cache
+from typing import Any, TYPE_CHECKING
 
-import backoff
 import pydantic
-import requests
 
-from growth_job_pipeline.config import config
+from growth_job_pipeline.config import get_settings
+from growth_job_pipeline.growth_job_api.growth_job_index import GrowthJobIndex
+from growth_job_pipeline.metrics import count_retry, run_metrics
 from growth_job_pipeline.models.validators.growth_job import GrowthJob
 
 if TYPE_CHECKING:
@@ -16,50 +18,106 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# (monotonic time fetched, index), kept between calls for GROWTH_JOBS_CACHE_SECONDS
+_growth_job_index_cache: tuple[float, GrowthJobIndex] | None = None
 
-@backoff.on_exception(backoff.expo, requests.RequestException, max_tries=3)
-def get_time_filtered_growth_jobs_for_crop(
-    from_timestamp: datetime.datetime,
-    to_timestamp: datetime.datetime,
-    crop: Crop,
-) -> list[GrowthJob]:
+
+@cache
+def get_http_session() -> Any:
     """
-    Fetches growth jobs from API and filters to those completed in from -> to range for crop
-    :param from_timestamp: datetime.datetime
-    :param to_timestamp: datetime.datetime
-    :param crop: Crop
+    Returns the requests.Session shared by calls to the growth jobs API, created on
+    first call, so its connections are reused
+    :return: requests.Session
+    """
+    # imported on first call, so runs that never reach the API do not pay for them
+    import requests
+
+    return requests.Session()
+
+
+def fetch_growth_jobs() -> list[GrowthJob]:
+    """
+    Fetches and validates all growth jobs from the API, retrying on request errors up to 3 tries
+    :return: list[GrowthJob]
+    """
+    import backoff
+    import requests
+
+    return backoff.on_exception(
+        backoff.expo,
+        requests.RequestException,
+        max_tries=3,
+        on_backoff=count_retry,
+    )(fetch_growth_jobs_once)()
+
+
+def fetch_growth_jobs_once() -> list[GrowthJob]:
+    """
+    Fetches and validates all growth jobs from the API
     :return: list[GrowthJob]
     """
-    response = requests.get(config("GROWTH_JOBS_API_URL"))
-    response.raise_for_status()
+    import requests
+
+    growth_jobs_api_url = get_settings().growth_jobs_api_url
+    run_metrics.increment("api_calls")
     # generally speaking, would also expect to be storing/fetching an API key from config in prod
     # would probably also expect https rather than http
     # also might expect to handle API pagination - keep fetching until no next link
     # also might expect to handle API rate limiting
     # TODO @dsm ideally could we ask API maintainers to implement query params for filtering?
     try:
-        jobs = [GrowthJob(**obj) for obj in response.json()]
-
-        # get any jobs completed in from -> to range for crop
-        filtered_jobs = [
-            job
-            for job in jobs
-            if from_timestamp <= job.end_date < to_timestamp
-            and job.crop == crop
-        ]
-        logger.info(
-            f"Fetched {len(filtered_jobs)} from"
-            f" {config('GROWTH_JOBS_API_URL')} from"
-            f" timestamp={from_timestamp} to timestamp={to_timestamp} for"
-            f" crop={crop}"
-        )
-        return filtered_jobs
+        response = get_http_session().get(growth_jobs_api_url)
+        response.raise_for_status()
+        return [GrowthJob(**obj) for obj in response.json()]
     except requests.RequestException as e:
         logger.error(
-            f"Error: {e}. Cannot fetch growth jobs from"
-            f" {config('GROWTH_JOBS_API_URL')}"
+            f"Error: {e}. Cannot fetch growth jobs from {growth_jobs_api_url}"
         )
         raise e
     except pydantic.ValidationError as e:
         logger.error(f"Error: {e} validating growth jobs.")
         raise e
+
+
+def get_growth_job_index() -> GrowthJobIndex:
+    """
+    Returns an index of growth jobs from the API, reused for GROWTH_JOBS_CACHE_SECONDS
+    set in config, fetched on every call if 0
+    :return: GrowthJobIndex
+    """
+    global _growth_job_index_cache
+    cache_seconds = get_settings().growth_jobs_cache_seconds
+    if (
+        cache_seconds
+        and _growth_job_index_cache is not None
+        and time.monotonic() - _growth_job_index_cache[0] < cache_seconds
+    ):
+        return _growth_job_index_cache[1]
+    fetched_at = time.monotonic()
+    index = GrowthJobIndex(fetch_growth_jobs())
+    _growth_job_index_cache = (fetched_at, index) if cache_seconds else None
+    return index
+
+
+def get_time_filtered_growth_jobs_for_crop(
+    from_timestamp: datetime.datetime,
+    to_timestamp: datetime.datetime,
+    crop: Crop,
+) -> list[GrowthJob]:
+    """
+    Returns growth jobs from API completed in from -> to range for crop
+    :param from_timestamp: datetime.datetime
+    :param to_timestamp: datetime.datetime
+    :param crop: Crop
+    :return: list[GrowthJob], ascending end_date
+    """
+    filtered_jobs = get_growth_job_index().find(
+        from_timestamp=from_timestamp, to_timestamp=to_timestamp, crop=crop
+    )
+    logger.info(
+        f"Fetched {len(filtered_jobs)} from"
+        f" {get_settings().growth_jobs_api_url} from"
+        f" timestamp={from_timestamp} to timestamp={to_timestamp} for"
+        f" crop={crop}"
+    )
+    return filtered_jobs
@@ -1,28 +1,117 @@
 from __future__ import annotations
 
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from typing import TYPE_CHECKING
 
-from growth_job_pipeline.config import config
+from growth_job_pipeline.config import get_settings
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+LOG_FORMAT = (
+    "[%(asctime)s] %(levelname)s [module=%(name)s, line=%(lineno)s]"
+    " %(message)s"
+)
 
-def setup_logger(run_output_dir_path: str, run_id: UUID):
-    log_level = logging.DEBUG if config("DEBUG", cast=bool) else logging.INFO
+# pass as extra to log calls in per-batch loops, see RateLimitFilter
+RATE_LIMITED = {"rate_limited": True}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, for log ingestion
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        # any traceback is already in the message, added as the record was queued
+        return json.dumps(
+            {
+                "timestamp": self.formatTime(record),
+                "level": record.levelname,
+                "module": record.name,
+                "line": record.lineno,
+                "message": record.getMessage(),
+            }
+        )
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops records logged with extra RATE_LIMITED more often than once per interval
+    from the same call site, noting how many were dropped on the next one let through
+    Attributes:
+        interval: float, seconds
+    """
+
+    def __init__(self, interval: float) -> None:
+        super().__init__()
+        self.interval = interval
+        self._lock = threading.Lock()
+        # call site -> (time last let through, records dropped since)
+        self._call_sites: dict[tuple[str, int], tuple[float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "rate_limited", False):
+            return True
+        call_site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            last_time, num_dropped = self._call_sites.get(call_site, (None, 0))
+            if last_time is not None and now - last_time < self.interval:
+                self._call_sites[call_site] = (last_time, num_dropped + 1)
+                return False
+            self._call_sites[call_site] = (now, 0)
+        if num_dropped:
+            record.msg = f"{record.msg} ({num_dropped} similar suppressed)"
+        return True
+
+
+def setup_logger(
+    run_output_dir_path: str, run_id: UUID
+) -> QueueListener | None:
+    """
+    Logs to the run's log file and stdout from a background thread
+    Log calls only enqueue records, a QueueListener does the formatting and I/O.
+    Does nothing if the root logger already has handlers, as logging.basicConfig
+    :param run_output_dir_path: str
+    :param run_id: UUID
+    :return: QueueListener | None, started, stopped at exit
+    """
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return None
+    settings = get_settings()
+    log_level = logging.DEBUG if settings.debug else logging.INFO
     log_file = os.path.join(run_output_dir_path, f"{run_id}.log")
-    logging.getLogger("backoff").addHandler(logging.StreamHandler())
-    logging.basicConfig(
-        level=log_level,
-        format=(
-            "[%(asctime)s] %(levelname)s [module=%(name)s, line=%(lineno)s]"
-            " %(message)s"
-        ),
-        handlers=[
-            logging.FileHandler(filename=log_file, mode="a"),
-            logging.StreamHandler(sys.stdout),
-        ],
+    formatter = (
+        JsonFormatter()
+        if settings.log_format == "json"
+        else logging.Formatter(LOG_FORMAT)
+    )
+    handlers = [
+        logging.FileHandler(filename=log_file, mode="a"),
+        logging.StreamHandler(sys.stdout),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(
+        RateLimitFilter(interval=settings.log_rate_limit_seconds)
     )
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root_logger.setLevel(log_level)
+    root_logger.addHandler(queue_handler)
+    listener.start()
+    # flushes records still queued when the process exits
+    atexit.register(listener.stop)
+    return listener
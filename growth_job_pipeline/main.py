@@ -1,57 +1,77 @@
 from __future__ import annotations
 
+import argparse
 import csv
 import datetime
 import json
 import logging
 import os
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import Any, TYPE_CHECKING
 from uuid import uuid4, UUID
 
-from growth_job_pipeline.config import config
+from growth_job_pipeline.checkpoint import read_checkpoint, write_checkpoint
+from growth_job_pipeline.config import get_settings, load_settings
 from growth_job_pipeline.growth_job_api import (
     get_time_filtered_growth_jobs_for_crop,
 )
 from growth_job_pipeline.logger import setup_logger
+from growth_job_pipeline.metrics import (
+    export_prometheus_metrics,
+    run_metrics,
+)
 from growth_job_pipeline.models.enums.telemetry_measurement_type import (
     TelemetryMeasurementType,
 )
 from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
     TelemetryMeasurementUnit,
 )
+from growth_job_pipeline.models.enums.telemetry_pagination import (
+    TelemetryPagination,
+)
 from growth_job_pipeline.models.validators.coalesced_timestamps import (
     CoalescedTimestamps,
 )
+from growth_job_pipeline.models.validators.extraction_checkpoint import (
+    ExtractionCheckpoint,
+)
 from growth_job_pipeline.models.validators.job_to_output_rows_spec import (
     JobToOutputRowsSpec,
 )
-from growth_job_pipeline.models.validators.output_row import (
-    output_columns,
-    OutputRow,
+from growth_job_pipeline.models.records.job_to_output_rows_spec import (
+    JobToOutputRowsSpecRecord,
 )
-from growth_job_pipeline.telemetry_db import (
-    telemetry_entries_batcher,
+from growth_job_pipeline.models.records.output_row import OutputRowRecord
+from growth_job_pipeline.models.validators.config_timestamps import (
+    ConfigTimestamps,
 )
-from growth_job_pipeline.telemetry_db.db import get_telemetry_db_cursor
+from growth_job_pipeline.models.validators.output_row import output_columns
+from growth_job_pipeline.models.validators.watermark import Watermark
+from growth_job_pipeline.profiling import profile_run
 from growth_job_pipeline.utils import (
     get_config_timestamps,
     coalesce_run_timestamps,
     latest_datetime_possible_for_date,
 )
+from growth_job_pipeline.watermark import read_watermark, write_watermark
 from growth_job_pipeline.yield_tsv_reader import get_ascending_yield_results
 
 if TYPE_CHECKING:
-    from growth_job_pipeline.models.validators.config_timestamps import (
-        ConfigTimestamps,
-    )
     from growth_job_pipeline.models.validators.yield_result import YieldResult
     from growth_job_pipeline.models.validators.growth_job import GrowthJob
-    from growth_job_pipeline.models.validators.telemetry_entry import (
-        TelemetryEntry,
+    from growth_job_pipeline.models.records.telemetry_columns import (
+        TelemetryColumns,
+    )
+    from growth_job_pipeline.models.records.telemetry_entry import (
+        TelemetryEntryRecord,
     )
+    from growth_job_pipeline.telemetry_db import TelemetryConnection
+    from growth_job_pipeline.yield_tsv_reader import YieldResultsFileCache
 
 logger = logging.getLogger(__name__)
 
+OUTPUT_COMPRESSION_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
 
 def create_job_to_output_rows_spec(
     yield_result: YieldResult, growth_job: GrowthJob
@@ -89,8 +109,8 @@ def match_yield_results_growth_jobs_gen_specs(
 
     # use a search horizon for growth jobs to avoid overburdening API
     # could remove if we'd prefer an exhaustive search before raising error
-    MAX_DELAY_DAYS_SEARCH = config(
-        "MAX_DAYS_DELAY_GROWTH_JOB_YIELD_RESULT", cast=int
+    MAX_DELAY_DAYS_SEARCH = (
+        get_settings().max_days_delay_growth_job_yield_result
     )
 
     # list comprehensions preserve order, so this should be ascending
@@ -204,7 +224,7 @@ def setup_run_output_dir(
     :return: str
     """
 
-    output_dir_path = config("OUTPUT_DIR", default="/growth_job_pipeline_data")
+    output_dir_path = get_settings().output_dir
     if not os.path.exists(output_dir_path):
         os.makedirs(output_dir_path)
 
@@ -220,6 +240,27 @@ def setup_run_output_dir(
     return run_output_dir_path
 
 
+def parse_run_output_dir_name(
+    run_output_dir_path: str,
+) -> tuple[UUID, datetime.datetime]:
+    """
+    Returns run_id and run_timestamp encoded in a run output dir name
+    Raises ValueError if the dir name was not created by setup_run_output_dir
+    :param run_output_dir_path: str
+    :return: tuple[UUID, datetime.datetime]
+    """
+    dir_name = os.path.basename(os.path.normpath(run_output_dir_path))
+    try:
+        run_timestamp_str, run_id_str = dir_name.rsplit("_", 1)
+        return UUID(run_id_str), datetime.datetime.fromisoformat(
+            run_timestamp_str
+        )
+    except ValueError as e:
+        msg = f"Cannot parse run_id and run_timestamp from dir={dir_name}"
+        logger.error(msg)
+        raise ValueError(msg) from e
+
+
 def write_run_data(
     run_id: UUID,
     run_output_dir_path: str,
@@ -229,9 +270,11 @@ def write_run_data(
     telemetry_type_to_fetch: TelemetryMeasurementType,
     telemetry_unit_to_fetch: TelemetryMeasurementUnit,
     job_to_output_rows_specs: list[JobToOutputRowsSpec],
+    metrics: dict | None = None,
 ) -> None:
     """
     Write run_data.json file in run_output_dir
+    Written before extraction, then again at the end of the run with metrics
     :param run_id: UUID
     :param run_output_dir_path: str
     :param config_timestamps: ConfigTimestamps
@@ -240,19 +283,22 @@ def write_run_data(
     :param telemetry_type_to_fetch: TelemetryMeasurementType
     :param telemetry_unit_to_fetch: TelemetryMeasurementUnit
     :param job_to_output_rows_specs: list[JobToOutputRowsSpec]
+    :param metrics: dict | None, per-stage timings and counters from RunMetrics,
+    summarized for compression if output was compressed
     :return: None
     """
 
+    settings = get_settings()
     run_data = {
-        "deploy_environment": config("DEPLOY_ENVIRONMENT"),
+        "deploy_environment": settings.deploy_environment,
         "run_id": str(run_id),
         "run_timestamp": run_timestamp.isoformat(),
         "telemetry_measurement_type": telemetry_type_to_fetch.value,
         "telemetry_measurement_unit": telemetry_unit_to_fetch.value,
         "config_timestamps": config_timestamps.model_dump(mode="json"),
         "coalesced_timestamps": coalesced_timestamps.model_dump(mode="json"),
-        "max_days_delay_growth_job_yield_result": config(
-            "MAX_DAYS_DELAY_GROWTH_JOB_YIELD_RESULT", cast=int
+        "max_days_delay_growth_job_yield_result": (
+            settings.max_days_delay_growth_job_yield_result
         ),
         "num_yield_results": len(job_to_output_rows_specs),
         "growth_job_ids_found_with_yields": [
@@ -262,78 +308,439 @@ def write_run_data(
             spec.crop for spec in job_to_output_rows_specs
         ],
     }
+    if metrics is not None:
+        run_data["metrics"] = metrics
+        if "output_compress" in metrics["stages"]:
+            from growth_job_pipeline.output_writers import (
+                get_compression_summary,
+            )
 
-    with open(
-        os.path.join(run_output_dir_path, f"run_data_{str(run_id)}.json"), "w"
-    ) as file:
+            run_data["output_compression"] = get_compression_summary(
+                compression=settings.output_compression,
+                compress_stage=metrics["stages"]["output_compress"],
+            )
+
+    with open(get_run_data_path(run_output_dir_path, run_id), "w") as file:
         file.write(json.dumps(run_data, indent=4))
 
 
-def telemetry_entry_to_output_rows(
-    dict_writer: csv.DictWriter,
-    telemetry_entry: TelemetryEntry,
-    job_to_output_rows_specs: list[JobToOutputRowsSpec],
+def get_run_data_path(run_output_dir_path: str, run_id: UUID) -> str:
+    """
+    Returns the path of the run_data.json file in run_output_dir
+    :param run_output_dir_path: str
+    :param run_id: UUID
+    :return: str
+    """
+    return os.path.join(run_output_dir_path, f"run_data_{str(run_id)}.json")
+
+
+def read_run_config_timestamps(
+    run_output_dir_path: str, run_id: UUID
+) -> ConfigTimestamps | None:
+    """
+    Returns config timestamps a run was started with, from its run_data.json file,
+    None if not yet written
+    :param run_output_dir_path: str
+    :param run_id: UUID
+    :return: ConfigTimestamps | None
+    """
+    run_data_path = get_run_data_path(run_output_dir_path, run_id)
+    if not os.path.exists(run_data_path):
+        return None
+    with open(run_data_path, "r") as file:
+        return ConfigTimestamps(**json.load(file)["config_timestamps"])
+
+
+def get_output_file_path(
+    run_output_dir_path: str,
+    run_id: UUID,
+    telemetry_type_to_fetch: TelemetryMeasurementType,
+    telemetry_unit_to_fetch: TelemetryMeasurementUnit,
+) -> str:
+    """
+    Returns the path of the output file in run_output_dir, in OUTPUT_FORMAT and with
+    OUTPUT_COMPRESSION set in config
+    :param run_output_dir_path: str
+    :param run_id: UUID
+    :param telemetry_type_to_fetch: TelemetryMeasurementType
+    :param telemetry_unit_to_fetch: TelemetryMeasurementUnit
+    :return: str
+    """
+    settings = get_settings()
+    return os.path.join(
+        run_output_dir_path,
+        f"data_{telemetry_type_to_fetch.value}_{telemetry_unit_to_fetch.value}_{str(run_id)}.{settings.output_format}"
+        + OUTPUT_COMPRESSION_EXTENSIONS[settings.output_compression],
+    )
+
+
+def publish_run_output(output_file: str, run_id: UUID) -> None:
+    """
+    Publishes output_file to the partitioned dataset in OUTPUT_DIR, if OUTPUT_MODE set
+    in config is dataset and output_file is not yet published
+    :param output_file: str
+    :param run_id: UUID
+    :return: None
+    """
+    settings = get_settings()
+    if settings.output_mode != "dataset" or not os.path.exists(output_file):
+        return
+    from growth_job_pipeline.dataset import publish_to_dataset
+
+    with run_metrics.stage("dataset_publish"):
+        publish_to_dataset(
+            output_file=output_file,
+            output_dir_path=settings.output_dir,
+            run_id=run_id,
+        )
+
+
+def advance_watermark(
+    config_timestamps: ConfigTimestamps, run_id: UUID
 ) -> None:
     """
-    Writes telemetry entry to output rows
-    :param dict_writer: csv.DictWriter
-    :param telemetry_entry: TelemetryEntry
-    :param job_to_output_rows_specs: list[JobToOutputRowsSpec]
+    Writes config_timestamps' to_timestamp as the watermark in OUTPUT_DIR if the run
+    was incremental. Called once the run's output and run data are written. Never
+    moves the watermark back, e.g. resuming a run after a later one succeeded
+    :param config_timestamps: ConfigTimestamps
+    :param run_id: UUID
+    :return: None
+    """
+    if not config_timestamps.incremental:
+        return
+    output_dir_path = get_settings().output_dir
+    watermark = read_watermark(output_dir_path)
+    if (
+        watermark is not None
+        and watermark.to_timestamp >= config_timestamps.to_timestamp
+    ):
+        logger.warning(
+            f"Watermark at timestamp={watermark.to_timestamp} not moved back"
+            f" to timestamp={config_timestamps.to_timestamp}"
+        )
+        return
+    write_watermark(
+        output_dir_path,
+        Watermark(
+            to_timestamp=config_timestamps.to_timestamp,
+            run_id=run_id,
+            updated_at=datetime.datetime.now(),
+        ),
+    )
+    logger.info(
+        f"Watermark advanced to timestamp={config_timestamps.to_timestamp}"
+    )
+
+
+def write_synced_checkpoint(
+    run_output_dir_path: str,
+    checkpoint: ExtractionCheckpoint,
+    file_offset: int,
+) -> None:
+    """
+    Writes checkpoint with the output file offset its rows end at, called back by
+    OutputFile.sync once they are in the file
+    :param run_output_dir_path: str
+    :param checkpoint: ExtractionCheckpoint
+    :param file_offset: int
     :return: None
     """
+    write_checkpoint(
+        run_output_dir_path,
+        checkpoint.model_copy(update={"file_offset": file_offset}),
+    )
+
+
+def telemetry_entry_to_output_rows(
+    writer: Any,
+    telemetry_entry: TelemetryEntryRecord,
+    job_to_output_rows_specs: list[JobToOutputRowsSpecRecord],
+) -> int:
+    """
+    Writes telemetry entry to output rows, returns number of rows written
+    OutputRow's checks follow from the validated spec and the spec's date range check
+    :param writer: csv.writer
+    :param telemetry_entry: TelemetryEntryRecord
+    :param job_to_output_rows_specs: list[JobToOutputRowsSpecRecord]
+    :return: int
+    """
+    rows_written = 0
+    timestamp = telemetry_entry.timestamp
     for spec in job_to_output_rows_specs:
-        if (
-            spec.growth_job_start_date
-            <= telemetry_entry.timestamp
-            <= spec.growth_job_end_date
-        ):
-            output_row = OutputRow(
-                timestamp=telemetry_entry.timestamp,
-                crop=spec.crop,
-                growth_job_id=spec.growth_job_id,
-                growth_job_start_date=spec.growth_job_start_date,
-                growth_job_end_date=spec.growth_job_end_date,
-                yield_recorded_date=spec.yield_recorded_date,
-                yield_weight=spec.yield_weight,
-                yield_unit=spec.yield_unit,
-                telemetry_measurement_type=telemetry_entry.type,
-                telemetry_measurement_unit=telemetry_entry.unit,
-                telemetry_measurement_value=telemetry_entry.value,
+        if spec.growth_job_start_date <= timestamp <= spec.growth_job_end_date:
+            writer.writerow(
+                OutputRowRecord(
+                    timestamp.isoformat(),
+                    *spec.output_values,
+                    telemetry_entry.type,
+                    telemetry_entry.unit,
+                    telemetry_entry.value,
+                )
             )
-            dict_writer.writerow(output_row.model_dump(mode="json"))
+            rows_written += 1
+    return rows_written
 
 
-def main() -> None:
-    run_id = uuid4()
-    run_timestamp = datetime.datetime.now()
-    run_output_dir_path = setup_run_output_dir(
-        run_id=run_id, run_timestamp=run_timestamp
+def write_telemetry_batch(
+    writer: Any,
+    batch: list[TelemetryEntryRecord] | TelemetryColumns,
+    job_to_output_rows_specs: list[JobToOutputRowsSpecRecord],
+    columnar: bool,
+) -> tuple[int, int, datetime.datetime]:
+    """
+    Writes output rows for a batch from resumable_telemetry_entries_batcher
+    :param writer: csv.writer
+    :param batch: list[TelemetryEntryRecord] | TelemetryColumns, if columnar
+    :param job_to_output_rows_specs: list[JobToOutputRowsSpecRecord]
+    :param columnar: bool
+    :return: tuple[int, int, datetime.datetime], rows fetched, rows written and the
+    batch's last timestamp
+    """
+    if columnar:
+        from growth_job_pipeline.output_writers import (
+            telemetry_columns_to_output_rows,
+        )
+
+        rows_written = telemetry_columns_to_output_rows(
+            writer=writer,
+            columns=batch,
+            job_to_output_rows_specs=job_to_output_rows_specs,
+        )
+        return batch.num_rows, rows_written, batch.timestamps[-1]
+
+    rows_written = 0
+    for telemetry_entry in batch:
+        rows_written += telemetry_entry_to_output_rows(
+            writer=writer,
+            telemetry_entry=telemetry_entry,
+            job_to_output_rows_specs=job_to_output_rows_specs,
+        )
+    return len(batch), rows_written, batch[-1].timestamp
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parses command line arguments
+    :param argv: list[str] | None, defaults to sys.argv
+    :return: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(prog="growth_job_pipeline.main")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--resume",
+        metavar="RUN_DIR",
+        default=None,
+        help=(
+            "Resume an interrupted run from the checkpoint in its run output"
+            " dir"
+        ),
+    )
+    mode.add_argument(
+        "--backfill",
+        action="store_true",
+        help=(
+            "Extract telemetry in windows across BACKFILL_WORKERS processes,"
+            " for long FROM_TIMESTAMP to TO_TIMESTAMP ranges"
+        ),
     )
+    mode.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Run every DAEMON_INTERVAL_SECONDS until stopped, each run"
+            " processing yield results since the last"
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    # read once, before any work, so misconfiguration fails the run up front
+    settings = load_settings()
+    missing_run_keys = settings.missing_run_keys()
+    if missing_run_keys:
+        msg = f"Missing config for run, keys={missing_run_keys}"
+        logger.error(msg)
+        raise ValueError(msg)
+    if args.backfill and settings.output_format != "csv":
+        msg = (
+            f"Cannot backfill with output_format={settings.output_format},"
+            " parts are merged as CSV"
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+    if args.daemon:
+        from growth_job_pipeline.daemon import run_daemon
+
+        run_daemon()
+        return
+    if args.resume is not None:
+        run_output_dir_path = args.resume
+        run_id, run_timestamp = parse_run_output_dir_name(run_output_dir_path)
+        if not os.path.isdir(run_output_dir_path):
+            msg = f"Run output dir {run_output_dir_path} to resume not found"
+            raise FileNotFoundError(msg)
+    else:
+        run_id = uuid4()
+        run_timestamp = datetime.datetime.now()
+        run_output_dir_path = setup_run_output_dir(
+            run_id=run_id, run_timestamp=run_timestamp
+        )
     setup_logger(run_output_dir_path=run_output_dir_path, run_id=run_id)
-    config_timestamps = get_config_timestamps()
+    execute_run(
+        run_id=run_id,
+        run_timestamp=run_timestamp,
+        run_output_dir_path=run_output_dir_path,
+        resume=args.resume is not None,
+        backfill=args.backfill,
+    )
+
+
+def execute_run(
+    run_id: UUID,
+    run_timestamp: datetime.datetime,
+    run_output_dir_path: str,
+    **pipeline_kwargs: Any,
+) -> None:
+    """
+    Runs the pipeline with fresh run metrics, profiled if set in config, exporting
+    Prometheus metrics whether or not it succeeds
+    :param run_id: UUID
+    :param run_timestamp: datetime.datetime
+    :param run_output_dir_path: str
+    :param pipeline_kwargs: passed to run_pipeline
+    :return: None
+    """
+    settings = get_settings()
+    run_metrics.reset(
+        memory_budget=(
+            settings.memory_budget_mb * 1024 * 1024
+            if settings.memory_budget_mb is not None
+            else None
+        )
+    )
+    succeeded = False
+    try:
+        with profile_run(
+            run_output_dir_path=run_output_dir_path, run_id=run_id
+        ):
+            run_pipeline(
+                run_id=run_id,
+                run_timestamp=run_timestamp,
+                run_output_dir_path=run_output_dir_path,
+                **pipeline_kwargs,
+            )
+        succeeded = True
+    finally:
+        export_prometheus_metrics(
+            run_output_dir_path=run_output_dir_path,
+            run_id=run_id,
+            metrics=run_metrics.to_dict(),
+            succeeded=succeeded,
+        )
+
+
+def run_pipeline(
+    run_id: UUID,
+    run_timestamp: datetime.datetime,
+    run_output_dir_path: str,
+    resume: bool = False,
+    config_timestamps: ConfigTimestamps | None = None,
+    yield_results_cache: YieldResultsFileCache | None = None,
+    telemetry_connection: TelemetryConnection | None = None,
+    backfill: bool = False,
+) -> None:
+    """
+    Runs the pipeline in a run output dir already set up, resuming from its checkpoint
+    if resume
+    :param run_id: UUID
+    :param run_timestamp: datetime.datetime
+    :param run_output_dir_path: str
+    :param resume: bool
+    :param config_timestamps: ConfigTimestamps | None, defaults to those set in config
+    :param yield_results_cache: YieldResultsFileCache | None, read rather than the file
+    :param telemetry_connection: TelemetryConnection | None, reused rather than
+    connecting for the run
+    :param backfill: bool, extract with run_backfill_extraction
+    :return: None
+    """
+    settings = get_settings()
+    if (
+        config_timestamps is None
+        and resume
+        and settings.from_timestamp == "auto"
+    ):
+        # the window the run started with, not one since the watermark now
+        config_timestamps = read_run_config_timestamps(
+            run_output_dir_path, run_id
+        )
+    if config_timestamps is None:
+        config_timestamps = get_config_timestamps()
+    checkpoint = read_checkpoint(run_output_dir_path) if resume else None
+    if checkpoint is not None and checkpoint.completed:
+        logger.info(f"Run {run_id} already completed, nothing to resume")
+        # in case interrupted before publishing
+        publish_run_output(
+            get_output_file_path(
+                run_output_dir_path=run_output_dir_path,
+                run_id=run_id,
+                telemetry_type_to_fetch=TelemetryMeasurementType(
+                    checkpoint.telemetry_measurement_type
+                ),
+                telemetry_unit_to_fetch=TelemetryMeasurementUnit(
+                    checkpoint.telemetry_measurement_unit
+                ),
+            ),
+            run_id=run_id,
+        )
+        advance_watermark(config_timestamps, run_id=run_id)
+        return
+
     coalesced_timestamps = coalesce_run_timestamps(
         config_timestamps=config_timestamps
     )
     telemetry_type_to_fetch = TelemetryMeasurementType(
-        config("MEASUREMENT_TYPE")
+        settings.measurement_type
     )
     telemetry_unit_to_fetch = TelemetryMeasurementUnit(
-        config("MEASUREMENT_UNIT")
+        settings.measurement_unit
     )
+    if checkpoint is not None and (
+        checkpoint.telemetry_measurement_type != telemetry_type_to_fetch
+        or checkpoint.telemetry_measurement_unit != telemetry_unit_to_fetch
+    ):
+        msg = (
+            "Cannot resume run with"
+            f" type={checkpoint.telemetry_measurement_type},"
+            f" unit={checkpoint.telemetry_measurement_unit} as"
+            f" type={telemetry_type_to_fetch.value},"
+            f" unit={telemetry_unit_to_fetch.value}"
+        )
+        logger.error(msg)
+        raise ValueError(msg)
 
     from_timestamp = coalesced_timestamps.from_timestamp
     to_timestamp = coalesced_timestamps.to_timestamp
 
-    all_yield_results_ascending = get_ascending_yield_results(
-        from_timestamp=datetime.datetime.min, to_timestamp=to_timestamp
-    )
-    job_to_output_rows_specs = match_yield_results_growth_jobs_gen_specs(
-        all_yield_results_ascending=all_yield_results_ascending,
-        from_timestamp=from_timestamp,
-        to_timestamp=to_timestamp,
-    )
+    with run_metrics.stage("yield_results_read") as stage_metrics:
+        all_yield_results_ascending = (
+            yield_results_cache.get_ascending_yield_results
+            if yield_results_cache is not None
+            else get_ascending_yield_results
+        )(from_timestamp=datetime.datetime.min, to_timestamp=to_timestamp)
+        stage_metrics.counters["yield_results"] += len(
+            all_yield_results_ascending
+        )
+    with run_metrics.stage("growth_jobs_match") as stage_metrics:
+        job_to_output_rows_specs = match_yield_results_growth_jobs_gen_specs(
+            all_yield_results_ascending=all_yield_results_ascending,
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+        )
+        stage_metrics.counters["specs"] += len(job_to_output_rows_specs)
 
-    write_run_data(
+    run_data_kwargs = dict(
         run_id=run_id,
         run_output_dir_path=run_output_dir_path,
         config_timestamps=config_timestamps,
@@ -343,6 +750,7 @@ def main() -> None:
         telemetry_unit_to_fetch=telemetry_unit_to_fetch,
         job_to_output_rows_specs=job_to_output_rows_specs,
     )
+    write_run_data(**run_data_kwargs)
 
     if not job_to_output_rows_specs:
         msg = (
@@ -350,40 +758,208 @@ def main() -> None:
             f" range {from_timestamp} to {to_timestamp}"
         )
         logger.warning(msg)
-        exit(0)
+        write_run_data(**run_data_kwargs, metrics=run_metrics.to_dict())
+        advance_watermark(config_timestamps, run_id=run_id)
+        return
 
-    telemetry_bounding_timestamps = get_bounding_timestamps_for_specs(
-        job_to_output_rows_specs=job_to_output_rows_specs
+    output_file = get_output_file_path(
+        run_output_dir_path=run_output_dir_path,
+        run_id=run_id,
+        telemetry_type_to_fetch=telemetry_type_to_fetch,
+        telemetry_unit_to_fetch=telemetry_unit_to_fetch,
+    )
+    if backfill:
+        from growth_job_pipeline.backfill import run_backfill_extraction
+
+        backfill_windows = run_backfill_extraction(
+            run_id=run_id,
+            run_output_dir_path=run_output_dir_path,
+            output_file=output_file,
+            job_to_output_rows_specs=job_to_output_rows_specs,
+            telemetry_type_to_fetch=telemetry_type_to_fetch,
+            telemetry_unit_to_fetch=telemetry_unit_to_fetch,
+        )
+        publish_run_output(output_file, run_id=run_id)
+        write_run_data(
+            **run_data_kwargs,
+            metrics={
+                **run_metrics.to_dict(),
+                "backfill_windows": backfill_windows,
+            },
+        )
+        advance_watermark(config_timestamps, run_id=run_id)
+        return
+
+    # imported only once there is telemetry to extract, keeping the DB stack off
+    # the startup path of runs that exit above
+    from growth_job_pipeline.telemetry_db import (
+        resumable_telemetry_entries_batcher,
+    )
+    from growth_job_pipeline.telemetry_db.backends import (
+        get_telemetry_backend,
+    )
+
+    parquet = settings.output_format == "parquet"
+    if parquet and checkpoint is not None:
+        # a Parquet file is unreadable until its footer is written on close
+        logger.warning(
+            f"Cannot resume Parquet output of run {run_id} mid-file,"
+            " restarting extraction"
+        )
+        checkpoint = None
+
+    # a resumed run keeps the telemetry range it started with
+    telemetry_bounding_timestamps = (
+        get_bounding_timestamps_for_specs(
+            job_to_output_rows_specs=job_to_output_rows_specs
+        )
+        if checkpoint is None
+        else CoalescedTimestamps(
+            from_timestamp=checkpoint.from_timestamp,
+            to_timestamp=checkpoint.to_timestamp,
+        )
     )
 
-    db_cursor = get_telemetry_db_cursor()
-    telemetry_batches = telemetry_entries_batcher(
-        cursor=db_cursor,
+    # validated specs as records, serialized once, for the per-row loops
+    spec_records = [
+        JobToOutputRowsSpecRecord.from_spec(spec)
+        for spec in job_to_output_rows_specs
+    ]
+    columnar = settings.telemetry_db_columnar
+    telemetry_batches = resumable_telemetry_entries_batcher(
         type_to_fetch=telemetry_type_to_fetch,
         unit_to_fetch=telemetry_unit_to_fetch,
-        batch_size=config("TELEMETRY_DB_BATCH_SIZE", cast=int),
+        batch_size=settings.telemetry_db_batch_size,
         from_timestamp=telemetry_bounding_timestamps.from_timestamp,
         to_timestamp=telemetry_bounding_timestamps.to_timestamp,
+        resume_after_timestamp=(
+            checkpoint.last_timestamp if checkpoint is not None else None
+        ),
+        max_reconnects=settings.telemetry_db_max_reconnects,
+        backend=get_telemetry_backend(),
+        pagination=TelemetryPagination(settings.telemetry_db_pagination),
+        columnar=columnar,
+        use_arrow=settings.telemetry_db_arrow,
+        connection=telemetry_connection,
     )
 
-    output_file = os.path.join(
-        run_output_dir_path,
-        f"data_{telemetry_type_to_fetch.value}_{telemetry_unit_to_fetch.value}_{str(run_id)}.csv",
-    )
-    if os.path.exists(output_file):
-        msg = f"Output file {output_file} already exists"
-        logger.error(msg)
-        raise FileExistsError(msg)
-    with open(output_file, "w") as file:
-        writer = csv.DictWriter(file, fieldnames=output_columns)
-        writer.writeheader()
-        for batch in telemetry_batches:
-            for telemetry_entry in batch:
-                telemetry_entry_to_output_rows(
-                    dict_writer=writer,
-                    telemetry_entry=telemetry_entry,
-                    job_to_output_rows_specs=job_to_output_rows_specs,
+    if checkpoint is None and os.path.exists(output_file):
+        if not resume:
+            msg = f"Output file {output_file} already exists"
+            logger.error(msg)
+            raise FileExistsError(msg)
+        # interrupted before the first checkpoint, nothing worth keeping
+        logger.warning(f"Discarding unchecked output file {output_file}")
+    if parquet:
+        from growth_job_pipeline.output_writers import write_parquet_output
+
+        rows_written, last_timestamp = write_parquet_output(
+            output_file=output_file,
+            telemetry_batches=telemetry_batches,
+            job_to_output_rows_specs=job_to_output_rows_specs,
+            telemetry_type_to_fetch=telemetry_type_to_fetch,
+            telemetry_unit_to_fetch=telemetry_unit_to_fetch,
+        )
+        write_checkpoint(
+            run_output_dir_path,
+            ExtractionCheckpoint(
+                run_id=run_id,
+                telemetry_measurement_type=telemetry_type_to_fetch,
+                telemetry_measurement_unit=telemetry_unit_to_fetch,
+                from_timestamp=telemetry_bounding_timestamps.from_timestamp,
+                to_timestamp=telemetry_bounding_timestamps.to_timestamp,
+                last_timestamp=last_timestamp,
+                file_offset=os.path.getsize(output_file),
+                rows_written=rows_written,
+                completed=True,
+            ),
+        )
+        write_run_data(**run_data_kwargs, metrics=run_metrics.to_dict())
+        advance_watermark(config_timestamps, run_id=run_id)
+        return
+
+    from growth_job_pipeline.output_writers import OutputFile
+
+    with OutputFile(
+        output_file,
+        compression=settings.output_compression,
+        # drop anything written after the last checkpoint
+        file_offset=checkpoint.file_offset if checkpoint is not None else None,
+    ) as file:
+        writer = csv.writer(file)
+        if checkpoint is None:
+            writer.writerow(output_columns)
+            checkpoint = ExtractionCheckpoint(
+                run_id=run_id,
+                telemetry_measurement_type=telemetry_type_to_fetch,
+                telemetry_measurement_unit=telemetry_unit_to_fetch,
+                from_timestamp=telemetry_bounding_timestamps.from_timestamp,
+                to_timestamp=telemetry_bounding_timestamps.to_timestamp,
+                file_offset=0,
+            )
+            file.sync(
+                partial(
+                    write_synced_checkpoint, run_output_dir_path, checkpoint
                 )
+            )
+        else:
+            logger.info(
+                f"Resuming run {run_id} after"
+                f" timestamp={checkpoint.last_timestamp},"
+                f" rows_written={checkpoint.rows_written}"
+            )
+
+        rows_written = checkpoint.rows_written
+        # fetching runs while the batcher is advanced, so is timed apart from writing
+        for batch in run_metrics.timed_iter(
+            telemetry_batches, "telemetry_fetch"
+        ):
+            with run_metrics.stage("output_write") as stage_metrics:
+                (
+                    batch_rows_fetched,
+                    batch_rows_written,
+                    last_timestamp,
+                ) = write_telemetry_batch(
+                    writer=writer,
+                    batch=batch,
+                    job_to_output_rows_specs=spec_records,
+                    columnar=columnar,
+                )
+                rows_written += batch_rows_written
+                bytes_written = file.bytes_written
+                file.flush()
+                stage_metrics.counters["rows_written"] += batch_rows_written
+                stage_metrics.counters["bytes_written"] += (
+                    file.bytes_written - bytes_written
+                )
+                checkpoint = checkpoint.model_copy(
+                    update={
+                        "last_timestamp": last_timestamp,
+                        "rows_written": rows_written,
+                    }
+                )
+                # written once the batch's rows are in the file, if compressed by
+                # the compression thread
+                file.sync(
+                    partial(
+                        write_synced_checkpoint,
+                        run_output_dir_path,
+                        checkpoint,
+                    )
+                )
+            fetch_counters = run_metrics.stages["telemetry_fetch"].counters
+            fetch_counters["batches"] += 1
+            fetch_counters["rows_fetched"] += batch_rows_fetched
+
+    if settings.output_compression != "none":
+        run_metrics.merge_stages({"output_compress": file.compress_metrics})
+    checkpoint = read_checkpoint(run_output_dir_path)
+    write_checkpoint(
+        run_output_dir_path, checkpoint.model_copy(update={"completed": True})
+    )
+    publish_run_output(output_file, run_id=run_id)
+    write_run_data(**run_data_kwargs, metrics=run_metrics.to_dict())
+    advance_watermark(config_timestamps, run_id=run_id)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,2 @@
+from .metrics import count_retry, run_metrics
+from .prometheus import export_prometheus_metrics
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def get_peak_rss_bytes() -> int | None:
+    """
+    Returns the process's peak resident set size, None where not available (Windows)
+    :return: int | None
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_rss_bytes() -> int | None:
+    """
+    Returns the process's current resident set size, falling back to its peak where
+    current is not available (no /proc), None if neither is
+    :return: int | None
+    """
+    try:
+        with open("/proc/self/statm", "rb") as file:
+            resident_pages = int(file.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return get_peak_rss_bytes()
+
+
+class StageMetrics:
+    """
+    Represents time spent and counters accumulated in a pipeline stage. Mutable.
+    Attributes:
+        calls: int, number of times the stage was entered
+        wall_time: float, seconds
+        cpu_time: float, seconds of process CPU time
+        counters: Counter[str], e.g. rows_fetched, api_calls, retries
+        rss_high_water: int | None, bytes, highest RSS seen on leaving the stage
+        peak_rss_increase: int, bytes the process's peak RSS grew by during the stage
+        python_heap_high_water: int | None, bytes, highest traced Python heap on
+            leaving the stage, only while tracemalloc is tracing
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.counters: Counter[str] = Counter()
+        self.rss_high_water: int | None = None
+        self.peak_rss_increase = 0
+        self.python_heap_high_water: int | None = None
+
+    def record_memory(self, rss: int | None, python_heap: int | None) -> None:
+        """
+        Raises the stage's memory high water marks to rss and python_heap, if higher
+        :param rss: int | None, bytes
+        :param python_heap: int | None, bytes
+        :return: None
+        """
+        if rss is not None:
+            self.rss_high_water = max(rss, self.rss_high_water or 0)
+        if python_heap is not None:
+            self.python_heap_high_water = max(
+                python_heap, self.python_heap_high_water or 0
+            )
+
+    def merge(self, other: StageMetrics) -> None:
+        """
+        Adds other's calls, times and counters to the stage's, e.g. from a worker
+        process. Memory high water marks are the higher of the two, as they were
+        measured in different processes
+        :param other: StageMetrics
+        :return: None
+        """
+        self.calls += other.calls
+        self.wall_time += other.wall_time
+        self.cpu_time += other.cpu_time
+        self.counters.update(other.counters)
+        self.record_memory(
+            rss=other.rss_high_water, python_heap=other.python_heap_high_water
+        )
+        self.peak_rss_increase = max(
+            self.peak_rss_increase, other.peak_rss_increase
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the stage metrics as a JSON serializable dict
+        :return: dict[str, Any]
+        """
+        return {
+            "calls": self.calls,
+            "wall_time_seconds": round(self.wall_time, 6),
+            "cpu_time_seconds": round(self.cpu_time, 6),
+            "rss_high_water_bytes": self.rss_high_water,
+            "peak_rss_increase_bytes": self.peak_rss_increase,
+            "python_heap_high_water_bytes": self.python_heap_high_water,
+            **dict(sorted(self.counters.items())),
+        }
+
+
+class RunMetrics:
+    """
+    Collects per-stage timings, counters and memory for a pipeline run
+    Stages are timed with the stage context manager, entering a stage again adds to
+    its totals. Counters are added to the innermost stage being timed, so code deep
+    in a stage (API calls, retries) counts without knowing which stage it runs in.
+    Memory is sampled each time a stage is left, e.g. after every telemetry batch
+    Attributes:
+        stages: dict[str, StageMetrics], in order first entered
+        memory_budget: int | None, bytes of RSS above which a stage raises MemoryError
+    """
+
+    def __init__(self, memory_budget: int | None = None) -> None:
+        self.stages: dict[str, StageMetrics] = {}
+        self.memory_budget = memory_budget
+        self._active_stages: list[str] = []
+        self._start_wall_time = time.perf_counter()
+        self._start_cpu_time = time.process_time()
+
+    def reset(self, memory_budget: int | None = None) -> None:
+        """
+        Discards all stages, restarting the run's total times
+        :param memory_budget: int | None, bytes
+        :return: None
+        """
+        self.__init__(memory_budget=memory_budget)
+
+    def check_memory_budget(self, stage_name: str, rss: int | None) -> None:
+        """
+        Raises MemoryError if rss is over the memory budget, before the OOM killer acts
+        :param stage_name: str
+        :param rss: int | None, bytes
+        :return: None
+        """
+        if self.memory_budget is None or rss is None:
+            return
+        if rss > self.memory_budget:
+            msg = (
+                f"RSS={rss} bytes over memory budget={self.memory_budget}"
+                f" bytes in stage={stage_name}"
+            )
+            logger.error(msg)
+            raise MemoryError(msg)
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[StageMetrics, None, None]:
+        """
+        Times the block as stage name, yields its StageMetrics
+        :param name: str
+        :return: Generator[StageMetrics, None, None]
+        """
+        stage_metrics = self.stages.setdefault(name, StageMetrics())
+        self._active_stages.append(name)
+        start_peak_rss = get_peak_rss_bytes()
+        start_wall_time = time.perf_counter()
+        start_cpu_time = time.process_time()
+        try:
+            yield stage_metrics
+        finally:
+            stage_metrics.wall_time += time.perf_counter() - start_wall_time
+            stage_metrics.cpu_time += time.process_time() - start_cpu_time
+            stage_metrics.calls += 1
+            self._active_stages.pop()
+            rss = get_rss_bytes()
+            if start_peak_rss is not None:
+                stage_metrics.peak_rss_increase += (
+                    get_peak_rss_bytes() - start_peak_rss
+                )
+            stage_metrics.record_memory(
+                rss=rss,
+                python_heap=(
+                    tracemalloc.get_traced_memory()[0]
+                    if tracemalloc.is_tracing()
+                    else None
+                ),
+            )
+        # not checked when the stage raised, so its error is not masked
+        self.check_memory_budget(name, rss)
+
+    def merge_stages(self, stages: dict[str, StageMetrics]) -> None:
+        """
+        Merges stages, e.g. collected by a worker process, into the run's
+        :param stages: dict[str, StageMetrics]
+        :return: None
+        """
+        for name, stage_metrics in stages.items():
+            self.stages.setdefault(name, StageMetrics()).merge(stage_metrics)
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """
+        Adds amount to counter of the innermost active stage, ignored if none active
+        :param counter: str
+        :param amount: int
+        :return: None
+        """
+        if self._active_stages:
+            self.stages[self._active_stages[-1]].counters[counter] += amount
+
+    def timed_iter(
+        self, iterable: Iterable[T], name: str
+    ) -> Generator[T, None, None]:
+        """
+        Yields items from iterable, timing only the time taken to produce each as stage name
+        Time the caller spends on each item is not counted
+        :param iterable: Iterable[T]
+        :param name: str
+        :return: Generator[T, None, None]
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns run totals and per-stage metrics as a JSON serializable dict
+        :return: dict[str, Any]
+        """
+        return {
+            "wall_time_seconds": round(
+                time.perf_counter() - self._start_wall_time, 6
+            ),
+            "cpu_time_seconds": round(
+                time.process_time() - self._start_cpu_time, 6
+            ),
+            "peak_rss_bytes": get_peak_rss_bytes(),
+            "stages": {
+                name: stage_metrics.to_dict()
+                for name, stage_metrics in self.stages.items()
+            },
+        }
+
+
+# shared by the pipeline modules, reset at the start of each run
+run_metrics = RunMetrics()
+
+
+def count_retry(details: dict[str, Any]) -> None:
+    """
+    backoff on_backoff handler, counts a retry in the active stage
+    :param details: dict[str, Any]
+    :return: None
+    """
+    run_metrics.increment("retries")
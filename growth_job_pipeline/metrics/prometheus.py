@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+from typing import Any, TYPE_CHECKING
+
+from growth_job_pipeline.config import get_settings
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "growth_job_pipeline"
+PROMETHEUS_TEXTFILE_NAME = f"{METRIC_PREFIX}.prom"
+
+# metric name -> (help, counter summed over all stages)
+counter_metrics = {
+    "api_calls": ("Growth jobs API calls made", "api_calls"),
+    "db_batches": ("Telemetry DB batches fetched", "batches"),
+    "retries": ("API and telemetry DB retries and reconnects", "retries"),
+    "rows_fetched": ("Telemetry rows fetched", "rows_fetched"),
+    "rows_written": ("Output rows written", "rows_written"),
+    "bytes_written": ("Output bytes written", "bytes_written"),
+    "matched_yield_results": (
+        "Yield results matched to a growth job",
+        "specs",
+    ),
+}
+
+
+def escape_label_value(value: str) -> str:
+    """
+    Escapes a label value for the Prometheus text format
+    :param value: str
+    :return: str
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_sample(name: str, labels: dict[str, str], value: float) -> str:
+    """
+    Returns a sample line in the Prometheus text format
+    :param name: str
+    :param labels: dict[str, str]
+    :param value: float
+    :return: str
+    """
+    label_str = ",".join(
+        f'{key}="{escape_label_value(str(label_value))}"'
+        for key, label_value in labels.items()
+    )
+    return f"{name}{{{label_str}}} {value}"
+
+
+def format_prometheus_metrics(
+    metrics: dict[str, Any],
+    labels: dict[str, str],
+    succeeded: bool,
+    finished_at: datetime.datetime,
+) -> str:
+    """
+    Returns run metrics, as from RunMetrics.to_dict, in the Prometheus text format
+    All metrics are gauges describing the last run, labelled with labels
+    :param metrics: dict[str, Any]
+    :param labels: dict[str, str]
+    :param succeeded: bool
+    :param finished_at: datetime.datetime
+    :return: str
+    """
+    lines = []
+
+    def add_gauge(name: str, help_text: str, samples: list[tuple]) -> None:
+        metric_name = f"{METRIC_PREFIX}_{name}"
+        lines.append(f"# HELP {metric_name} {help_text}")
+        lines.append(f"# TYPE {metric_name} gauge")
+        for sample_labels, value in samples:
+            lines.append(
+                format_sample(metric_name, {**labels, **sample_labels}, value)
+            )
+
+    stages = metrics["stages"]
+    counters = {
+        name: sum(stage.get(counter, 0) for stage in stages.values())
+        for name, (_, counter) in counter_metrics.items()
+    }
+    wall_time = metrics["wall_time_seconds"]
+
+    add_gauge(
+        "last_run_success",
+        "1 if the last run succeeded, else 0",
+        [({}, int(succeeded))],
+    )
+    add_gauge(
+        "last_run_finished_timestamp_seconds",
+        "Unix time the last run finished",
+        [({}, finished_at.timestamp())],
+    )
+    add_gauge(
+        "run_duration_seconds",
+        "Wall time of the last run",
+        [({}, wall_time)],
+    )
+    add_gauge(
+        "run_cpu_seconds",
+        "CPU time of the last run",
+        [({}, metrics["cpu_time_seconds"])],
+    )
+    add_gauge(
+        "stage_duration_seconds",
+        "Wall time of each stage of the last run",
+        [
+            ({"stage": name}, stage["wall_time_seconds"])
+            for name, stage in stages.items()
+        ],
+    )
+    add_gauge(
+        "stage_cpu_seconds",
+        "CPU time of each stage of the last run",
+        [
+            ({"stage": name}, stage["cpu_time_seconds"])
+            for name, stage in stages.items()
+        ],
+    )
+    add_gauge(
+        "stage_rss_high_water_bytes",
+        "Highest RSS seen leaving each stage of the last run",
+        [
+            ({"stage": name}, stage["rss_high_water_bytes"])
+            for name, stage in stages.items()
+            if stage.get("rss_high_water_bytes") is not None
+        ],
+    )
+    add_gauge(
+        "rows_per_second",
+        "Telemetry rows fetched per second of the last run's wall time",
+        [
+            (
+                {},
+                round(counters["rows_fetched"] / wall_time, 1)
+                if wall_time
+                else 0,
+            )
+        ],
+    )
+    for name, (help_text, _) in counter_metrics.items():
+        add_gauge(name, f"{help_text} in the last run", [({}, counters[name])])
+    if metrics.get("peak_rss_bytes") is not None:
+        add_gauge(
+            "peak_rss_bytes",
+            "Peak resident set size of the last run",
+            [({}, metrics["peak_rss_bytes"])],
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(path: str, text: str) -> None:
+    """
+    Atomically writes a Prometheus textfile
+    Written to a temp file in the same dir then renamed, so scrapes never read a partial file.
+    The temp file does not end .prom so the textfile collector ignores it
+    :param path: str
+    :param text: str
+    :return: None
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def export_prometheus_metrics(
+    run_output_dir_path: str,
+    run_id: UUID,
+    metrics: dict[str, Any],
+    succeeded: bool,
+) -> None:
+    """
+    Writes run metrics as a Prometheus textfile, if PROMETHEUS_TEXTFILE_DIR set in config
+    Written to PROMETHEUS_TEXTFILE_DIR for node-exporter's textfile collector, overwriting
+    the previous run's, and alongside run data in run_output_dir
+    :param run_output_dir_path: str
+    :param run_id: UUID
+    :param metrics: dict[str, Any], as from RunMetrics.to_dict
+    :param succeeded: bool
+    :return: None
+    """
+    settings = get_settings()
+    textfile_dir_path = settings.prometheus_textfile_dir
+    if not textfile_dir_path:
+        return
+    text = format_prometheus_metrics(
+        metrics=metrics,
+        labels={
+            "environment": settings.deploy_environment,
+            "measurement_type": settings.measurement_type or "",
+            "measurement_unit": settings.measurement_unit or "",
+        },
+        succeeded=succeeded,
+        finished_at=datetime.datetime.now(),
+    )
+    try:
+        write_prometheus_textfile(
+            os.path.join(run_output_dir_path, f"metrics_{run_id}.prom"), text
+        )
+        write_prometheus_textfile(
+            os.path.join(textfile_dir_path, PROMETHEUS_TEXTFILE_NAME), text
+        )
+    except OSError as e:
+        # metrics are not worth failing a run over
+        logger.error(f"Error: {e}. Could not write Prometheus textfile")
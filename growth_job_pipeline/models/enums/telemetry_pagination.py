@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class TelemetryPagination(str, Enum):
+    """
+    Represents allowed strategies for paging telemetry entries out of the telemetry DB
+    offset: one query per batch, skipping rows already fetched
+    keyset: one query per batch, starting after the last timestamp fetched
+    stream: a single query, with batches fetched from the open cursor
+    """
+
+    offset = "offset"
+    keyset = "keyset"
+    stream = "stream"
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import datetime
+from typing import NamedTuple, TYPE_CHECKING
+
+from growth_job_pipeline.models.validators.output_row import output_columns
+
+if TYPE_CHECKING:
+    from growth_job_pipeline.models.validators.job_to_output_rows_spec import (
+        JobToOutputRowsSpec,
+    )
+
+# output columns taken from the spec, between timestamp and the telemetry columns
+spec_output_columns = output_columns[1:-3]
+
+
+class JobToOutputRowsSpecRecord(NamedTuple):
+    """
+    Represents a job to output rows spec inside the extraction loop. Immutable.
+    Not a pydantic model: created with from_spec from a validated JobToOutputRowsSpec
+    Attributes:
+        growth_job_start_date: datetime.datetime
+        growth_job_end_date: datetime.datetime
+        output_values: tuple, the spec's output column values, serialized as in
+            OutputRow JSON mode
+    """
+
+    growth_job_start_date: datetime.datetime
+    growth_job_end_date: datetime.datetime
+    output_values: tuple
+
+    @classmethod
+    def from_spec(cls, spec: JobToOutputRowsSpec) -> JobToOutputRowsSpecRecord:
+        """
+        Returns the record for a validated spec, serializing its output values once
+        :param spec: JobToOutputRowsSpec
+        :return: JobToOutputRowsSpecRecord
+        """
+        spec_json = spec.model_dump(mode="json")
+        return cls(
+            growth_job_start_date=spec.growth_job_start_date,
+            growth_job_end_date=spec.growth_job_end_date,
+            output_values=tuple(
+                spec_json[column] for column in spec_output_columns
+            ),
+        )
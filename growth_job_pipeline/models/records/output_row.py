@@ -0,0 +1,22 @@
+from typing import NamedTuple
+
+
+class OutputRowRecord(NamedTuple):
+    """
+    Represents a row in the output file, values serialized as in OutputRow JSON mode.
+    Immutable. Not a pydantic model: OutputRow's checks follow from the validated spec
+    and telemetry entry it is built from. Fields in output_columns order, so it is
+    written as is by csv.writer
+    """
+
+    timestamp: str
+    crop: str
+    growth_job_id: int
+    growth_job_start_date: str
+    growth_job_end_date: str
+    yield_recorded_date: str
+    yield_weight: float
+    yield_unit: str
+    telemetry_measurement_type: str
+    telemetry_measurement_unit: str
+    telemetry_measurement_value: float
@@ -0,0 +1,71 @@
+import datetime
+from typing import NamedTuple, Sequence
+
+from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+    TelemetryMeasurementType,
+)
+from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+    TelemetryMeasurementUnit,
+)
+
+
+class TelemetryColumns(NamedTuple):
+    """
+    Represents a batch of telemetry entries column-wise, for a single type and unit. Immutable.
+    Not a pydantic model: validated once per batch with validate_telemetry_columns
+    Attributes:
+        timestamps: Sequence[datetime.datetime], ascending
+        values: Sequence[float], contiguous float buffer, e.g. array("d")
+        type: TelemetryMeasurementType
+        unit: TelemetryMeasurementUnit
+    """
+
+    timestamps: Sequence[datetime.datetime]
+    values: Sequence[float]
+    type: TelemetryMeasurementType
+    unit: TelemetryMeasurementUnit
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Returns the number of telemetry entries in the batch
+        :return: int
+        """
+        return len(self.timestamps)
+
+
+def validate_telemetry_columns(
+    columns: TelemetryColumns,
+    from_timestamp: datetime.datetime,
+    to_timestamp: datetime.datetime,
+) -> TelemetryColumns:
+    """
+    Validates a batch of telemetry columns, returns it unchanged
+    Raises ValueError if columns differ in length, timestamps are not datetimes ascending
+    within from -> to range, or values are not numbers
+    :param columns: TelemetryColumns
+    :param from_timestamp: datetime.datetime
+    :param to_timestamp: datetime.datetime
+    :return: TelemetryColumns
+    """
+    timestamps = columns.timestamps
+    if len(timestamps) != len(columns.values):
+        raise ValueError(
+            f"{len(timestamps)} timestamps but {len(columns.values)} values"
+        )
+    if not timestamps:
+        return columns
+    if not all(isinstance(ts, datetime.datetime) for ts in timestamps):
+        raise ValueError("timestamps must all be datetime.datetime")
+    if any(
+        later < earlier for earlier, later in zip(timestamps, timestamps[1:])
+    ):
+        raise ValueError("timestamps not in ascending order")
+    if not from_timestamp <= timestamps[0] <= timestamps[-1] <= to_timestamp:
+        raise ValueError(
+            f"timestamps from {timestamps[0]} to {timestamps[-1]} outside"
+            f" range {from_timestamp} to {to_timestamp}"
+        )
+    if any(value != value for value in columns.values):
+        raise ValueError("values must be numbers, found NaN")
+    return columns
@@ -0,0 +1,70 @@
+import datetime
+from functools import cache
+from typing import Any, Iterable, NamedTuple
+
+from pydantic import ConfigDict, TypeAdapter
+
+from growth_job_pipeline.models.validators.telemetry_entry import (
+    TelemetryEntry,
+)
+
+
+class TelemetryEntryRecord(NamedTuple):
+    """
+    Represents a telemetry database entry inside the pipeline. Immutable.
+    Not a pydantic model: rows are validated once on fetch with validate_telemetry_rows,
+    against TelemetryEntry's fields. type and unit hold enum values, as TelemetryEntry
+    Attributes:
+        timestamp: datetime.datetime
+        type: str, TelemetryMeasurementType value
+        value: float
+        unit: str, TelemetryMeasurementUnit value
+    """
+
+    timestamp: datetime.datetime
+    type: str
+    value: float
+    unit: str
+
+
+@cache
+def get_rows_adapter(field_names: tuple[str, ...]) -> TypeAdapter:
+    """
+    Returns a TypeAdapter validating a list of rows of TelemetryEntry's fields
+    field_names, enums as their values. Cached, there is one per query shape
+    Raises KeyError for a name not a TelemetryEntry field
+    :param field_names: tuple[str, ...]
+    :return: TypeAdapter
+    """
+    row_type = tuple[
+        tuple(
+            TelemetryEntry.model_fields[name].annotation
+            for name in field_names
+        )
+    ]
+    return TypeAdapter(list[row_type], config=ConfigDict(use_enum_values=True))
+
+
+def validate_telemetry_rows(
+    column_names: list[str],
+    rows: list[Iterable],
+    constant_fields: dict[str, Any] | None = None,
+) -> list[TelemetryEntryRecord]:
+    """
+    Validates telemetry DB rows against TelemetryEntry's fields, returns them as records
+    Fields in constant_fields, the same for every row, are validated once
+    Raises pydantic.ValidationError for an invalid row
+    :param column_names: list[str]
+    :param rows: list[Iterable]
+    :param constant_fields: dict[str, Any] | None
+    :return: list[TelemetryEntryRecord]
+    """
+    constant_fields = constant_fields or {}
+    (constant_values,) = get_rows_adapter(
+        tuple(constant_fields)
+    ).validate_python([tuple(constant_fields.values())])
+    constant_fields = dict(zip(constant_fields, constant_values))
+    return [
+        TelemetryEntryRecord(**constant_fields, **dict(zip(column_names, row)))
+        for row in get_rows_adapter(tuple(column_names)).validate_python(rows)
+    ]
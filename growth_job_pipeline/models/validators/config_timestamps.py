@@ -9,10 +9,12 @@ class ConfigTimestamps(BaseModel):
     Attributes:
         from_timestamp: datetime | None
         to_timestamp: datetime | None
+        incremental: bool, window from the watermark, advanced once the run succeeds
     """
 
     from_timestamp: datetime | None
     to_timestamp: datetime | None
+    incremental: bool = False
 
     class Config:
         extra = "forbid"
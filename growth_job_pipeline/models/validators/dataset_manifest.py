@@ -0,0 +1,41 @@
+import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, NonNegativeInt
+
+
+class DatasetFile(BaseModel):
+    """
+    Represents a file of output rows for one growth job in a dataset partition. Immutable.
+    Attributes:
+        rows: NonNegativeInt
+        bytes: NonNegativeInt
+        run_id: UUID, of the run that wrote it
+        updated_at: datetime.datetime
+    """
+
+    rows: NonNegativeInt
+    bytes: NonNegativeInt
+    run_id: UUID
+    updated_at: datetime.datetime
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+
+
+class DatasetManifest(BaseModel):
+    """
+    Represents the files in a partitioned dataset. Immutable.
+    Attributes:
+        partitions: dict[str, dict[str, DatasetFile]], files by name by partition
+            path, e.g. date=2022-01-05/crop=basil
+        updated_at: datetime.datetime | None
+    """
+
+    partitions: dict[str, dict[str, DatasetFile]] = {}
+    updated_at: datetime.datetime | None = None
+
+    class Config:
+        extra = "forbid"
+        frozen = True
@@ -0,0 +1,58 @@
+import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, NonNegativeInt, model_validator
+
+from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+    TelemetryMeasurementType,
+)
+from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+    TelemetryMeasurementUnit,
+)
+
+
+class ExtractionCheckpoint(BaseModel):
+    """
+    Represents progress of telemetry extraction for a run. Immutable.
+    Validated on creation to ensure last_timestamp, if set, is within from -> to range
+    Attributes:
+        run_id: UUID
+        telemetry_measurement_type: TelemetryMeasurementType
+        telemetry_measurement_unit: TelemetryMeasurementUnit
+        from_timestamp: datetime.datetime
+        to_timestamp: datetime.datetime
+        last_timestamp: datetime.datetime | None
+        file_offset: NonNegativeInt
+        rows_written: NonNegativeInt
+        completed: bool
+    """
+
+    run_id: UUID
+    telemetry_measurement_type: TelemetryMeasurementType
+    telemetry_measurement_unit: TelemetryMeasurementUnit
+    from_timestamp: datetime.datetime
+    to_timestamp: datetime.datetime
+    last_timestamp: datetime.datetime | None = None
+    file_offset: NonNegativeInt
+    rows_written: NonNegativeInt = 0
+    completed: bool = False
+
+    @model_validator(mode="after")
+    def last_timestamp_in_range(self) -> "ExtractionCheckpoint":
+        """
+        Validates that last_timestamp is between from_timestamp and to_timestamp
+        :return: ExtractionCheckpoint
+        """
+        if self.last_timestamp is not None and not (
+            self.from_timestamp <= self.last_timestamp <= self.to_timestamp
+        ):
+            raise ValueError(
+                "last_timestamp not between from_timestamp and"
+                f" to_timestamp: {self}"
+            )
+        return self
+
+    class Config:
+        use_enum_values = True
+        extra = "forbid"
+        frozen = True
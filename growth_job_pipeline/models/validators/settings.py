@@ -0,0 +1,165 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import (
+    BaseModel,
+    NonNegativeFloat,
+    NonNegativeInt,
+    PositiveInt,
+    model_validator,
+)
+
+from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+    TelemetryMeasurementType,
+)
+from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+    TelemetryMeasurementUnit,
+)
+from growth_job_pipeline.models.enums.telemetry_pagination import (
+    TelemetryPagination,
+)
+
+
+class Settings(BaseModel):
+    """
+    Represents all config values, each field read from the upper-cased key. Immutable.
+    Validated on creation to ensure from_timestamp, if set, is before to_timestamp, and
+    output_mode dataset is only combined with uncompressed CSV output_format
+    Attributes:
+        deploy_environment: Literal["staging", "production"]
+        telemetry_db_host: str
+        telemetry_db_port: PositiveInt
+        telemetry_db_name: str
+        telemetry_db_username: str | None
+        telemetry_db_password: str | None
+        telemetry_db_batch_size: PositiveInt
+        telemetry_db_max_reconnects: NonNegativeInt
+        telemetry_db_backend: Literal["mssql", "sqlite"]
+        telemetry_db_sqlite_path: str | None
+        telemetry_db_pagination: TelemetryPagination
+        telemetry_db_columnar: bool
+        telemetry_db_arrow: bool
+        growth_jobs_api_url: str
+        growth_jobs_cache_seconds: NonNegativeFloat
+        max_days_delay_growth_job_yield_result: PositiveInt
+        debug: bool
+        output_dir: str
+        output_mode: Literal["run", "dataset"]
+        output_format: Literal["csv", "parquet"]
+        output_compression: Literal["none", "gzip", "zstd"], of CSV output
+        yield_results_file: str | None
+        measurement_type: TelemetryMeasurementType | None
+        measurement_unit: TelemetryMeasurementUnit | None
+        from_timestamp: datetime | Literal["auto"] | None, auto from the watermark
+        to_timestamp: datetime | None
+        profile_cprofile: bool
+        profile_tracemalloc: bool
+        profile_tracemalloc_frames: PositiveInt
+        profile_tracemalloc_top: PositiveInt
+        prometheus_textfile_dir: str | None
+        memory_budget_mb: PositiveInt | None
+        log_format: Literal["text", "json"]
+        log_rate_limit_seconds: NonNegativeFloat
+        daemon_interval_seconds: PositiveInt
+        backfill_workers: PositiveInt
+    """
+
+    deploy_environment: Literal["staging", "production"]
+    telemetry_db_host: str
+    telemetry_db_port: PositiveInt
+    telemetry_db_name: str
+    telemetry_db_username: str | None = None
+    telemetry_db_password: str | None = None
+    telemetry_db_batch_size: PositiveInt
+    telemetry_db_max_reconnects: NonNegativeInt
+    telemetry_db_backend: Literal["mssql", "sqlite"] = "mssql"
+    telemetry_db_sqlite_path: str | None = None
+    telemetry_db_pagination: TelemetryPagination = TelemetryPagination.offset
+    telemetry_db_columnar: bool = False
+    telemetry_db_arrow: bool = True
+    growth_jobs_api_url: str
+    growth_jobs_cache_seconds: NonNegativeFloat = 0
+    max_days_delay_growth_job_yield_result: PositiveInt
+    debug: bool
+    output_dir: str = "/growth_job_pipeline_data"
+    output_mode: Literal["run", "dataset"] = "run"
+    output_format: Literal["csv", "parquet"] = "csv"
+    output_compression: Literal["none", "gzip", "zstd"] = "none"
+    yield_results_file: str | None = None
+    measurement_type: TelemetryMeasurementType | None = None
+    measurement_unit: TelemetryMeasurementUnit | None = None
+    from_timestamp: datetime | Literal["auto"] | None = None
+    to_timestamp: datetime | None = None
+    profile_cprofile: bool = False
+    profile_tracemalloc: bool = False
+    profile_tracemalloc_frames: PositiveInt = 1
+    profile_tracemalloc_top: PositiveInt = 25
+    prometheus_textfile_dir: str | None = None
+    memory_budget_mb: PositiveInt | None = None
+    log_format: Literal["text", "json"] = "text"
+    log_rate_limit_seconds: NonNegativeFloat = 1.0
+    daemon_interval_seconds: PositiveInt = 3600
+    backfill_workers: PositiveInt = 4
+
+    @model_validator(mode="after")
+    def from_timestamp_before_to_timestamp(self) -> "Settings":
+        """
+        Validates that from_timestamp is before to_timestamp, if both set
+        :return: Settings
+        """
+        if (
+            isinstance(self.from_timestamp, datetime)
+            and self.to_timestamp is not None
+            and self.to_timestamp <= self.from_timestamp
+        ):
+            raise ValueError(
+                f"to_timestamp={self.to_timestamp} less than or equal to"
+                f" from_timestamp={self.from_timestamp}"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def output_format_supports_output_mode(self) -> "Settings":
+        """
+        Validates that output_format is csv and output_compression none if output_mode
+        is dataset, the dataset being partitioned CSV files. Validates that
+        output_compression is none unless output_format is csv
+        :return: Settings
+        """
+        if self.output_mode == "dataset" and (
+            self.output_format != "csv" or self.output_compression != "none"
+        ):
+            raise ValueError(
+                f"output_format={self.output_format},"
+                f" output_compression={self.output_compression} not supported"
+                f" with output_mode={self.output_mode}"
+            )
+        if self.output_format != "csv" and self.output_compression != "none":
+            raise ValueError(
+                f"output_compression={self.output_compression} not supported"
+                f" with output_format={self.output_format}"
+            )
+        return self
+
+    def missing_run_keys(self) -> list[str]:
+        """
+        Returns config keys unset that a pipeline run needs, for the backend chosen
+        :return: list[str]
+        """
+        required = [
+            "yield_results_file",
+            "measurement_type",
+            "measurement_unit",
+        ]
+        if self.telemetry_db_backend == "mssql":
+            required += ["telemetry_db_username", "telemetry_db_password"]
+        else:
+            required += ["telemetry_db_sqlite_path"]
+        return [
+            name.upper() for name in required if getattr(self, name) is None
+        ]
+
+    class Config:
+        use_enum_values = True
+        extra = "forbid"
+        frozen = True
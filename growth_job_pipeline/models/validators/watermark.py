@@ -0,0 +1,22 @@
+import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class Watermark(BaseModel):
+    """
+    Represents the end of the latest window of yield results fully processed. Immutable.
+    Attributes:
+        to_timestamp: datetime.datetime, next window starts here
+        run_id: UUID, of the run that processed the window
+        updated_at: datetime.datetime
+    """
+
+    to_timestamp: datetime.datetime
+    run_id: UUID
+    updated_at: datetime.datetime
+
+    class Config:
+        extra = "forbid"
+        frozen = True
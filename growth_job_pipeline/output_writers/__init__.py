@@ -0,0 +1,3 @@
+from .csv_writer import telemetry_columns_to_output_rows
+from .output_file import get_compression_summary, OutputFile
+from .parquet_writer import ParquetOutputWriter, write_parquet_output
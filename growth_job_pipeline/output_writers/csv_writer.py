@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterator, Sequence, TYPE_CHECKING
+
+from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+    TelemetryMeasurementType,
+)
+from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+    TelemetryMeasurementUnit,
+)
+
+if TYPE_CHECKING:
+    import datetime
+
+    from growth_job_pipeline.models.records.job_to_output_rows_spec import (
+        JobToOutputRowsSpecRecord,
+    )
+    from growth_job_pipeline.models.records.telemetry_columns import (
+        TelemetryColumns,
+    )
+
+
+def spec_segments(
+    timestamps: Sequence[datetime.datetime],
+    job_to_output_rows_specs: list[JobToOutputRowsSpecRecord],
+) -> Iterator[tuple[int, int, list[int]]]:
+    """
+    Yields ascending segments of timestamps in range of a constant set of specs, each
+    as start and end index with the indexes of the specs in range, in spec order.
+    Segments in range of no spec are skipped
+    :param timestamps: Sequence[datetime.datetime], ascending
+    :param job_to_output_rows_specs: list[JobToOutputRowsSpecRecord]
+    :return: Iterator[tuple[int, int, list[int]]]
+    """
+    spec_slices = [
+        (
+            bisect_left(timestamps, spec.growth_job_start_date),
+            bisect_right(timestamps, spec.growth_job_end_date),
+        )
+        for spec in job_to_output_rows_specs
+    ]
+    # between consecutive boundaries the set of specs in range is constant
+    boundaries = sorted(
+        {0, len(timestamps)}
+        | {start for start, _ in spec_slices}
+        | {end for _, end in spec_slices}
+    )
+    for segment_start, segment_end in zip(boundaries, boundaries[1:]):
+        spec_indexes = [
+            spec_index
+            for spec_index, (start, end) in enumerate(spec_slices)
+            if start <= segment_start and segment_end <= end
+        ]
+        if spec_indexes:
+            yield segment_start, segment_end, spec_indexes
+
+
+def telemetry_columns_to_output_rows(
+    writer: Any,
+    columns: TelemetryColumns,
+    job_to_output_rows_specs: list[JobToOutputRowsSpecRecord],
+) -> int:
+    """
+    Writes a column-wise telemetry batch to output rows, returns number of rows written
+    Same rows in the same order as telemetry_entry_to_output_rows per entry, without
+    per-row models: each spec's rows are a slice of the ascending timestamps, and
+    OutputRow's checks follow from the validated spec plus the slice bounds
+    :param writer: csv.writer
+    :param columns: TelemetryColumns
+    :param job_to_output_rows_specs: list[JobToOutputRowsSpecRecord]
+    :return: int
+    """
+    timestamps = columns.timestamps
+    values = columns.values
+    type_value = TelemetryMeasurementType(columns.type).value
+    unit_value = TelemetryMeasurementUnit(columns.unit).value
+
+    rows_written = 0
+    for segment_start, segment_end, spec_indexes in spec_segments(
+        timestamps, job_to_output_rows_specs
+    ):
+        segment_spec_values = [
+            job_to_output_rows_specs[spec_index].output_values
+            for spec_index in spec_indexes
+        ]
+        writer.writerows(
+            (
+                timestamps[i].isoformat(),
+                *spec_values,
+                type_value,
+                unit_value,
+                values[i],
+            )
+            for i in range(segment_start, segment_end)
+            for spec_values in segment_spec_values
+        )
+        rows_written += (segment_end - segment_start) * len(
+            segment_spec_values
+        )
+    return rows_written
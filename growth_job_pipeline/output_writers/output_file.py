@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+import zlib
+from typing import Any, Callable, Literal
+
+from growth_job_pipeline.metrics.metrics import StageMetrics
+
+logger = logging.getLogger(__name__)
+
+Compression = Literal["none", "gzip", "zstd"]
+
+# text is encoded and handed to the compression thread in chunks of about this size
+CHUNK_SIZE = 1024 * 1024
+# chunks queued for the compression thread before writes block, bounding memory
+MAX_QUEUED_CHUNKS = 8
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+_STOP = object()
+
+
+def new_compressor(compression: Compression) -> Any:
+    """
+    Returns a compressor for one gzip member or zstd frame, with compress(bytes) and
+    flush() ending the member or frame. Concatenated members or frames decompress
+    to the concatenated data, so a file can be appended to after a flush
+    Raises ImportError if zstd is chosen and the optional zstandard package (extra
+    "zstd") is not installed
+    :param compression: Compression, gzip or zstd
+    :return: compressor
+    """
+    if compression == "gzip":
+        # wbits 31: deflate with a gzip header and trailer
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    import zstandard
+
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+
+class OutputFile:
+    """
+    A text file for csv.writer, written uncompressed or, streaming, as gzip or zstd
+    Written text is buffered and encoded in chunks. If compressed, chunks are put on
+    a bounded queue for a background thread to compress and write, so compression
+    runs alongside row formatting, and writes block once the queue is full.
+    sync ends the current gzip member or zstd frame, so the file can be truncated
+    to the offset it reports and appended to, e.g. to resume from a checkpoint
+    Attributes:
+        path: str
+        compression: Compression
+        bytes_written: int, uncompressed bytes written
+        compress_metrics: StageMetrics, time the compression thread spent
+            compressing and writing, counting uncompressed and compressed bytes
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compression: Compression = "none",
+        file_offset: int | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        """
+        :param path: str
+        :param compression: Compression
+        :param file_offset: int | None, truncated to and appended at if set, else the
+            file is created or overwritten
+        :param chunk_size: int, bytes
+        """
+        self.path = path
+        self.compression = compression
+        self.bytes_written = 0
+        self.compress_metrics = StageMetrics()
+        self._chunk_size = chunk_size
+        self._buffer: list[str] = []
+        self._buffer_size = 0
+        self._error: BaseException | None = None
+        if compression != "none":
+            # fails here, before any file is created, if zstandard is missing
+            new_compressor(compression)
+        self._file = open(path, "wb" if file_offset is None else "r+b")
+        if file_offset is not None:
+            self._file.truncate(file_offset)
+            self._file.seek(file_offset)
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+        if compression != "none":
+            self._queue = queue.Queue(maxsize=MAX_QUEUED_CHUNKS)
+            self._thread = threading.Thread(
+                target=self._compress_chunks,
+                name=f"compress-{compression}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def write(self, text: str) -> int:
+        """
+        Buffers text, handing on a chunk once the buffer reaches the chunk size
+        :param text: str
+        :return: int, characters written
+        """
+        self._buffer.append(text)
+        self._buffer_size += len(text)
+        if self._buffer_size >= self._chunk_size:
+            self.flush()
+        return len(text)
+
+    def sync(self, callback: Callable[[int], None] | None = None) -> None:
+        """
+        Writes all text buffered, ending the current gzip member or zstd frame, then
+        calls callback with the file offset everything written so far ends at.
+        If compressed, callback is called on the compression thread once it gets
+        there, so must not touch state the caller goes on to change
+        :param callback: Callable[[int], None] | None
+        :return: None
+        """
+        self.flush()
+        if self._queue is None:
+            self._file.flush()
+            if callback is not None:
+                callback(self._file.tell())
+            return
+        self._put(callback)
+
+    def close(self) -> None:
+        """
+        Syncs, waits for the compression thread to finish then closes the file
+        Raises the compression thread's error, if any
+        :return: None
+        """
+        if self._file.closed:
+            return
+        try:
+            self.sync()
+            if self._queue is not None:
+                self._put(_STOP)
+        finally:
+            if self._thread is not None:
+                self._thread.join()
+            self._file.close()
+        self._raise_error()
+
+    def __enter__(self) -> OutputFile:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # don't mask the error leaving the block with one from the thread
+        try:
+            self.close()
+        except Exception as e:
+            logger.error(f"Error: {e}. Closing output file {self.path} failed")
+
+    def flush(self) -> None:
+        """
+        Hands on all text buffered, to be compressed if compressed, without ending
+        the current gzip member or zstd frame
+        :return: None
+        """
+        if not self._buffer:
+            return
+        data = "".join(self._buffer).encode()
+        self._buffer = []
+        self._buffer_size = 0
+        self.bytes_written += len(data)
+        if self._queue is None:
+            self._file.write(data)
+        else:
+            self._put(data)
+
+    def _put(self, item: Any) -> None:
+        self._raise_error()
+        self._queue.put(item)
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            msg = (
+                f"Error: {self._error}. Compressing output file {self.path}"
+                " failed"
+            )
+            logger.error(msg)
+            raise RuntimeError(msg) from self._error
+
+    def _compress_chunks(self) -> None:
+        compressor = None
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            # after an error, keep taking chunks so writes don't block forever
+            if self._error is not None:
+                continue
+            start_wall_time = time.perf_counter()
+            start_cpu_time = time.thread_time()
+            try:
+                if isinstance(item, bytes):
+                    if compressor is None:
+                        compressor = new_compressor(self.compression)
+                    compressed = compressor.compress(item)
+                    self.compress_metrics.counters[
+                        "uncompressed_bytes"
+                    ] += len(item)
+                else:
+                    compressed = (
+                        compressor.flush() if compressor is not None else b""
+                    )
+                    compressor = None
+                self._file.write(compressed)
+                self.compress_metrics.counters["compressed_bytes"] += len(
+                    compressed
+                )
+                if not isinstance(item, bytes):
+                    self._file.flush()
+                    if item is not None:
+                        item(self._file.tell())
+            except BaseException as e:
+                self._error = e
+            finally:
+                self.compress_metrics.wall_time += (
+                    time.perf_counter() - start_wall_time
+                )
+                self.compress_metrics.cpu_time += (
+                    time.thread_time() - start_cpu_time
+                )
+                self.compress_metrics.calls += 1
+
+
+def get_compression_summary(
+    compression: Compression, compress_stage: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Returns compression ratio and throughput from an output_compress stage in run
+    metrics, uncompressed over compressed bytes and uncompressed bytes per second
+    :param compression: Compression
+    :param compress_stage: dict[str, Any], StageMetrics.to_dict
+    :return: dict[str, Any]
+    """
+    uncompressed_bytes = compress_stage.get("uncompressed_bytes", 0)
+    compressed_bytes = compress_stage.get("compressed_bytes", 0)
+    wall_time = compress_stage["wall_time_seconds"]
+    return {
+        "compression": compression,
+        "uncompressed_bytes": uncompressed_bytes,
+        "compressed_bytes": compressed_bytes,
+        "ratio": (
+            round(uncompressed_bytes / compressed_bytes, 3)
+            if compressed_bytes
+            else None
+        ),
+        "throughput_bytes_per_second": (
+            round(uncompressed_bytes / wall_time) if wall_time else None
+        ),
+    }
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import datetime
+from typing import Any, Iterable, TYPE_CHECKING
+
+from growth_job_pipeline.metrics import run_metrics
+from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+    TelemetryMeasurementType,
+)
+from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+    TelemetryMeasurementUnit,
+)
+from growth_job_pipeline.models.records.job_to_output_rows_spec import (
+    spec_output_columns,
+)
+from growth_job_pipeline.models.records.telemetry_columns import (
+    TelemetryColumns,
+)
+from growth_job_pipeline.models.validators.output_row import output_columns
+from growth_job_pipeline.output_writers.csv_writer import spec_segments
+
+if TYPE_CHECKING:
+    import pyarrow
+
+    from growth_job_pipeline.models.records.telemetry_entry import (
+        TelemetryEntryRecord,
+    )
+    from growth_job_pipeline.models.validators.job_to_output_rows_spec import (
+        JobToOutputRowsSpec,
+    )
+
+# repeated in every output row of a batch, so dictionary encoded
+TELEMETRY_OUTPUT_COLUMNS = [
+    "telemetry_measurement_type",
+    "telemetry_measurement_unit",
+]
+
+
+def get_output_schema() -> pyarrow.Schema:
+    """
+    Returns the Parquet output schema, native timestamp, date and float types with
+    spec and telemetry type and unit columns dictionary encoded
+    Raises ValueError if the schema's columns are not output_columns, in order
+    :return: pyarrow.Schema
+    """
+    import pyarrow
+
+    def dictionary(value_type: pyarrow.DataType) -> pyarrow.DataType:
+        return pyarrow.dictionary(pyarrow.int32(), value_type)
+
+    schema = pyarrow.schema(
+        [
+            ("timestamp", pyarrow.timestamp("us")),
+            ("crop", dictionary(pyarrow.string())),
+            ("growth_job_id", dictionary(pyarrow.int64())),
+            ("growth_job_start_date", dictionary(pyarrow.timestamp("us"))),
+            ("growth_job_end_date", dictionary(pyarrow.timestamp("us"))),
+            ("yield_recorded_date", dictionary(pyarrow.date32())),
+            ("yield_weight", dictionary(pyarrow.float64())),
+            ("yield_unit", dictionary(pyarrow.string())),
+            ("telemetry_measurement_type", dictionary(pyarrow.string())),
+            ("telemetry_measurement_unit", dictionary(pyarrow.string())),
+            ("telemetry_measurement_value", pyarrow.float64()),
+        ]
+    )
+    if schema.names != output_columns:
+        raise ValueError(
+            f"Parquet output columns={schema.names} are not"
+            f" output_columns={output_columns}"
+        )
+    return schema
+
+
+def batch_to_telemetry_columns(
+    batch: list[TelemetryEntryRecord] | TelemetryColumns,
+) -> TelemetryColumns:
+    """
+    Returns a batch from resumable_telemetry_entries_batcher column-wise
+    :param batch: list[TelemetryEntryRecord] | TelemetryColumns, if columnar
+    :return: TelemetryColumns
+    """
+    if isinstance(batch, TelemetryColumns):
+        return batch
+    return TelemetryColumns(
+        timestamps=[entry.timestamp for entry in batch],
+        values=[entry.value for entry in batch],
+        type=batch[0].type,
+        unit=batch[0].unit,
+    )
+
+
+def get_output_row_indexes(
+    timestamps: list[datetime.datetime],
+    job_to_output_rows_specs: list[JobToOutputRowsSpec],
+) -> tuple[list[int], list[int]]:
+    """
+    Returns the telemetry entry and spec index of each output row for a batch, rows in
+    the same order as telemetry_columns_to_output_rows writes them
+    :param timestamps: list[datetime.datetime], ascending
+    :param job_to_output_rows_specs: list[JobToOutputRowsSpec]
+    :return: tuple[list[int], list[int]]
+    """
+    entry_indexes = []
+    spec_indexes = []
+    for segment_start, segment_end, segment_spec_indexes in spec_segments(
+        timestamps, job_to_output_rows_specs
+    ):
+        for i in range(segment_start, segment_end):
+            entry_indexes.extend([i] * len(segment_spec_indexes))
+            spec_indexes.extend(segment_spec_indexes)
+    return entry_indexes, spec_indexes
+
+
+class ParquetOutputWriter:
+    """
+    Writes output rows to a Parquet file, one row group per telemetry batch
+    Spec columns are dictionaries of every spec's value, built once, indexed per row
+    """
+
+    def __init__(
+        self,
+        file: Any,
+        job_to_output_rows_specs: list[JobToOutputRowsSpec],
+        telemetry_type: TelemetryMeasurementType,
+        telemetry_unit: TelemetryMeasurementUnit,
+    ):
+        """
+        :param file: binary file object, or path, to write to
+        :param job_to_output_rows_specs: list[JobToOutputRowsSpec]
+        :param telemetry_type: TelemetryMeasurementType
+        :param telemetry_unit: TelemetryMeasurementUnit
+        """
+        import pyarrow
+        import pyarrow.parquet
+
+        self.schema = get_output_schema()
+        self.job_to_output_rows_specs = job_to_output_rows_specs
+        self.spec_dictionaries = {
+            column: pyarrow.array(
+                [getattr(spec, column) for spec in job_to_output_rows_specs],
+                type=self.schema.field(column).type.value_type,
+            )
+            for column in spec_output_columns
+        }
+        self.telemetry_dictionaries = {
+            column: pyarrow.array(
+                [value], type=self.schema.field(column).type.value_type
+            )
+            for column, value in zip(
+                TELEMETRY_OUTPUT_COLUMNS,
+                [
+                    TelemetryMeasurementType(telemetry_type).value,
+                    TelemetryMeasurementUnit(telemetry_unit).value,
+                ],
+            )
+        }
+        self.writer = pyarrow.parquet.ParquetWriter(
+            file, self.schema, use_dictionary=True
+        )
+
+    def write_batch(self, columns: TelemetryColumns) -> int:
+        """
+        Writes a column-wise telemetry batch to output rows as one row group, returns
+        number of rows written
+        :param columns: TelemetryColumns
+        :return: int
+        """
+        import pyarrow
+
+        entry_indexes, spec_indexes = get_output_row_indexes(
+            columns.timestamps, self.job_to_output_rows_specs
+        )
+        if not entry_indexes:
+            return 0
+        take = pyarrow.array(entry_indexes, type=pyarrow.int64())
+        spec_indices = pyarrow.array(spec_indexes, type=pyarrow.int32())
+        telemetry_indices = pyarrow.repeat(
+            pyarrow.scalar(0, type=pyarrow.int32()), len(entry_indexes)
+        )
+        arrays = {
+            "timestamp": pyarrow.array(
+                columns.timestamps, type=pyarrow.timestamp("us")
+            ).take(take),
+            **{
+                column: pyarrow.DictionaryArray.from_arrays(
+                    spec_indices, dictionary
+                )
+                for column, dictionary in self.spec_dictionaries.items()
+            },
+            **{
+                column: pyarrow.DictionaryArray.from_arrays(
+                    telemetry_indices, dictionary
+                )
+                for column, dictionary in self.telemetry_dictionaries.items()
+            },
+            "telemetry_measurement_value": pyarrow.array(
+                columns.values, type=pyarrow.float64()
+            ).take(take),
+        }
+        self.writer.write_table(
+            pyarrow.Table.from_arrays(
+                [arrays[column] for column in output_columns],
+                schema=self.schema,
+            )
+        )
+        return len(entry_indexes)
+
+    def close(self) -> None:
+        """
+        Writes the Parquet footer, the file is not readable until closed
+        :return: None
+        """
+        self.writer.close()
+
+
+def write_parquet_output(
+    output_file: str,
+    telemetry_batches: Iterable[list[TelemetryEntryRecord] | TelemetryColumns],
+    job_to_output_rows_specs: list[JobToOutputRowsSpec],
+    telemetry_type_to_fetch: TelemetryMeasurementType,
+    telemetry_unit_to_fetch: TelemetryMeasurementUnit,
+) -> tuple[int, datetime.datetime | None]:
+    """
+    Writes output rows for all telemetry batches to a Parquet output_file, timed in
+    the telemetry_fetch and output_write stages of run_metrics as the CSV loop is
+    :param output_file: str
+    :param telemetry_batches: Iterable[list[TelemetryEntryRecord] | TelemetryColumns],
+    from resumable_telemetry_entries_batcher
+    :param job_to_output_rows_specs: list[JobToOutputRowsSpec]
+    :param telemetry_type_to_fetch: TelemetryMeasurementType
+    :param telemetry_unit_to_fetch: TelemetryMeasurementUnit
+    :return: tuple[int, datetime.datetime | None], rows written and the last
+    timestamp fetched
+    """
+    rows_written = 0
+    last_timestamp = None
+    with open(output_file, "wb") as file:
+        writer = ParquetOutputWriter(
+            file=file,
+            job_to_output_rows_specs=job_to_output_rows_specs,
+            telemetry_type=telemetry_type_to_fetch,
+            telemetry_unit=telemetry_unit_to_fetch,
+        )
+        file_offset = file.tell()
+        for batch in run_metrics.timed_iter(
+            telemetry_batches, "telemetry_fetch"
+        ):
+            with run_metrics.stage("output_write") as stage_metrics:
+                columns = batch_to_telemetry_columns(batch)
+                batch_rows_written = writer.write_batch(columns)
+                rows_written += batch_rows_written
+                last_timestamp = columns.timestamps[-1]
+                stage_metrics.counters["rows_written"] += batch_rows_written
+                stage_metrics.counters["bytes_written"] += (
+                    file.tell() - file_offset
+                )
+                file_offset = file.tell()
+            fetch_counters = run_metrics.stages["telemetry_fetch"].counters
+            fetch_counters["batches"] += 1
+            fetch_counters["rows_fetched"] += columns.num_rows
+        with run_metrics.stage("output_finalize") as stage_metrics:
+            writer.close()
+            stage_metrics.counters["bytes_written"] += (
+                file.tell() - file_offset
+            )
+    return rows_written, last_timestamp
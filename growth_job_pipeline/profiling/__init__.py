@@ -0,0 +1 @@
+from .profiling import profile_run
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import tracemalloc
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from growth_job_pipeline.config import get_settings
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+def get_profile_path(run_output_dir_path: str, run_id: UUID) -> str:
+    """
+    Returns the path of the cProfile stats file in run_output_dir
+    :param run_output_dir_path: str
+    :param run_id: UUID
+    :return: str
+    """
+    return os.path.join(run_output_dir_path, f"profile_{run_id}.pstats")
+
+
+def get_tracemalloc_report_path(run_output_dir_path: str, run_id: UUID) -> str:
+    """
+    Returns the path of the tracemalloc top allocations report in run_output_dir
+    :param run_output_dir_path: str
+    :param run_id: UUID
+    :return: str
+    """
+    return os.path.join(run_output_dir_path, f"tracemalloc_{run_id}.txt")
+
+
+def write_tracemalloc_report(report_path: str, top: int) -> None:
+    """
+    Writes peak traced memory and the top allocation sites by size still allocated
+    :param report_path: str
+    :param top: int, number of allocation sites to report
+    :return: None
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(
+                False, "<frozen importlib._bootstrap_external>"
+            ),
+        )
+    )
+    with open(report_path, "w") as file:
+        file.write(f"current_bytes={current} peak_bytes={peak}\n")
+        file.write(f"top {top} allocation sites by size:\n")
+        for statistic in snapshot.statistics("lineno")[:top]:
+            file.write(f"{statistic}\n")
+
+
+@contextmanager
+def profile_run(
+    run_output_dir_path: str, run_id: UUID
+) -> Generator[None, None, None]:
+    """
+    Profiles the block with cProfile and/or tracemalloc, as switched on in config
+    Writes profile_<run_id>.pstats and tracemalloc_<run_id>.txt to run_output_dir,
+    also if the block raises. Does nothing when both are switched off
+    :param run_output_dir_path: str
+    :param run_id: UUID
+    :return: Generator[None, None, None]
+    """
+    settings = get_settings()
+    use_cprofile = settings.profile_cprofile
+    use_tracemalloc = settings.profile_tracemalloc
+    if not use_cprofile and not use_tracemalloc:
+        yield
+        return
+
+    profiler = cProfile.Profile() if use_cprofile else None
+    # tracemalloc may already be tracing, e.g. python -X tracemalloc
+    started_tracemalloc = use_tracemalloc and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start(settings.profile_tracemalloc_frames)
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profile_path = get_profile_path(run_output_dir_path, run_id)
+            profiler.dump_stats(profile_path)
+            logger.info(f"Wrote cProfile stats to {profile_path}")
+        if use_tracemalloc:
+            report_path = get_tracemalloc_report_path(
+                run_output_dir_path, run_id
+            )
+            write_tracemalloc_report(
+                report_path,
+                top=settings.profile_tracemalloc_top,
+            )
+            if started_tracemalloc:
+                tracemalloc.stop()
+            logger.info(f"Wrote tracemalloc report to {report_path}")
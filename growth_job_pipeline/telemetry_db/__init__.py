@@ -1 +1,5 @@
-from .db import telemetry_entries_batcher
+from .db import (
+    telemetry_entries_batcher,
+    resumable_telemetry_entries_batcher,
+    TelemetryConnection,
+)
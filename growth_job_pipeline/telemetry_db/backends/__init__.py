@@ -0,0 +1,2 @@
+from .backends import get_telemetry_backend
+from .base import TelemetryBackend
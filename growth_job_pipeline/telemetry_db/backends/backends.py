@@ -0,0 +1,34 @@
+import logging
+
+from growth_job_pipeline.config import get_settings
+from growth_job_pipeline.telemetry_db.backends.base import TelemetryBackend
+from growth_job_pipeline.telemetry_db.backends.mssql import (
+    MssqlTelemetryBackend,
+)
+from growth_job_pipeline.telemetry_db.backends.sqlite import (
+    SqliteTelemetryBackend,
+)
+
+logger = logging.getLogger(__name__)
+
+telemetry_backends: dict[str, type[TelemetryBackend]] = {
+    "mssql": MssqlTelemetryBackend,
+    "sqlite": SqliteTelemetryBackend,
+}
+
+
+def get_telemetry_backend() -> TelemetryBackend:
+    """
+    Returns the telemetry backend set by TELEMETRY_DB_BACKEND in config
+    Raises ValueError for an unknown backend
+    :return: TelemetryBackend
+    """
+    backend_name = get_settings().telemetry_db_backend
+    if backend_name not in telemetry_backends:
+        msg = (
+            f"Unknown TELEMETRY_DB_BACKEND={backend_name}, options:"
+            f" {list(telemetry_backends)}"
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+    return telemetry_backends[backend_name]()
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import datetime
+from abc import ABC, abstractmethod
+from collections.abc import Generator
+from enum import Enum
+from typing import Any, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+        TelemetryMeasurementType,
+    )
+    from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+        TelemetryMeasurementUnit,
+    )
+
+
+class TelemetryBackend(ABC):
+    """
+    Represents a telemetry DB driver and SQL dialect
+    Cursors returned by connect are DB-API 2.0 cursors. Implementations provide the
+    table name, pagination clause and driver error, the queries are shared
+    Attributes:
+        table: str
+        select_columns: tuple[str, ...], columns projected by select_query
+    """
+
+    table: str
+    # type and unit are fixed by the query filter, so are not fetched
+    select_columns = ("timestamp", "value")
+
+    @property
+    @abstractmethod
+    def error(self) -> type[Exception]:
+        """
+        Returns the base exception class raised by the driver
+        :return: type[Exception]
+        """
+
+    @abstractmethod
+    def connect(self) -> Any:
+        """
+        Opens a connection to the telemetry DB and returns a cursor
+        :return: DB-API cursor
+        """
+
+    @abstractmethod
+    def offset_limit_clause(self) -> str:
+        """
+        Returns the dialect's clause paging an ordered query, params (offset, limit)
+        :return: str
+        """
+
+    def adapt_params(self, params: tuple) -> tuple:
+        """
+        Converts query params to types the driver binds, enums to their plain values
+        :param params: tuple
+        :return: tuple
+        """
+        return tuple(
+            param.value if isinstance(param, Enum) else param
+            for param in params
+        )
+
+    def execute(self, cursor: Any, query: str, params: tuple) -> Any:
+        """
+        Executes query with params adapted for the driver, returns the cursor
+        :param cursor: DB-API cursor
+        :param query: str
+        :param params: tuple
+        :return: DB-API cursor
+        """
+        return cursor.execute(query, self.adapt_params(params))
+
+    def timestamp_from_db(self, value: Any) -> datetime.datetime:
+        """
+        Converts a timestamp as returned by the driver to datetime, by default unchanged
+        :param value: timestamp column value
+        :return: datetime.datetime
+        """
+        return value
+
+    def count_query(self, from_exclusive: bool = False) -> str:
+        """
+        Returns the row count query
+        :param from_exclusive: bool, exclude rows at from_timestamp
+        :return: str
+        """
+        lower_bound_operator = ">" if from_exclusive else ">="
+        return f"""
+        SELECT COUNT(*)
+        FROM {self.table}
+        WHERE timestamp {lower_bound_operator} ? AND timestamp <= ? AND type = ? AND unit = ?
+    """
+
+    def select_query(self, from_exclusive: bool = False, paged=True) -> str:
+        """
+        Returns the ordered telemetry entries query, paged by offset and limit if paged
+        :param from_exclusive: bool, exclude rows at from_timestamp
+        :param paged: bool
+        :return: str
+        """
+        lower_bound_operator = ">" if from_exclusive else ">="
+        page_clause = self.offset_limit_clause() if paged else ""
+        return f"""
+            SELECT {", ".join(self.select_columns)}
+            FROM {self.table}
+            WHERE timestamp {lower_bound_operator} ? AND timestamp <= ? AND type = ? AND unit = ?
+            ORDER BY timestamp ASC
+            {page_clause};
+        """
+
+    def count(
+        self,
+        cursor: Any,
+        from_timestamp: datetime.datetime,
+        to_timestamp: datetime.datetime,
+        type_to_fetch: TelemetryMeasurementType,
+        unit_to_fetch: TelemetryMeasurementUnit,
+        from_exclusive: bool = False,
+    ) -> int:
+        """
+        Returns the number of telemetry entries in range for type and unit
+        :param cursor: DB-API cursor
+        :param from_timestamp: datetime.datetime
+        :param to_timestamp: datetime.datetime
+        :param type_to_fetch: TelemetryMeasurementType
+        :param unit_to_fetch: TelemetryMeasurementUnit
+        :param from_exclusive: bool
+        :return: int
+        """
+        return self.execute(
+            cursor,
+            self.count_query(from_exclusive=from_exclusive),
+            (from_timestamp, to_timestamp, type_to_fetch, unit_to_fetch),
+        ).fetchone()[0]
+
+    def fetch_batch(
+        self,
+        cursor: Any,
+        from_timestamp: datetime.datetime,
+        to_timestamp: datetime.datetime,
+        type_to_fetch: TelemetryMeasurementType,
+        unit_to_fetch: TelemetryMeasurementUnit,
+        offset: int,
+        limit: int,
+        from_exclusive: bool = False,
+    ) -> list[Iterable]:
+        """
+        Returns one batch of rows of the ordered range, skipping offset rows
+        :param cursor: DB-API cursor
+        :param from_timestamp: datetime.datetime
+        :param to_timestamp: datetime.datetime
+        :param type_to_fetch: TelemetryMeasurementType
+        :param unit_to_fetch: TelemetryMeasurementUnit
+        :param offset: int
+        :param limit: int
+        :param from_exclusive: bool
+        :return: list[Iterable]
+        """
+        return self.execute(
+            cursor,
+            self.select_query(from_exclusive=from_exclusive),
+            (
+                from_timestamp,
+                to_timestamp,
+                type_to_fetch,
+                unit_to_fetch,
+                offset,
+                limit,
+            ),
+        ).fetchall()
+
+    def stream(
+        self,
+        cursor: Any,
+        from_timestamp: datetime.datetime,
+        to_timestamp: datetime.datetime,
+        type_to_fetch: TelemetryMeasurementType,
+        unit_to_fetch: TelemetryMeasurementUnit,
+        batch_size: int,
+        from_exclusive: bool = False,
+    ) -> Generator[list[Iterable], None, None]:
+        """
+        Yields batches of rows of the ordered range from a single open query
+        :param cursor: DB-API cursor
+        :param from_timestamp: datetime.datetime
+        :param to_timestamp: datetime.datetime
+        :param type_to_fetch: TelemetryMeasurementType
+        :param unit_to_fetch: TelemetryMeasurementUnit
+        :param batch_size: int
+        :param from_exclusive: bool
+        :return: Generator[list[Iterable], None, None]
+        """
+        self.execute(
+            cursor,
+            self.select_query(from_exclusive=from_exclusive, paged=False),
+            (from_timestamp, to_timestamp, type_to_fetch, unit_to_fetch),
+        )
+        while rows := cursor.fetchmany(batch_size):
+            yield rows
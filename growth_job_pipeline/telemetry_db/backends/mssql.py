@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import datetime
+from typing import Any, TYPE_CHECKING
+
+from growth_job_pipeline.config import get_settings
+from growth_job_pipeline.telemetry_db.backends.base import TelemetryBackend
+
+if TYPE_CHECKING:
+    import pyodbc
+
+
+class MssqlTelemetryBackend(TelemetryBackend):
+    """
+    Represents the production telemetry DB, MS-SQL Server over pyodbc
+    pyodbc is imported on first use, so other backends work without unixODBC installed
+    """
+
+    table = "dbo.telemetry"
+    # type and unit are varchar columns: binding pyodbc's default nvarchar for str
+    # params forces an implicit conversion of the column, ruling out an index seek
+    # on (type, unit, timestamp)
+    varchar_param_size = 50
+
+    @property
+    def error(self) -> type[pyodbc.Error]:
+        import pyodbc
+
+        return pyodbc.Error
+
+    def connection_string(self) -> str:
+        """
+        Returns the ODBC connection string built from config
+        :return: str
+        """
+        # sudo apt install unixodbc
+        # curl https://packages.microsoft.com/keys/microsoft.asc | sudo tee /etc/apt/trusted.gpg.d/microsoft.asc
+        # curl https://packages.microsoft.com/config/ubuntu/22.04/prod.list | sudo tee /etc/apt/sources.list.d/mssql-release.list
+        # sudo apt-get update
+        # sudo ACCEPT_EULA=Y apt-get install -y msodbcsql18
+        # TODO @dsm alpine setup at https://learn.microsoft.com/en-us/sql/connect/odbc/linux-mac/installing-the-microsoft-odbc-driver-for-sql-server
+        settings = get_settings()
+        return (
+            "DRIVER={ODBC Driver 18 for SQL Server};"
+            f"SERVER={settings.telemetry_db_host},{settings.telemetry_db_port};"
+            f"DATABASE={settings.telemetry_db_name};"
+            f"UID={settings.telemetry_db_username};"
+            f"PWD={settings.telemetry_db_password};"
+            "Encrypt=yes;"
+            "TrustServerCertificate=yes"
+        )
+
+    def connect(self) -> pyodbc.Cursor:
+        import pyodbc
+
+        return pyodbc.connect(self.connection_string()).cursor()
+
+    def offset_limit_clause(self) -> str:
+        return "OFFSET ? ROWS FETCH FIRST ? ROWS ONLY"
+
+    def input_sizes(self, params: tuple) -> list[tuple[int, int, int]]:
+        """
+        Returns explicit (sql_type, size, decimal_digits) bindings for query params
+        :param params: tuple
+        :return: list[tuple[int, int, int]]
+        """
+        import pyodbc
+
+        def input_size(param: Any) -> tuple[int, int, int]:
+            if isinstance(param, datetime.datetime):
+                # datetime2(7), as pyodbc binds datetimes by default
+                return pyodbc.SQL_TYPE_TIMESTAMP, 27, 7
+            if isinstance(param, int):
+                return pyodbc.SQL_BIGINT, 0, 0
+            return pyodbc.SQL_VARCHAR, self.varchar_param_size, 0
+
+        return [input_size(param) for param in params]
+
+    def execute(self, cursor: pyodbc.Cursor, query: str, params: tuple) -> Any:
+        params = self.adapt_params(params)
+        cursor.setinputsizes(self.input_sizes(params))
+        return cursor.execute(query, params)
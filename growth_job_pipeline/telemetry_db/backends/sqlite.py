@@ -0,0 +1,95 @@
+import datetime
+import sqlite3
+from enum import Enum
+from typing import Iterable
+
+from growth_job_pipeline.config import get_settings
+from growth_job_pipeline.telemetry_db.backends.base import TelemetryBackend
+
+
+class SqliteTelemetryBackend(TelemetryBackend):
+    """
+    Represents a local SQLite telemetry DB with the production table layout
+    For local runs and benchmarks without an MS-SQL Server instance
+    Timestamps are stored as ISO 8601 text, so compare and sort chronologically
+    Attributes:
+        path: str, DB file path or ":memory:"
+    """
+
+    table = "telemetry"
+
+    def __init__(self, path: str | None = None):
+        self.path = (
+            path
+            if path is not None
+            else get_settings().telemetry_db_sqlite_path
+        )
+
+    @property
+    def error(self) -> type[sqlite3.Error]:
+        return sqlite3.Error
+
+    def connect(self) -> sqlite3.Cursor:
+        return sqlite3.connect(self.path).cursor()
+
+    def offset_limit_clause(self) -> str:
+        # SQLite's LIMIT <offset>, <count> form keeps params in (offset, limit) order
+        return "LIMIT ?, ?"
+
+    def adapt_params(self, params: tuple) -> tuple:
+        return tuple(adapt_param(param) for param in params)
+
+    def timestamp_from_db(self, value: str) -> datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+
+
+def adapt_param(param):
+    """
+    Converts a query param to the text stored in the SQLite telemetry table
+    :param param: any
+    :return: any
+    """
+    if isinstance(param, datetime.datetime):
+        return param.isoformat()
+    if isinstance(param, Enum):
+        return param.value
+    return param
+
+
+def create_telemetry_table(connection: sqlite3.Connection) -> None:
+    """
+    Creates the telemetry table and its (type, unit, timestamp) index if missing
+    :param connection: sqlite3.Connection
+    :return: None
+    """
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS telemetry (
+            timestamp TEXT NOT NULL,
+            type TEXT NOT NULL,
+            value REAL NOT NULL,
+            unit TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS telemetry_type_unit_timestamp
+            ON telemetry (type, unit, timestamp);
+        """
+    )
+
+
+def insert_telemetry_rows(
+    connection: sqlite3.Connection, rows: Iterable[tuple]
+) -> None:
+    """
+    Inserts (timestamp, type, value, unit) rows into the telemetry table and commits
+    :param connection: sqlite3.Connection
+    :param rows: Iterable[tuple]
+    :return: None
+    """
+    connection.executemany(
+        """
+        INSERT INTO telemetry (timestamp, type, value, unit)
+        VALUES (?, ?, ?, ?)
+        """,
+        (tuple(adapt_param(param) for param in row) for row in rows),
+    )
+    connection.commit()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import datetime
+import logging
+from array import array
+from collections.abc import Generator
+from typing import Any, Iterable
+
+from growth_job_pipeline.logger import RATE_LIMITED
+from growth_job_pipeline.models.enums.telemetry_measurement_type import (
+    TelemetryMeasurementType,
+)
+from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
+    TelemetryMeasurementUnit,
+)
+from growth_job_pipeline.models.enums.telemetry_pagination import (
+    TelemetryPagination,
+)
+from growth_job_pipeline.models.records.telemetry_columns import (
+    TelemetryColumns,
+    validate_telemetry_columns,
+)
+from growth_job_pipeline.telemetry_db.backends import (
+    get_telemetry_backend,
+    TelemetryBackend,
+)
+from growth_job_pipeline.telemetry_db.backends.mssql import (
+    MssqlTelemetryBackend,
+)
+from growth_job_pipeline.telemetry_db.db import (
+    describe_columns,
+    fetch_row_batches,
+    get_row_count,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def is_arrow_odbc_available() -> bool:
+    """
+    Returns True if the optional arrow-odbc package (extra "arrow") is installed
+    :return: bool
+    """
+    try:
+        import arrow_odbc  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def rows_to_columns(
+    rows: list[Iterable],
+    column_names: list[str],
+    backend: TelemetryBackend,
+) -> tuple[list[datetime.datetime], array]:
+    """
+    Transposes DB-API rows into timestamp and value columns
+    :param rows: list[Iterable]
+    :param column_names: list[str]
+    :param backend: TelemetryBackend
+    :return: tuple[list[datetime.datetime], array]
+    """
+    timestamp_index = column_names.index("timestamp")
+    value_index = column_names.index("value")
+    timestamp_from_db = backend.timestamp_from_db
+    return (
+        [timestamp_from_db(row[timestamp_index]) for row in rows],
+        array("d", [row[value_index] for row in rows]),
+    )
+
+
+def row_column_batches(
+    cursor: Any, backend: TelemetryBackend, **fetch_kwargs
+) -> Generator[tuple[list[datetime.datetime], array], None, None]:
+    """
+    Yields timestamp and value columns transposed from batches of DB-API rows
+    The result set is described once, from the first batch
+    :param cursor: DB-API cursor
+    :param backend: TelemetryBackend
+    :param fetch_kwargs: passed to fetch_row_batches
+    :return: Generator[tuple[list[datetime.datetime], array], None, None]
+    """
+    column_names = None
+    for rows in fetch_row_batches(
+        cursor=cursor, backend=backend, **fetch_kwargs
+    ):
+        if column_names is None:
+            column_names = describe_columns(cursor, backend)
+        yield rows_to_columns(
+            rows=rows, column_names=column_names, backend=backend
+        )
+
+
+def arrow_column_batches(
+    backend: MssqlTelemetryBackend,
+    type_to_fetch: TelemetryMeasurementType,
+    unit_to_fetch: TelemetryMeasurementUnit,
+    from_timestamp: datetime.datetime,
+    to_timestamp: datetime.datetime,
+    batch_size: int,
+    from_exclusive: bool,
+) -> Generator[tuple[list[datetime.datetime], Any], None, None]:
+    """
+    Yields timestamp and value columns read by arrow-odbc straight into Arrow buffers
+    The query streams over its own ODBC connection; arrow-odbc errors are re-raised
+    as backend errors so callers handle them like any other telemetry DB error
+    :param backend: MssqlTelemetryBackend
+    :param type_to_fetch: TelemetryMeasurementType
+    :param unit_to_fetch: TelemetryMeasurementUnit
+    :param from_timestamp: datetime.datetime
+    :param to_timestamp: datetime.datetime
+    :param batch_size: int
+    :param from_exclusive: bool
+    :return: Generator[tuple[list[datetime.datetime], Any], None, None]
+    """
+    import arrow_odbc
+    import pyarrow
+
+    try:
+        reader = arrow_odbc.read_arrow_batches_from_odbc(
+            query=backend.select_query(
+                from_exclusive=from_exclusive, paged=False
+            ),
+            connection_string=backend.connection_string(),
+            batch_size=batch_size,
+            # arrow-odbc binds all parameters as VARCHAR
+            parameters=[
+                from_timestamp.isoformat(),
+                to_timestamp.isoformat(),
+                type_to_fetch.value,
+                unit_to_fetch.value,
+            ],
+        )
+        for record_batch in reader:
+            timestamps = record_batch.column("timestamp")
+            values = record_batch.column("value")
+            if timestamps.null_count or values.null_count:
+                raise ValueError("Null timestamp or value in telemetry DB")
+            yield (
+                timestamps.cast(pyarrow.timestamp("us")).to_pylist(),
+                values.cast(pyarrow.float64()).to_numpy(),
+            )
+    except arrow_odbc.Error as e:
+        raise backend.error(str(e)) from e
+
+
+def telemetry_columns_batcher(
+    cursor: Any,
+    type_to_fetch: TelemetryMeasurementType,
+    unit_to_fetch: TelemetryMeasurementUnit,
+    from_timestamp: datetime.datetime,
+    to_timestamp: datetime.datetime,
+    batch_size=1000,
+    from_exclusive: bool = False,
+    backend: TelemetryBackend | None = None,
+    pagination: TelemetryPagination = TelemetryPagination.offset,
+    use_arrow: bool = True,
+) -> Generator[TelemetryColumns, None, None]:
+    """
+    Yields batches of telemetry entries column-wise, skipping per-row entry models
+    Reads through arrow-odbc when installed and the backend is ODBC (streaming, so
+    pagination does not apply), otherwise transposes batches of DB-API rows
+    :param cursor: DB-API cursor
+    :param type_to_fetch: TelemetryMeasurementType
+    :param unit_to_fetch: TelemetryMeasurementUnit
+    :param from_timestamp: datetime.datetime
+    :param to_timestamp: datetime.datetime
+    :param batch_size: int
+    :param from_exclusive: bool
+    :param backend: TelemetryBackend | None, defaults to backend set in config
+    :param pagination: TelemetryPagination
+    :param use_arrow: bool
+    :return: Generator[TelemetryColumns, None, None]
+    """
+    backend = backend if backend is not None else get_telemetry_backend()
+    row_count = get_row_count(
+        cursor=cursor,
+        from_timestamp=from_timestamp,
+        to_timestamp=to_timestamp,
+        type_to_fetch=type_to_fetch,
+        unit_to_fetch=unit_to_fetch,
+        from_exclusive=from_exclusive,
+        backend=backend,
+    )
+    arrow = (
+        use_arrow
+        and isinstance(backend, MssqlTelemetryBackend)
+        and is_arrow_odbc_available()
+    )
+    logger.info(
+        f"{row_count} rows to fetch column-wise from"
+        f" timestamp={from_timestamp} to timestamp={to_timestamp} for"
+        f" type={type_to_fetch.value}, unit={unit_to_fetch.value},"
+        f" reader={'arrow-odbc' if arrow else pagination.value}"
+    )
+    if row_count == 0:
+        return
+
+    if arrow:
+        column_batches = arrow_column_batches(
+            backend=backend,
+            type_to_fetch=type_to_fetch,
+            unit_to_fetch=unit_to_fetch,
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+            batch_size=batch_size,
+            from_exclusive=from_exclusive,
+        )
+    else:
+        column_batches = row_column_batches(
+            cursor=cursor,
+            backend=backend,
+            pagination=pagination,
+            type_to_fetch=type_to_fetch,
+            unit_to_fetch=unit_to_fetch,
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+            batch_size=batch_size,
+            from_exclusive=from_exclusive,
+        )
+
+    num_batches_fetched = 0
+    try:
+        for timestamps, values in column_batches:
+            columns = validate_telemetry_columns(
+                TelemetryColumns(
+                    timestamps=timestamps,
+                    values=values,
+                    type=type_to_fetch,
+                    unit=unit_to_fetch,
+                ),
+                from_timestamp=from_timestamp,
+                to_timestamp=to_timestamp,
+            )
+            num_batches_fetched += 1
+            logger.debug(
+                "Batch number=%d, rows_in_batch=%d",
+                num_batches_fetched,
+                columns.num_rows,
+                extra=RATE_LIMITED,
+            )
+            yield columns
+    except backend.error as e:
+        logger.error(
+            f"Error: {e}. Could not fetch batch from telemetry DB. Batches"
+            f" fetched={num_batches_fetched}"
+        )
+        raise e
+    except (ValueError, TypeError) as e:
+        logger.error(
+            f"Error: {e}. Could not validate telemetry DB columns. Batches"
+            f" fetched={num_batches_fetched}"
+        )
+        raise e
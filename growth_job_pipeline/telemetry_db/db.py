@@ -1,84 +1,165 @@
+from __future__ import annotations
+
 import datetime
 import logging
 from collections.abc import Generator
-from typing import Iterable
+from typing import Any, Iterable
 
-import backoff
-import pyodbc
 from pydantic import ValidationError
 
-from growth_job_pipeline.config import config
+from growth_job_pipeline.logger import RATE_LIMITED
+from growth_job_pipeline.metrics import count_retry, run_metrics
 from growth_job_pipeline.models.enums.telemetry_measurement_type import (
     TelemetryMeasurementType,
 )
 from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
     TelemetryMeasurementUnit,
 )
-from growth_job_pipeline.models.validators.telemetry_entry import (
-    TelemetryEntry,
+from growth_job_pipeline.models.enums.telemetry_pagination import (
+    TelemetryPagination,
+)
+from growth_job_pipeline.models.records.telemetry_columns import (
+    TelemetryColumns,
+)
+from growth_job_pipeline.models.records.telemetry_entry import (
+    TelemetryEntryRecord,
+    validate_telemetry_rows,
+)
+from growth_job_pipeline.telemetry_db.backends import (
+    get_telemetry_backend,
+    TelemetryBackend,
 )
 
 logger = logging.getLogger(__name__)
 
 
-@backoff.on_exception(backoff.expo, pyodbc.Error, max_tries=3)
-def get_telemetry_db_cursor() -> pyodbc.Cursor:
+def get_telemetry_db_cursor(backend: TelemetryBackend | None = None) -> Any:
     """
-    Returns a cursor for the telemetry DB
-    :return: pyodbc.Cursor
+    Returns a cursor for the telemetry DB, retrying connection errors
+    :param backend: TelemetryBackend | None, defaults to backend set in config
+    :return: DB-API cursor
     """
-    # sudo apt install unixodbc
-    # curl https://packages.microsoft.com/keys/microsoft.asc | sudo tee /etc/apt/trusted.gpg.d/microsoft.asc
-    # curl https://packages.microsoft.com/config/ubuntu/22.04/prod.list | sudo tee /etc/apt/sources.list.d/mssql-release.list
-    # sudo apt-get update
-    # sudo ACCEPT_EULA=Y apt-get install -y msodbcsql18
-    # TODO @dsm alpine setup at https://learn.microsoft.com/en-us/sql/connect/odbc/linux-mac/installing-the-microsoft-odbc-driver-for-sql-server
-    connection_string = (
-        "DRIVER={ODBC Driver 18 for SQL Server};"
-        f"SERVER={config('TELEMETRY_DB_HOST')},{config('TELEMETRY_DB_PORT', cast=int)};"
-        f"DATABASE={config('TELEMETRY_DB_NAME')};"
-        f"UID={config('TELEMETRY_DB_USERNAME')};"
-        f"PWD={config('TELEMETRY_DB_PASSWORD')};"
-        "Encrypt=yes;"
-        "TrustServerCertificate=yes"
-    )
+    # imported on first connect, keeping it off the startup path
+    import backoff
+
+    backend = backend if backend is not None else get_telemetry_backend()
+    connect = backoff.on_exception(
+        backoff.expo, backend.error, max_tries=3, on_backoff=count_retry
+    )(backend.connect)
     try:
-        connection = pyodbc.connect(connection_string)
+        cursor = connect()
         logger.info("Connected to telemetry DB.")
-        return connection.cursor()
-    except pyodbc.Error as e:
+        return cursor
+    except backend.error as e:
         logger.error(f"Could not connect to telemetry DB. Error: {e}")
         raise e
 
 
+def close_telemetry_db_cursor(
+    cursor: Any, backend: TelemetryBackend | None = None
+) -> None:
+    """
+    Closes cursor and its connection, ignoring errors from an already broken connection
+    :param cursor: DB-API cursor
+    :param backend: TelemetryBackend | None, defaults to backend set in config
+    :return: None
+    """
+    backend = backend if backend is not None else get_telemetry_backend()
+    try:
+        cursor.connection.close()
+    except backend.error as e:
+        logger.debug(f"Error: {e} closing telemetry DB connection")
+
+
+class TelemetryConnection:
+    """
+    Represents a telemetry DB connection kept open across runs in one process
+    Connects on first use, and again after discard, e.g. following a DB error
+    Attributes:
+        backend: TelemetryBackend
+    """
+
+    def __init__(self, backend: TelemetryBackend | None = None) -> None:
+        self.backend = (
+            backend if backend is not None else get_telemetry_backend()
+        )
+        self._cursor = None
+
+    def cursor(self) -> Any:
+        """
+        Returns the open cursor, connecting if there is none
+        :return: DB-API cursor
+        """
+        if self._cursor is None:
+            self._cursor = get_telemetry_db_cursor(backend=self.backend)
+        return self._cursor
+
+    def discard(self) -> None:
+        """
+        Closes the cursor and its connection, the next cursor call reconnects
+        :return: None
+        """
+        if self._cursor is not None:
+            close_telemetry_db_cursor(self._cursor, backend=self.backend)
+            self._cursor = None
+
+    close = discard
+
+
 def get_row_count(
-    cursor: pyodbc.Cursor,
+    cursor: Any,
     from_timestamp: datetime.datetime,
     to_timestamp: datetime.datetime,
     type_to_fetch: TelemetryMeasurementType,
     unit_to_fetch: TelemetryMeasurementUnit,
+    from_exclusive: bool = False,
+    backend: TelemetryBackend | None = None,
 ) -> int:
-    query = """
-        SELECT COUNT(*)
-        FROM dbo.telemetry
-        WHERE timestamp >= ? AND timestamp <= ? AND type = ? AND unit = ?
-    """
+    # from_exclusive=True excludes rows at from_timestamp, used when resuming after it
+    backend = backend if backend is not None else get_telemetry_backend()
     try:
-        return cursor.execute(
-            query, (from_timestamp, to_timestamp, type_to_fetch, unit_to_fetch)
-        ).fetchone()[0]
-    except pyodbc.Error as e:
+        return backend.count(
+            cursor=cursor,
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+            type_to_fetch=type_to_fetch,
+            unit_to_fetch=unit_to_fetch,
+            from_exclusive=from_exclusive,
+        )
+    except backend.error as e:
         logger.error(
             f"Could not fetch row count from telemetry DB. Error: {e}"
         )
         raise e
 
 
+def describe_columns(cursor: Any, backend: TelemetryBackend) -> list[str]:
+    """
+    Returns the result set's column names, once rows have been fetched with cursor
+    Raises ValueError if they are not the columns the backend selects
+    :param cursor: DB-API cursor
+    :param backend: TelemetryBackend
+    :return: list[str]
+    """
+    column_names = [column_spec[0] for column_spec in cursor.description]
+    if tuple(column_names) != backend.select_columns:
+        logger.error(
+            f"Telemetry DB returned columns={column_names}, expected"
+            f" columns={list(backend.select_columns)}"
+        )
+        raise ValueError("Unexpected telemetry DB columns")
+    return column_names
+
+
 def get_validated_entries(
-    column_names: list[str], rows: list[Iterable], num_batches_fetched: int
-) -> list[TelemetryEntry]:
+    column_names: list[str],
+    rows: list[Iterable],
+    num_batches_fetched: int,
+    constant_fields: dict[str, Any] | None = None,
+) -> list[TelemetryEntryRecord]:
+    # constant_fields fills fields filtered on rather than fetched, i.e. type and unit
     try:
-        return [TelemetryEntry(**dict(zip(column_names, row))) for row in rows]
+        return validate_telemetry_rows(column_names, rows, constant_fields)
     except ValidationError as e:
         logger.error(
             f"Error: {e}. Could not validate telemetry DB rows. Batches"
@@ -87,64 +168,247 @@ def get_validated_entries(
         raise e
 
 
+def fetch_row_batches(
+    cursor: Any,
+    backend: TelemetryBackend,
+    pagination: TelemetryPagination,
+    type_to_fetch: TelemetryMeasurementType,
+    unit_to_fetch: TelemetryMeasurementUnit,
+    from_timestamp: datetime.datetime,
+    to_timestamp: datetime.datetime,
+    batch_size: int,
+    from_exclusive: bool,
+) -> Generator[list[Iterable], None, None]:
+    """
+    Yields batches of raw rows, ordered by timestamp, using the pagination strategy
+    keyset pagination assumes timestamps are unique for a type and unit
+    :param cursor: DB-API cursor
+    :param backend: TelemetryBackend
+    :param pagination: TelemetryPagination
+    :param type_to_fetch: TelemetryMeasurementType
+    :param unit_to_fetch: TelemetryMeasurementUnit
+    :param from_timestamp: datetime.datetime
+    :param to_timestamp: datetime.datetime
+    :param batch_size: int
+    :param from_exclusive: bool
+    :return: Generator[list[Iterable], None, None]
+    """
+    if pagination == TelemetryPagination.stream:
+        yield from backend.stream(
+            cursor=cursor,
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+            type_to_fetch=type_to_fetch,
+            unit_to_fetch=unit_to_fetch,
+            batch_size=batch_size,
+            from_exclusive=from_exclusive,
+        )
+        return
+
+    num_rows_fetched = 0
+    while True:
+        rows = backend.fetch_batch(
+            cursor=cursor,
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+            type_to_fetch=type_to_fetch,
+            unit_to_fetch=unit_to_fetch,
+            offset=(
+                num_rows_fetched
+                if pagination == TelemetryPagination.offset
+                else 0
+            ),
+            limit=batch_size,
+            from_exclusive=from_exclusive,
+        )
+        if not rows:
+            return
+        num_rows_fetched += len(rows)
+        yield rows
+        if pagination == TelemetryPagination.keyset:
+            # timestamp is the first column selected
+            from_timestamp = rows[-1][0]
+            from_exclusive = True
+
+
 def telemetry_entries_batcher(
-    cursor: pyodbc.Cursor,
+    cursor: Any,
     type_to_fetch: TelemetryMeasurementType,
     unit_to_fetch: TelemetryMeasurementUnit,
     from_timestamp: datetime.datetime,
     to_timestamp: datetime.datetime,
     batch_size=1000,
-) -> Generator[list[TelemetryEntry], None, None]:
+    from_exclusive: bool = False,
+    backend: TelemetryBackend | None = None,
+    pagination: TelemetryPagination = TelemetryPagination.offset,
+) -> Generator[list[TelemetryEntryRecord], None, None]:
+    backend = backend if backend is not None else get_telemetry_backend()
     row_count = get_row_count(
         cursor=cursor,
         from_timestamp=from_timestamp,
         to_timestamp=to_timestamp,
         type_to_fetch=type_to_fetch,
         unit_to_fetch=unit_to_fetch,
+        from_exclusive=from_exclusive,
+        backend=backend,
     )
     logger.info(
         f"{row_count} rows to fetch from timestamp={from_timestamp} to"
         f" timestamp={to_timestamp} for type={type_to_fetch.value},"
-        f" unit={unit_to_fetch.value}"
+        f" unit={unit_to_fetch.value}, pagination={pagination.value}"
     )
+    if row_count == 0:
+        return
 
+    row_batches = fetch_row_batches(
+        cursor=cursor,
+        backend=backend,
+        pagination=pagination,
+        type_to_fetch=type_to_fetch,
+        unit_to_fetch=unit_to_fetch,
+        from_timestamp=from_timestamp,
+        to_timestamp=to_timestamp,
+        batch_size=batch_size,
+        from_exclusive=from_exclusive,
+    )
+    constant_fields = {"type": type_to_fetch, "unit": unit_to_fetch}
+    column_names = None
     num_batches_fetched = 0
     while row_count > 0:
-        query = """
-            SELECT *
-            FROM dbo.telemetry
-            WHERE timestamp >= ? AND timestamp <= ? AND type = ? AND unit = ?
-            ORDER BY timestamp ASC
-            OFFSET ? ROWS FETCH FIRST ? ROWS ONLY;
-        """
         try:
-            rows = cursor.execute(
-                query,
-                (
-                    from_timestamp,
-                    to_timestamp,
-                    type_to_fetch,
-                    unit_to_fetch,
-                    num_batches_fetched * batch_size,
-                    batch_size,
-                ),
-            ).fetchall()
-            column_names = [
-                column_spec[0] for column_spec in cursor.description
-            ]
-        except pyodbc.Error as e:
+            rows = next(row_batches, [])
+        except backend.error as e:
             logger.error(
                 f"Error: {e}. Could not fetch batch from telemetry DB. Batches"
                 f" fetched={num_batches_fetched}"
             )
             raise e
 
+        if not rows:
+            # rows deleted since count was taken, nothing more to fetch
+            logger.warning(
+                f"Empty batch with {row_count} rows still expected. Batches"
+                f" fetched={num_batches_fetched}"
+            )
+            return
+
+        if column_names is None:
+            # same query shape for every batch, so described once
+            column_names = describe_columns(cursor, backend)
         entries = get_validated_entries(
-            column_names, rows, num_batches_fetched
+            column_names, rows, num_batches_fetched, constant_fields
         )
         num_batches_fetched += 1
         row_count -= len(entries)
         logger.debug(
-            f"Batch number={num_batches_fetched}, rows_in_batch={len(entries)}"
+            "Batch number=%d, rows_in_batch=%d",
+            num_batches_fetched,
+            len(entries),
+            extra=RATE_LIMITED,
         )
         yield entries
+
+
+def resumable_telemetry_entries_batcher(
+    type_to_fetch: TelemetryMeasurementType,
+    unit_to_fetch: TelemetryMeasurementUnit,
+    from_timestamp: datetime.datetime,
+    to_timestamp: datetime.datetime,
+    batch_size=1000,
+    resume_after_timestamp: datetime.datetime | None = None,
+    max_reconnects=5,
+    backend: TelemetryBackend | None = None,
+    pagination: TelemetryPagination = TelemetryPagination.offset,
+    columnar: bool = False,
+    use_arrow: bool = True,
+    connection: TelemetryConnection | None = None,
+) -> Generator[list[TelemetryEntryRecord] | TelemetryColumns, None, None]:
+    """
+    Yields batches of telemetry entries, reconnecting to the telemetry DB on errors
+    Each reconnect resumes from the last timestamp of the last batch consumed, so
+    batches already handed to the caller are never re-fetched. Relies on batches
+    being ordered by timestamp ascending
+    Batches are lists of TelemetryEntryRecord, or TelemetryColumns if columnar
+    :param type_to_fetch: TelemetryMeasurementType
+    :param unit_to_fetch: TelemetryMeasurementUnit
+    :param from_timestamp: datetime.datetime
+    :param to_timestamp: datetime.datetime
+    :param batch_size: int
+    :param resume_after_timestamp: datetime.datetime | None, e.g. from a checkpoint
+    :param max_reconnects: int
+    :param backend: TelemetryBackend | None, defaults to backend set in config
+    :param pagination: TelemetryPagination
+    :param columnar: bool, fetch column-wise with telemetry_columns_batcher
+    :param use_arrow: bool, read through arrow-odbc if columnar and installed
+    :param connection: TelemetryConnection | None, reused rather than connecting and
+    closing here, discarded if the batches are not all fetched
+    :return: Generator[list[TelemetryEntryRecord] | TelemetryColumns, None, None]
+    """
+    # imported here as columnar builds on this module
+    from growth_job_pipeline.telemetry_db.columnar import (
+        telemetry_columns_batcher,
+    )
+
+    if connection is not None:
+        backend = connection.backend
+    backend = backend if backend is not None else get_telemetry_backend()
+    last_timestamp = resume_after_timestamp
+    num_reconnects = 0
+    while True:
+        cursor = (
+            connection.cursor()
+            if connection is not None
+            else get_telemetry_db_cursor(backend=backend)
+        )
+        fetched_all = False
+        try:
+            batcher_kwargs = dict(
+                cursor=cursor,
+                type_to_fetch=type_to_fetch,
+                unit_to_fetch=unit_to_fetch,
+                from_timestamp=(
+                    from_timestamp
+                    if last_timestamp is None
+                    else last_timestamp
+                ),
+                to_timestamp=to_timestamp,
+                batch_size=batch_size,
+                from_exclusive=last_timestamp is not None,
+                backend=backend,
+                pagination=pagination,
+            )
+            batches = (
+                telemetry_columns_batcher(
+                    **batcher_kwargs, use_arrow=use_arrow
+                )
+                if columnar
+                else telemetry_entries_batcher(**batcher_kwargs)
+            )
+            for batch in batches:
+                yield batch
+                # caller has consumed the batch once control returns here
+                last_timestamp = (
+                    batch.timestamps[-1] if columnar else batch[-1].timestamp
+                )
+            fetched_all = True
+            return
+        except backend.error as e:
+            num_reconnects += 1
+            run_metrics.increment("retries")
+            if num_reconnects > max_reconnects:
+                logger.error(
+                    f"Error: {e}. Giving up after {max_reconnects} reconnects"
+                    " to telemetry DB"
+                )
+                raise e
+            logger.warning(
+                f"Error: {e}. Reconnecting to telemetry DB, attempt"
+                f" {num_reconnects} of {max_reconnects}, resuming after"
+                f" timestamp={last_timestamp}"
+            )
+        finally:
+            if connection is None:
+                close_telemetry_db_cursor(cursor, backend=backend)
+            elif not fetched_all:
+                # may be mid result set or broken, so not fit for the next run
+                connection.discard()
@@ -1,38 +1,63 @@
 import datetime
 import logging
 
-from growth_job_pipeline.config import config
+from growth_job_pipeline.config import get_settings
 from growth_job_pipeline.models.validators.coalesced_timestamps import (
     CoalescedTimestamps,
 )
 from growth_job_pipeline.models.validators.config_timestamps import (
     ConfigTimestamps,
 )
+from growth_job_pipeline.watermark import read_watermark
 
 logger = logging.getLogger(__name__)
 
 
+def get_incremental_timestamps(
+    output_dir_path: str, now: datetime.datetime
+) -> ConfigTimestamps:
+    """
+    Returns timestamps for the window since the last successful incremental run: from
+    the watermark in output_dir (FROM_TIMESTAMP set in config if none written, None
+    if auto) to now, capped at TO_TIMESTAMP set in config
+    :param output_dir_path: str
+    :param now: datetime.datetime
+    :return: ConfigTimestamps, incremental
+    """
+    settings = get_settings()
+    watermark = read_watermark(output_dir_path)
+    if watermark is not None:
+        from_timestamp = watermark.to_timestamp
+    elif settings.from_timestamp == "auto":
+        from_timestamp = None
+    else:
+        from_timestamp = settings.from_timestamp
+    return ConfigTimestamps(
+        from_timestamp=from_timestamp,
+        to_timestamp=(
+            min(now, settings.to_timestamp)
+            if settings.to_timestamp is not None
+            else now
+        ),
+        incremental=True,
+    )
+
+
 def get_config_timestamps() -> ConfigTimestamps:
     """
     Returns from_timestamp and to_timestamp (datetime.datetime or None) set in config
+    If FROM_TIMESTAMP is auto, returns the window since the last successful run, see
+    get_incremental_timestamps
     :return: ConfigTimestamps
     """
-    from_timestamp = config(
-        "FROM_TIMESTAMP",
-        default=None,
-        cast=lambda x: None
-        if x is None
-        else datetime.datetime.fromisoformat(x),
-    )
-    to_timestamp = config(
-        "TO_TIMESTAMP",
-        default=None,
-        cast=lambda x: None
-        if x is None
-        else datetime.datetime.fromisoformat(x),
-    )
+    settings = get_settings()
+    if settings.from_timestamp == "auto":
+        return get_incremental_timestamps(
+            settings.output_dir, now=datetime.datetime.now()
+        )
     return ConfigTimestamps(
-        from_timestamp=from_timestamp, to_timestamp=to_timestamp
+        from_timestamp=settings.from_timestamp,
+        to_timestamp=settings.to_timestamp,
     )
 
 
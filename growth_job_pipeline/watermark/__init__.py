@@ -0,0 +1 @@
+from .watermark import read_watermark, write_watermark
@@ -0,0 +1,56 @@
+import logging
+import os
+
+from pydantic import ValidationError
+
+from growth_job_pipeline.models.validators.watermark import Watermark
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_FILE_NAME = "watermark.json"
+
+
+def get_watermark_path(output_dir_path: str) -> str:
+    """
+    Returns the path of the watermark file in output_dir
+    :param output_dir_path: str
+    :return: str
+    """
+    return os.path.join(output_dir_path, WATERMARK_FILE_NAME)
+
+
+def write_watermark(output_dir_path: str, watermark: Watermark) -> None:
+    """
+    Atomically writes watermark file in output_dir
+    Written to a temp file then renamed, so a crash never leaves a partial watermark
+    :param output_dir_path: str
+    :param watermark: Watermark
+    :return: None
+    """
+    watermark_path = get_watermark_path(output_dir_path)
+    tmp_path = f"{watermark_path}.tmp"
+    with open(tmp_path, "w") as file:
+        file.write(watermark.model_dump_json(indent=4))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, watermark_path)
+
+
+def read_watermark(output_dir_path: str) -> Watermark | None:
+    """
+    Reads watermark file from output_dir, returns None if no watermark written
+    :param output_dir_path: str
+    :return: Watermark | None
+    """
+    watermark_path = get_watermark_path(output_dir_path)
+    if not os.path.exists(watermark_path):
+        return None
+    try:
+        with open(watermark_path, "r") as file:
+            return Watermark.model_validate_json(file.read())
+    except IOError as e:
+        logger.error(f"Cannot read watermark file={watermark_path}")
+        raise e
+    except ValidationError as e:
+        logger.error(f"Error {e}. Cannot validate watermark.")
+        raise e
@@ -1,9 +1,10 @@
 import datetime
 import logging
+import os
 
 from pydantic import ValidationError
 
-from growth_job_pipeline.config import config
+from growth_job_pipeline.config import get_settings
 from growth_job_pipeline.models.validators.yield_result import YieldResult
 from growth_job_pipeline.utils import (
     split_line_on_whitespace,
@@ -13,6 +14,46 @@ from growth_job_pipeline.utils import (
 logger = logging.getLogger(__name__)
 
 
+def validate_yield_results(
+    column_names: list[str], lines: list[list[str]]
+) -> list[YieldResult]:
+    """
+    Validates lines split from the yield results file to YieldResult objects
+    :param column_names: list[str], from the file's header line
+    :param lines: list[list[str]]
+    :return: list[YieldResult]
+    """
+    try:
+        return [YieldResult(**dict(zip(column_names, line))) for line in lines]
+    except ValidationError as e:
+        logger.error(f"Error {e}. Cannot validate yield results.")
+        raise e
+
+
+def filter_sort_yield_results(
+    results: list[YieldResult],
+    from_timestamp: datetime.datetime,
+    to_timestamp: datetime.datetime,
+) -> list[YieldResult]:
+    """
+    Returns yield results in the from_timestamp -> to_timestamp range, ascending date
+    Assumes that yield results logged at latest possible datetime for a given date
+    :param results: list[YieldResult]
+    :param from_timestamp: datetime.datetime
+    :param to_timestamp: datetime.datetime
+    :return: list[YieldResult]
+    """
+    filtered_results = [
+        result
+        for result in results
+        if from_timestamp
+        <= latest_datetime_possible_for_date(result.date)
+        < to_timestamp
+    ]
+
+    return sorted(filtered_results, key=lambda result: result.date)
+
+
 def get_ascending_yield_results(
     from_timestamp: datetime.datetime, to_timestamp: datetime.datetime
 ) -> list[YieldResult]:
@@ -24,30 +65,115 @@ def get_ascending_yield_results(
     :param to_timestamp: datetime.datetime
     :return: list[YieldResult]
     """
+    yield_results_file = get_settings().yield_results_file
     try:
-        with open(config("YIELD_RESULTS_FILE"), "r") as file:
+        with open(yield_results_file, "r") as file:
             column_names = split_line_on_whitespace(file.readline())
             lines = [split_line_on_whitespace(line) for line in file]
-
-        results = [
-            YieldResult(**dict(zip(column_names, line))) for line in lines
-        ]
     except IOError as e:
         logger.error(
-            "Cannot read from yield results"
-            f" file={config('YIELD_RESULTS_FILE')}"
+            f"Cannot read from yield results file={yield_results_file}"
         )
         raise e
-    except ValidationError as e:
-        logger.error(f"Error {e}. Cannot validate yield results.")
-        raise e
 
-    filtered_results = [
-        result
-        for result in results
-        if from_timestamp
-        <= latest_datetime_possible_for_date(result.date)
-        < to_timestamp
-    ]
+    return filter_sort_yield_results(
+        validate_yield_results(column_names, lines),
+        from_timestamp=from_timestamp,
+        to_timestamp=to_timestamp,
+    )
 
-    return sorted(filtered_results, key=lambda result: result.date)
+
+class YieldResultsFileCache:
+    """
+    Represents the yield results file parsed so far, for repeated reads in one process
+    Relies on the file being appended to, see README: each read parses only the
+    complete lines appended since the last. The file is parsed afresh if it is
+    replaced or shrinks
+    Attributes:
+        yield_results_file: str
+        num_results: int, yield results parsed and kept
+    """
+
+    def __init__(self, yield_results_file: str | None = None) -> None:
+        self.yield_results_file = (
+            yield_results_file
+            if yield_results_file is not None
+            else get_settings().yield_results_file
+        )
+        self._clear()
+
+    def _clear(self) -> None:
+        self._column_names: list[str] | None = None
+        self._results: list[YieldResult] = []
+        self._file_id: tuple[int, int] | None = None
+        self._offset = 0
+
+    @property
+    def num_results(self) -> int:
+        return len(self._results)
+
+    def _read_appended(self) -> list[YieldResult]:
+        """
+        Parses lines appended since the last read, keeping complete lines
+        Returns yield results from a trailing line not yet newline terminated, parsed
+        again on the next read
+        :return: list[YieldResult]
+        """
+        with open(self.yield_results_file, "rb") as file:
+            stat = os.fstat(file.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            if file_id != self._file_id or stat.st_size < self._offset:
+                if self._file_id is not None:
+                    logger.info(
+                        "Yield results file="
+                        f"{self.yield_results_file} replaced or truncated,"
+                        " reading all"
+                    )
+                self._clear()
+                self._file_id = file_id
+            file.seek(self._offset)
+            data = file.read()
+
+        complete, newline, partial = data.rpartition(b"\n")
+        lines = complete.decode().splitlines()
+        if self._column_names is None and lines:
+            self._column_names = split_line_on_whitespace(lines.pop(0))
+        self._results += validate_yield_results(
+            self._column_names,
+            [split_line_on_whitespace(line) for line in lines if line.strip()],
+        )
+        self._offset += len(complete) + len(newline)
+
+        if not partial.strip():
+            return []
+        if self._column_names is None:
+            # header not yet complete, nothing to parse
+            return []
+        return validate_yield_results(
+            self._column_names, [split_line_on_whitespace(partial.decode())]
+        )
+
+    def get_ascending_yield_results(
+        self,
+        from_timestamp: datetime.datetime,
+        to_timestamp: datetime.datetime,
+    ) -> list[YieldResult]:
+        """
+        Returns yield results from the file as get_ascending_yield_results does
+        :param from_timestamp: datetime.datetime
+        :param to_timestamp: datetime.datetime
+        :return: list[YieldResult]
+        """
+        try:
+            partial_results = self._read_appended()
+        except IOError as e:
+            logger.error(
+                "Cannot read from yield results"
+                f" file={self.yield_results_file}"
+            )
+            raise e
+        return filter_sort_yield_results(
+            self._results + partial_results,
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+        )
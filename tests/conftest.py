@@ -1,8 +1,11 @@
 import datetime
 import json
+from array import array
+from uuid import UUID
 
 import pytest
 
+from growth_job_pipeline.config import get_settings
 from growth_job_pipeline.models.enums.crop import Crop
 from growth_job_pipeline.models.enums.telemetry_measurement_type import (
     TelemetryMeasurementType,
@@ -11,13 +14,21 @@ from growth_job_pipeline.models.enums.telemetry_measurement_unit import (
     TelemetryMeasurementUnit,
 )
 from growth_job_pipeline.models.enums.weight_unit import WeightUnit
+from growth_job_pipeline.models.records.telemetry_columns import (
+    TelemetryColumns,
+)
+from growth_job_pipeline.models.validators.extraction_checkpoint import (
+    ExtractionCheckpoint,
+)
 from growth_job_pipeline.models.validators.growth_job import GrowthJob
 from growth_job_pipeline.models.validators.job_to_output_rows_spec import (
     JobToOutputRowsSpec,
 )
+from growth_job_pipeline.models.validators.settings import Settings
 from growth_job_pipeline.models.validators.telemetry_entry import (
     TelemetryEntry,
 )
+from growth_job_pipeline.models.validators.watermark import Watermark
 from growth_job_pipeline.models.validators.yield_result import YieldResult
 
 
@@ -592,6 +603,51 @@ def job_to_output_rows_spec2(
     )
 
 
+@pytest.fixture()
+def job_to_output_rows_spec__overlapping(
+    valid_yield_weight, valid_weight_unit
+) -> JobToOutputRowsSpec:
+    """
+    Returns a spec for another crop overlapping both job1 and job2
+    :param valid_yield_weight:
+    :param valid_weight_unit:
+    :return: JobToOutputRowsSpec
+    """
+    return JobToOutputRowsSpec(
+        crop="potato",
+        growth_job_id=3,
+        growth_job_start_date=datetime.datetime(2022, 1, 8, 0, 0),
+        growth_job_end_date=datetime.datetime(2022, 1, 12, 6, 0),
+        yield_recorded_date=datetime.date(2022, 1, 13),
+        yield_weight=valid_yield_weight,
+        yield_unit=valid_weight_unit,
+    )
+
+
+@pytest.fixture()
+def telemetry_columns(
+    valid_measurement_type, valid_measurement_unit
+) -> TelemetryColumns:
+    """
+    Returns six-hourly telemetry columns from before job1 to after job2, hitting
+    job start and end dates exactly, with one sub-second timestamp
+    :param valid_measurement_type:
+    :param valid_measurement_unit:
+    :return: TelemetryColumns
+    """
+    timestamps = [
+        datetime.datetime(2022, 1, 4) + datetime.timedelta(hours=6 * i)
+        for i in range(50)
+    ]
+    timestamps[20] += datetime.timedelta(microseconds=500000)
+    return TelemetryColumns(
+        timestamps=timestamps,
+        values=array("d", [18.0 + i / 7 for i in range(50)]),
+        type=valid_measurement_type,
+        unit=valid_measurement_unit,
+    )
+
+
 @pytest.fixture()
 def json_str_valid(
     valid_crop,
@@ -620,3 +676,72 @@ def json_str_valid(
             },
         ]
     )
+
+
+@pytest.fixture()
+def valid_run_id() -> UUID:
+    """
+    Returns a valid run id
+    :return: UUID
+    """
+    return UUID("3f2b1a4e-8d6c-4b7a-9e5f-0c1d2e3f4a5b")
+
+
+@pytest.fixture()
+def watermark(valid_run_id, valid_timestamp) -> Watermark:
+    """
+    Returns a watermark at valid_timestamp
+    :return: Watermark
+    """
+    return Watermark(
+        to_timestamp=valid_timestamp,
+        run_id=valid_run_id,
+        updated_at=valid_timestamp,
+    )
+
+
+@pytest.fixture()
+def extraction_checkpoint(
+    valid_run_id,
+    valid_measurement_type,
+    valid_measurement_unit,
+    valid_timestamp,
+    valid_timestamp__later,
+    valid_to_timestamp,
+) -> ExtractionCheckpoint:
+    """
+    Returns a valid extraction checkpoint, part way through extraction
+    :param valid_run_id:
+    :param valid_measurement_type:
+    :param valid_measurement_unit:
+    :param valid_timestamp:
+    :param valid_timestamp__later:
+    :param valid_to_timestamp:
+    :return: ExtractionCheckpoint
+    """
+    return ExtractionCheckpoint(
+        run_id=valid_run_id,
+        telemetry_measurement_type=valid_measurement_type,
+        telemetry_measurement_unit=valid_measurement_unit,
+        from_timestamp=valid_timestamp,
+        to_timestamp=valid_to_timestamp,
+        last_timestamp=valid_timestamp__later,
+        file_offset=1024,
+        rows_written=2,
+    )
+
+
+@pytest.fixture()
+def override_settings(mocker):
+    """
+    Returns a function replacing settings values for the test, validated as on load
+    :param mocker:
+    :return: Callable
+    """
+
+    def set_settings(**values) -> Settings:
+        settings = Settings(**{**get_settings().model_dump(), **values})
+        mocker.patch("growth_job_pipeline.config.settings._settings", settings)
+        return settings
+
+    return set_settings
@@ -0,0 +1,175 @@
+import csv
+import datetime
+import io
+import sqlite3
+
+import pytest
+
+from growth_job_pipeline.backfill import (
+    run_backfill_extraction,
+    split_backfill_windows,
+)
+from growth_job_pipeline.main import write_telemetry_batch
+from growth_job_pipeline.metrics import run_metrics
+from growth_job_pipeline.models.records.job_to_output_rows_spec import (
+    JobToOutputRowsSpecRecord,
+)
+from growth_job_pipeline.models.validators.output_row import output_columns
+from growth_job_pipeline.telemetry_db import (
+    resumable_telemetry_entries_batcher,
+)
+from growth_job_pipeline.telemetry_db.backends.sqlite import (
+    create_telemetry_table,
+    insert_telemetry_rows,
+    SqliteTelemetryBackend,
+)
+
+
+@pytest.fixture()
+def job_to_output_rows_spec__overlapping(job_to_output_rows_spec, valid_crop2):
+    """
+    Returns a spec for a job of another crop overlapping both job1 and job2
+    :return: JobToOutputRowsSpec
+    """
+    return job_to_output_rows_spec.model_copy(
+        update={
+            "crop": valid_crop2,
+            "growth_job_id": 3,
+            "growth_job_start_date": datetime.datetime(2022, 1, 9),
+            "growth_job_end_date": datetime.datetime(2022, 1, 12),
+        }
+    )
+
+
+def test_split_backfill_windows(
+    job_to_output_rows_spec, job_to_output_rows_spec2
+) -> None:
+    """
+    Tests jobs apart in time go in windows of their own, up to num_windows, keeping
+    matched order within a window
+    :return: None
+    """
+    specs = [job_to_output_rows_spec2, job_to_output_rows_spec]
+    windows = split_backfill_windows(specs, num_windows=4)
+    assert [
+        (window.index, window.from_timestamp, window.to_timestamp)
+        for window in windows
+    ] == [
+        (
+            0,
+            job_to_output_rows_spec.growth_job_start_date,
+            job_to_output_rows_spec.growth_job_end_date,
+        ),
+        (
+            1,
+            job_to_output_rows_spec2.growth_job_start_date,
+            job_to_output_rows_spec2.growth_job_end_date,
+        ),
+    ]
+    assert windows[0].specs == [
+        JobToOutputRowsSpecRecord.from_spec(job_to_output_rows_spec)
+    ]
+    (window,) = split_backfill_windows(specs, num_windows=1)
+    assert window.specs == [
+        JobToOutputRowsSpecRecord.from_spec(spec) for spec in specs
+    ]
+
+
+def test_split_backfill_windows__overlapping_jobs_not_split(
+    job_to_output_rows_spec,
+    job_to_output_rows_spec2,
+    job_to_output_rows_spec__overlapping,
+) -> None:
+    """
+    Tests jobs overlapping in time are kept in one window
+    :return: None
+    """
+    (window,) = split_backfill_windows(
+        [
+            job_to_output_rows_spec,
+            job_to_output_rows_spec__overlapping,
+            job_to_output_rows_spec2,
+        ],
+        num_windows=4,
+    )
+    assert (
+        window.from_timestamp == job_to_output_rows_spec.growth_job_start_date
+    )
+    assert window.to_timestamp == job_to_output_rows_spec2.growth_job_end_date
+    assert len(window.specs) == 3
+
+
+def test_run_backfill_extraction__matches_single_extraction(
+    tmp_path,
+    override_settings,
+    job_to_output_rows_spec,
+    job_to_output_rows_spec2,
+    valid_run_id,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests rows extracted by workers and merged are those one extraction writes
+    :return: None
+    """
+    sqlite_path = str(tmp_path / "telemetry.db")
+    connection = sqlite3.connect(sqlite_path)
+    create_telemetry_table(connection)
+    insert_telemetry_rows(
+        connection,
+        [
+            (
+                datetime.datetime(2022, 1, 4)
+                + datetime.timedelta(hours=3 * i),
+                valid_measurement_type,
+                20.0 + i % 5,
+                valid_measurement_unit,
+            )
+            for i in range(100)
+        ],
+    )
+    connection.close()
+    override_settings(
+        telemetry_db_backend="sqlite",
+        telemetry_db_sqlite_path=sqlite_path,
+        telemetry_db_batch_size=7,
+        backfill_workers=2,
+    )
+    specs = [job_to_output_rows_spec2, job_to_output_rows_spec]
+
+    expected = io.StringIO()
+    writer = csv.writer(expected)
+    writer.writerow(output_columns)
+    for batch in resumable_telemetry_entries_batcher(
+        type_to_fetch=valid_measurement_type,
+        unit_to_fetch=valid_measurement_unit,
+        from_timestamp=job_to_output_rows_spec.growth_job_start_date,
+        to_timestamp=job_to_output_rows_spec2.growth_job_end_date,
+        batch_size=7,
+        backend=SqliteTelemetryBackend(path=sqlite_path),
+    ):
+        write_telemetry_batch(
+            writer=writer,
+            batch=batch,
+            job_to_output_rows_specs=[
+                JobToOutputRowsSpecRecord.from_spec(spec) for spec in specs
+            ],
+            columnar=False,
+        )
+
+    run_metrics.reset()
+    output_file = str(tmp_path / "data.csv")
+    backfill_windows = run_backfill_extraction(
+        run_id=valid_run_id,
+        run_output_dir_path=str(tmp_path),
+        output_file=output_file,
+        job_to_output_rows_specs=specs,
+        telemetry_type_to_fetch=valid_measurement_type,
+        telemetry_unit_to_fetch=valid_measurement_unit,
+    )
+    with open(output_file, newline="") as file:
+        assert file.read() == expected.getvalue()
+    assert [window["rows_written"] for window in backfill_windows] == [41, 33]
+    assert run_metrics.stages["output_write"].counters["rows_written"] == 74
+    assert not (tmp_path / "parts").exists()
+    run_metrics.reset()
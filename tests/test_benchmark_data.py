@@ -0,0 +1,75 @@
+import datetime
+import sqlite3
+
+from benchmarks.data import (
+    generate_yield_results_and_growth_jobs,
+    write_telemetry_db,
+    write_yield_results_tsv,
+)
+from benchmarks.stub_server import serve_growth_jobs
+from growth_job_pipeline.main import match_yield_results_growth_jobs_gen_specs
+from growth_job_pipeline.models.enums.crop import Crop
+from growth_job_pipeline.yield_tsv_reader import get_ascending_yield_results
+
+
+def test_generated_yield_results_match_growth_jobs(
+    tmp_path, override_settings
+) -> None:
+    """
+    Tests every generated yield result matches its own growth job through the stub API
+    :return: None
+    """
+    yield_results, growth_jobs = generate_yield_results_and_growth_jobs(
+        start_date=datetime.date(2022, 1, 1), days=60
+    )
+    assert {result["crop"] for result in yield_results} == {
+        crop.value for crop in Crop
+    }
+    yield_results_path = str(tmp_path / "yield_results.tsv")
+    write_yield_results_tsv(yield_results_path, yield_results)
+    with serve_growth_jobs(growth_jobs) as growth_jobs_api_url:
+        override_settings(
+            yield_results_file=yield_results_path,
+            growth_jobs_api_url=growth_jobs_api_url,
+        )
+        specs = match_yield_results_growth_jobs_gen_specs(
+            all_yield_results_ascending=get_ascending_yield_results(
+                from_timestamp=datetime.datetime.min,
+                to_timestamp=datetime.datetime.max,
+            ),
+            from_timestamp=datetime.datetime.min,
+            to_timestamp=datetime.datetime.max,
+        )
+    assert sorted(spec.growth_job_id for spec in specs) == [
+        job["id"] for job in growth_jobs
+    ]
+
+
+def test_write_telemetry_db__30_second_readings(
+    tmp_path, valid_measurement_type, valid_measurement_unit
+) -> None:
+    """
+    Tests the telemetry stand-in holds a reading every 30 seconds
+    :return: None
+    """
+    path = str(tmp_path / "telemetry.db")
+    assert (
+        write_telemetry_db(
+            path,
+            start_date=datetime.date(2022, 1, 1),
+            days=1,
+            type_to_generate=valid_measurement_type,
+            unit_to_generate=valid_measurement_unit,
+        )
+        == 2880
+    )
+    connection = sqlite3.connect(path)
+    first, second = connection.execute(
+        "SELECT timestamp FROM telemetry ORDER BY timestamp LIMIT 2"
+    ).fetchall()
+    connection.close()
+    assert datetime.datetime.fromisoformat(
+        second[0]
+    ) - datetime.datetime.fromisoformat(first[0]) == datetime.timedelta(
+        seconds=30
+    )
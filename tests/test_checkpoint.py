@@ -0,0 +1,67 @@
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from growth_job_pipeline.checkpoint import read_checkpoint, write_checkpoint
+from growth_job_pipeline.checkpoint.checkpoint import get_checkpoint_path
+from growth_job_pipeline.models.validators.extraction_checkpoint import (
+    ExtractionCheckpoint,
+)
+
+
+def test_write_read_checkpoint_round_trip(
+    tmp_path, extraction_checkpoint
+) -> None:
+    """
+    Tests that a written checkpoint reads back unchanged, with no temp file left
+    :param tmp_path:
+    :param extraction_checkpoint:
+    :return: None
+    """
+    write_checkpoint(str(tmp_path), extraction_checkpoint)
+    assert read_checkpoint(str(tmp_path)) == extraction_checkpoint
+    assert os.listdir(tmp_path) == ["checkpoint.json"]
+
+
+def test_read_checkpoint__missing_returns_none(tmp_path) -> None:
+    """
+    Tests that read_checkpoint returns None when no checkpoint written
+    :param tmp_path:
+    :return: None
+    """
+    assert read_checkpoint(str(tmp_path)) is None
+
+
+def test_read_checkpoint__invalid_raises_and_logs(
+    tmp_path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """
+    Tests that read_checkpoint raises and logs on an invalid checkpoint file
+    :param tmp_path:
+    :param caplog:
+    :return: None
+    """
+    with open(get_checkpoint_path(str(tmp_path)), "w") as file:
+        file.write('{"file_offset": -1}')
+    with pytest.raises(ValidationError):
+        read_checkpoint(str(tmp_path))
+    assert (
+        "ERROR" in caplog.text and "Cannot validate checkpoint" in caplog.text
+    )
+
+
+def test_checkpoint_last_timestamp_out_of_range_raises(
+    extraction_checkpoint, valid_timestamp__very_late
+) -> None:
+    """
+    Tests that a checkpoint with last_timestamp after to_timestamp raises
+    :param extraction_checkpoint:
+    :param valid_timestamp__very_late:
+    :return: None
+    """
+    with pytest.raises(ValidationError):
+        ExtractionCheckpoint(
+            **extraction_checkpoint.model_dump(exclude={"last_timestamp"}),
+            last_timestamp=valid_timestamp__very_late,
+        )
@@ -0,0 +1,149 @@
+import csv
+import datetime
+import io
+from array import array
+
+import pytest
+
+from growth_job_pipeline.main import telemetry_entry_to_output_rows
+from growth_job_pipeline.models.records.job_to_output_rows_spec import (
+    JobToOutputRowsSpecRecord,
+)
+from growth_job_pipeline.models.records.telemetry_columns import (
+    TelemetryColumns,
+)
+from growth_job_pipeline.models.records.telemetry_entry import (
+    TelemetryEntryRecord,
+)
+from growth_job_pipeline.models.validators.job_to_output_rows_spec import (
+    JobToOutputRowsSpec,
+)
+from growth_job_pipeline.models.validators.output_row import (
+    output_columns,
+    OutputRow,
+)
+from growth_job_pipeline.output_writers import (
+    telemetry_columns_to_output_rows,
+)
+
+
+def test_telemetry_columns_to_output_rows__matches_row_path(
+    telemetry_columns,
+    job_to_output_rows_spec,
+    job_to_output_rows_spec2,
+    job_to_output_rows_spec__overlapping,
+) -> None:
+    """
+    Tests the columnar writer path writes the same bytes as the per-entry path
+    :return: None
+    """
+    specs = [
+        JobToOutputRowsSpecRecord.from_spec(spec)
+        for spec in [
+            job_to_output_rows_spec2,
+            job_to_output_rows_spec,
+            job_to_output_rows_spec__overlapping,
+        ]
+    ]
+    row_path_file = io.StringIO()
+    writer = csv.writer(row_path_file)
+    row_path_rows = 0
+    for timestamp, value in zip(
+        telemetry_columns.timestamps, telemetry_columns.values
+    ):
+        row_path_rows += telemetry_entry_to_output_rows(
+            writer=writer,
+            telemetry_entry=TelemetryEntryRecord(
+                timestamp=timestamp,
+                type=telemetry_columns.type,
+                value=value,
+                unit=telemetry_columns.unit,
+            ),
+            job_to_output_rows_specs=specs,
+        )
+
+    columnar_path_file = io.StringIO()
+    columnar_path_rows = telemetry_columns_to_output_rows(
+        writer=csv.writer(columnar_path_file),
+        columns=telemetry_columns,
+        job_to_output_rows_specs=specs,
+    )
+
+    assert columnar_path_rows == row_path_rows > 0
+    assert columnar_path_file.getvalue() == row_path_file.getvalue()
+
+
+def test_telemetry_columns_to_output_rows__no_specs_in_range(
+    valid_measurement_type,
+    valid_measurement_unit,
+    valid_timestamp,
+    job_to_output_rows_spec,
+) -> None:
+    """
+    Tests nothing is written for a batch outside every spec
+    :return: None
+    """
+    file = io.StringIO()
+    assert (
+        telemetry_columns_to_output_rows(
+            writer=csv.writer(file),
+            columns=TelemetryColumns(
+                timestamps=[valid_timestamp],
+                values=array("d", [20.0]),
+                type=valid_measurement_type,
+                unit=valid_measurement_unit,
+            ),
+            job_to_output_rows_specs=[
+                JobToOutputRowsSpecRecord.from_spec(job_to_output_rows_spec)
+            ],
+        )
+        == 0
+    )
+    assert file.getvalue() == ""
+
+
+def test_telemetry_entry_to_output_rows__matches_output_row_json(
+    telemetry_entry, job_to_output_rows_spec
+) -> None:
+    """
+    Tests output row records are written as the OutputRow model serializes in JSON mode
+    :return: None
+    """
+    telemetry_entry = telemetry_entry.model_copy(
+        update={
+            "timestamp": job_to_output_rows_spec.growth_job_start_date
+            + datetime.timedelta(hours=1, microseconds=250000)
+        }
+    )
+    output_row = OutputRow(
+        timestamp=telemetry_entry.timestamp,
+        crop=job_to_output_rows_spec.crop,
+        growth_job_id=job_to_output_rows_spec.growth_job_id,
+        growth_job_start_date=job_to_output_rows_spec.growth_job_start_date,
+        growth_job_end_date=job_to_output_rows_spec.growth_job_end_date,
+        yield_recorded_date=job_to_output_rows_spec.yield_recorded_date,
+        yield_weight=job_to_output_rows_spec.yield_weight,
+        yield_unit=job_to_output_rows_spec.yield_unit,
+        telemetry_measurement_type=telemetry_entry.type,
+        telemetry_measurement_unit=telemetry_entry.unit,
+        telemetry_measurement_value=telemetry_entry.value,
+    )
+    model_file = io.StringIO()
+    csv.DictWriter(model_file, fieldnames=output_columns).writerow(
+        output_row.model_dump(mode="json")
+    )
+
+    record_file = io.StringIO()
+    assert (
+        telemetry_entry_to_output_rows(
+            writer=csv.writer(record_file),
+            telemetry_entry=TelemetryEntryRecord(
+                **telemetry_entry.model_dump()
+            ),
+            job_to_output_rows_specs=[
+                JobToOutputRowsSpecRecord.from_spec(job_to_output_rows_spec)
+            ],
+        )
+        == 1
+    )
+    assert record_file.getvalue() == model_file.getvalue()
@@ -0,0 +1,116 @@
+import datetime
+import threading
+
+import pytest
+
+from growth_job_pipeline.daemon import get_daemon_window, run_daemon
+from growth_job_pipeline.main import advance_watermark
+from growth_job_pipeline.models.validators.config_timestamps import (
+    ConfigTimestamps,
+)
+from growth_job_pipeline.watermark import read_watermark, write_watermark
+
+
+@pytest.fixture()
+def daemon_mocks(mocker, tmp_path, override_settings) -> dict:
+    """
+    Sets OUTPUT_DIR to tmp_path, replacing the run, logging and telemetry DB connection
+    :return: dict, of mocks by name
+    """
+    override_settings(
+        output_dir=str(tmp_path),
+        from_timestamp=None,
+        to_timestamp=None,
+        yield_results_file="yield_results.tsv",
+    )
+    return {
+        name: mocker.patch(f"growth_job_pipeline.daemon.daemon.{name}")
+        for name in ["execute_run", "setup_logger", "TelemetryConnection"]
+    }
+
+
+def test_get_daemon_window(
+    tmp_path,
+    override_settings,
+    watermark,
+    valid_timestamp,
+    valid_timestamp__later,
+    valid_to_timestamp,
+) -> None:
+    """
+    Tests the window runs from FROM_TIMESTAMP, or the watermark once written, to now,
+    capped at TO_TIMESTAMP, and is None once empty
+    :return: None
+    """
+    override_settings(from_timestamp=None, to_timestamp=None)
+    assert get_daemon_window(
+        str(tmp_path), now=valid_timestamp
+    ) == ConfigTimestamps(
+        from_timestamp=None, to_timestamp=valid_timestamp, incremental=True
+    )
+
+    write_watermark(str(tmp_path), watermark)
+    override_settings(from_timestamp=None, to_timestamp=valid_to_timestamp)
+    assert get_daemon_window(
+        str(tmp_path), now=valid_timestamp__later
+    ) == ConfigTimestamps(
+        from_timestamp=valid_timestamp,
+        to_timestamp=valid_timestamp__later,
+        incremental=True,
+    )
+    assert get_daemon_window(
+        str(tmp_path), now=valid_to_timestamp + datetime.timedelta(days=1)
+    ) == ConfigTimestamps(
+        from_timestamp=valid_timestamp,
+        to_timestamp=valid_to_timestamp,
+        incremental=True,
+    )
+    assert get_daemon_window(str(tmp_path), now=valid_timestamp) is None
+
+
+def test_run_daemon__retries_failed_window(
+    mocker, tmp_path, daemon_mocks, caplog
+) -> None:
+    """
+    Tests a failed run is logged and its window retried, the next window starting
+    from the watermark a successful run advanced, with run state shared between runs
+    :return: None
+    """
+    stop_event = threading.Event()
+    wait = mocker.patch.object(stop_event, "wait")
+
+    calls = []
+
+    def run(**kwargs) -> None:
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise RuntimeError("telemetry DB down")
+        advance_watermark(kwargs["config_timestamps"], run_id=kwargs["run_id"])
+
+    daemon_mocks["execute_run"].side_effect = run
+    assert run_daemon(max_runs=3, stop_event=stop_event) == 1
+    assert wait.call_count == 2
+    assert "ERROR" in caplog.text and "telemetry DB down" in caplog.text
+
+    windows = [call["config_timestamps"] for call in calls]
+    assert all(window.incremental for window in windows)
+    assert windows[0].from_timestamp is None
+    assert windows[1].from_timestamp is None
+    assert windows[2].from_timestamp == windows[1].to_timestamp
+    for kwarg in ["yield_results_cache", "telemetry_connection"]:
+        assert calls[0][kwarg] is calls[2][kwarg]
+    watermark = read_watermark(str(tmp_path))
+    assert watermark.run_id == calls[2]["run_id"]
+    assert watermark.to_timestamp == windows[2].to_timestamp
+    daemon_mocks["TelemetryConnection"].return_value.close.assert_called_once()
+
+
+def test_run_daemon__stops_on_event(mocker, daemon_mocks) -> None:
+    """
+    Tests the daemon stops after the current run once the stop event is set
+    :return: None
+    """
+    stop_event = threading.Event()
+    daemon_mocks["execute_run"].side_effect = lambda **kwargs: stop_event.set()
+    assert run_daemon(stop_event=stop_event) == 0
+    assert daemon_mocks["execute_run"].call_count == 1
@@ -0,0 +1,162 @@
+import csv
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from growth_job_pipeline.dataset import publish_to_dataset, read_manifest
+from growth_job_pipeline.dataset.dataset import (
+    get_dataset_dir_path,
+    MANIFEST_FILE_NAME,
+)
+from growth_job_pipeline.models.validators.output_row import output_columns
+
+
+def write_output_file(path: str, rows: list[tuple[str, str, int]]) -> None:
+    """
+    Writes an output file with a row per (timestamp, crop, growth_job_id)
+    :param path: str
+    :param rows: list[tuple[str, str, int]]
+    :return: None
+    """
+    with open(path, "w") as file:
+        writer = csv.writer(file)
+        writer.writerow(output_columns)
+        for timestamp, crop, growth_job_id in rows:
+            writer.writerow(
+                [timestamp, crop, growth_job_id]
+                + ["x"] * (len(output_columns) - 3)
+            )
+
+
+def read_dataset_rows(dataset_dir_path: str) -> list[list[str]]:
+    """
+    Returns rows from every file in the dataset, headers dropped
+    :param dataset_dir_path: str
+    :return: list[list[str]]
+    """
+    rows = []
+    for dir_path, _, file_names in sorted(os.walk(dataset_dir_path)):
+        for file_name in sorted(file_names):
+            if file_name == MANIFEST_FILE_NAME:
+                continue
+            with open(os.path.join(dir_path, file_name), newline="") as file:
+                reader = csv.reader(file)
+                assert next(reader) == output_columns
+                rows += list(reader)
+    return rows
+
+
+def test_publish_to_dataset__partitions_by_date_and_crop(
+    tmp_path, valid_run_id
+) -> None:
+    """
+    Tests rows are split into a file per growth job in date and crop partitions,
+    listed in the manifest, and the run's output file removed
+    :return: None
+    """
+    output_file = str(tmp_path / "data.csv")
+    write_output_file(
+        output_file,
+        [
+            ("2022-01-05T23:59:30", "basil", 1),
+            ("2022-01-05T23:59:30", "kale", 3),
+            ("2022-01-06T00:00:00", "basil", 1),
+            ("2022-01-06T00:00:00", "basil", 2),
+        ],
+    )
+    manifest = publish_to_dataset(
+        output_file, output_dir_path=str(tmp_path), run_id=valid_run_id
+    )
+    assert not os.path.exists(output_file)
+    assert {
+        partition_path: {
+            file_name: dataset_file.rows
+            for file_name, dataset_file in files.items()
+        }
+        for partition_path, files in manifest.partitions.items()
+    } == {
+        "date=2022-01-05/crop=basil": {"growth_job_1.csv": 1},
+        "date=2022-01-05/crop=kale": {"growth_job_3.csv": 1},
+        "date=2022-01-06/crop=basil": {
+            "growth_job_1.csv": 1,
+            "growth_job_2.csv": 1,
+        },
+    }
+    dataset_dir_path = get_dataset_dir_path(str(tmp_path))
+    assert read_manifest(dataset_dir_path) == manifest
+    assert len(read_dataset_rows(dataset_dir_path)) == 4
+    assert sorted(os.listdir(dataset_dir_path)) == [
+        "date=2022-01-05",
+        "date=2022-01-06",
+        MANIFEST_FILE_NAME,
+    ]
+
+
+def test_publish_to_dataset__replaces_run_jobs_only(
+    tmp_path, valid_run_id
+) -> None:
+    """
+    Tests a later run replaces files for its growth jobs, removing those in
+    partitions it did not write, leaving other jobs' files untouched
+    :return: None
+    """
+    output_file = str(tmp_path / "data.csv")
+    write_output_file(
+        output_file,
+        [
+            ("2022-01-05T00:00:00", "basil", 1),
+            ("2022-01-06T00:00:00", "basil", 1),
+            ("2022-01-06T00:00:00", "basil", 2),
+        ],
+    )
+    publish_to_dataset(
+        output_file, output_dir_path=str(tmp_path), run_id=valid_run_id
+    )
+    write_output_file(
+        output_file,
+        [
+            ("2022-01-06T00:00:00", "basil", 1),
+            ("2022-01-06T00:00:30", "basil", 1),
+        ],
+    )
+    manifest = publish_to_dataset(
+        output_file, output_dir_path=str(tmp_path), run_id=valid_run_id
+    )
+    assert {
+        partition_path: {
+            file_name: dataset_file.rows
+            for file_name, dataset_file in files.items()
+        }
+        for partition_path, files in manifest.partitions.items()
+    } == {
+        "date=2022-01-06/crop=basil": {
+            "growth_job_1.csv": 2,
+            "growth_job_2.csv": 1,
+        },
+    }
+    dataset_dir_path = get_dataset_dir_path(str(tmp_path))
+    assert not os.path.exists(
+        os.path.join(dataset_dir_path, "date=2022-01-05")
+    )
+    assert len(read_dataset_rows(dataset_dir_path)) == 3
+
+
+def test_read_manifest__missing_returns_empty(tmp_path) -> None:
+    """
+    Tests read_manifest returns an empty manifest when none written
+    :return: None
+    """
+    assert read_manifest(str(tmp_path)).partitions == {}
+
+
+def test_read_manifest__invalid_raises_and_logs(tmp_path, caplog) -> None:
+    """
+    Tests read_manifest raises and logs on an invalid manifest file
+    :return: None
+    """
+    with open(tmp_path / MANIFEST_FILE_NAME, "w") as file:
+        file.write('{"partitions": []}')
+    with pytest.raises(ValidationError):
+        read_manifest(str(tmp_path))
+    assert "ERROR" in caplog.text and "Cannot validate manifest" in caplog.text
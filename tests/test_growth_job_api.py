@@ -7,6 +7,7 @@ from pydantic import ValidationError
 from growth_job_pipeline.growth_job_api import (
     get_time_filtered_growth_jobs_for_crop,
 )
+from growth_job_pipeline.metrics import run_metrics
 
 
 @pytest.fixture()
@@ -50,6 +51,31 @@ def test_get_time_filtered_growth_jobs_for_crop(
         ) == [growth_job_1, growth_job_2]
 
 
+def test_get_time_filtered_growth_jobs_for_crop__counts_api_calls(
+    response_mock,
+    valid_timestamp,
+    valid_to_timestamp,
+    valid_crop,
+    json_str_valid,
+):
+    """
+    Tests get_time_filtered_growth_jobs_for_crop counts API calls in the active stage
+    """
+    run_metrics.reset()
+    with response_mock(
+        f"GET http://localhost:8080/jobs -> 200 :{json_str_valid}"
+    ):
+        with run_metrics.stage("growth_jobs_match") as stage_metrics:
+            for _ in range(2):
+                get_time_filtered_growth_jobs_for_crop(
+                    from_timestamp=valid_timestamp,
+                    to_timestamp=valid_to_timestamp,
+                    crop=valid_crop,
+                )
+    assert stage_metrics.counters["api_calls"] == 2
+    run_metrics.reset()
+
+
 def test_get_time_filtered_growth_jobs_for_crop__no_crop_results(
     response_mock,
     valid_timestamp,
@@ -141,3 +167,37 @@ def test_get_time_filtered_growth_jobs_for_crop__invalid_json_raises_logged(
                 crop=valid_crop,
             )
     assert "ERROR" in caplog.text
+
+
+def test_get_time_filtered_growth_jobs_for_crop__cached_index(
+    mocker,
+    override_settings,
+    response_mock,
+    valid_timestamp,
+    valid_to_timestamp,
+    valid_crop,
+    json_str_valid,
+    growth_job_1,
+    growth_job_2,
+):
+    """
+    Tests growth jobs are fetched once while GROWTH_JOBS_CACHE_SECONDS not passed
+    """
+    override_settings(growth_jobs_cache_seconds=60)
+    mocker.patch(
+        "growth_job_pipeline.growth_job_api.growth_jobs._growth_job_index_cache",
+        None,
+    )
+    run_metrics.reset()
+    with response_mock(
+        f"GET http://localhost:8080/jobs -> 200 :{json_str_valid}"
+    ):
+        with run_metrics.stage("growth_jobs_match") as stage_metrics:
+            for _ in range(2):
+                assert get_time_filtered_growth_jobs_for_crop(
+                    from_timestamp=valid_timestamp,
+                    to_timestamp=valid_to_timestamp,
+                    crop=valid_crop,
+                ) == [growth_job_1, growth_job_2]
+    assert stage_metrics.counters["api_calls"] == 1
+    run_metrics.reset()
@@ -0,0 +1,45 @@
+import datetime
+
+from growth_job_pipeline.growth_job_api.growth_job_index import (
+    GrowthJobIndex,
+)
+from growth_job_pipeline.models.validators.growth_job import GrowthJob
+
+
+def test_growth_job_index_find(
+    growth_job_1,
+    growth_job_2,
+    valid_crop,
+    valid_crop2,
+    valid_start_date__job1,
+    valid_end_date__job1,
+    valid_end_date__job2,
+) -> None:
+    """
+    Tests find returns jobs for crop completed in range, to exclusive, by end_date,
+    leaving out jobs still running
+    :return: None
+    """
+    running_job = GrowthJob(
+        id=3, crop=valid_crop, start_date=valid_start_date__job1, end_date=None
+    )
+    index = GrowthJobIndex([growth_job_2, running_job, growth_job_1])
+    assert index.num_jobs == 2
+    assert index.find(
+        from_timestamp=valid_end_date__job1,
+        to_timestamp=valid_end_date__job2 + datetime.timedelta(seconds=1),
+        crop=valid_crop,
+    ) == [growth_job_1, growth_job_2]
+    assert index.find(
+        from_timestamp=valid_end_date__job1,
+        to_timestamp=valid_end_date__job2,
+        crop=valid_crop,
+    ) == [growth_job_1]
+    assert (
+        index.find(
+            from_timestamp=valid_end_date__job1,
+            to_timestamp=valid_end_date__job2,
+            crop=valid_crop2,
+        )
+        == []
+    )
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+import pytest
+
+# imported by the pipeline only once a run needs them
+DEFERRED_MODULES = [
+    "requests",
+    "urllib3",
+    "backoff",
+    "pyodbc",
+    "arrow_odbc",
+    "pyarrow",
+    "sqlite3",
+    "growth_job_pipeline.telemetry_db",
+    "growth_job_pipeline.output_writers",
+    "growth_job_pipeline.backfill",
+    "growth_job_pipeline.daemon",
+    "growth_job_pipeline.dataset",
+]
+# generous, to catch a heavy import creeping back rather than measure noise
+IMPORT_TIME_BUDGET_SECONDS = 2.0
+
+
+def get_import_times(module: str) -> dict[str, int]:
+    """
+    Imports module in a fresh interpreter with -X importtime
+    :param module: str
+    :return: dict[str, int], cumulative microseconds by every module imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+@pytest.fixture(scope="module")
+def main_import_times() -> dict[str, int]:
+    """
+    Returns import times from a cold import of growth_job_pipeline.main
+    :return: dict[str, int]
+    """
+    return get_import_times("growth_job_pipeline.main")
+
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES)
+def test_main_import__defers_module(module, main_import_times) -> None:
+    """
+    Tests importing main does not import the DB driver or HTTP stack
+    :return: None
+    """
+    assert module not in main_import_times
+
+
+def test_main_import__within_budget(main_import_times) -> None:
+    """
+    Tests a cold import of main stays within the import time budget
+    :return: None
+    """
+    assert (
+        main_import_times["growth_job_pipeline.main"] / 1e6
+        < IMPORT_TIME_BUDGET_SECONDS
+    )
@@ -0,0 +1,120 @@
+import atexit
+import json
+import logging
+from contextlib import contextmanager
+
+from growth_job_pipeline.logger import (
+    JsonFormatter,
+    RATE_LIMITED,
+    RateLimitFilter,
+    setup_logger,
+)
+
+
+def make_record(msg: str, lineno: int = 1, **extra) -> logging.LogRecord:
+    """
+    Returns a DEBUG record logged from lineno of a test module
+    :param msg: str
+    :param lineno: int
+    :param extra: record attributes
+    :return: logging.LogRecord
+    """
+    record = logging.LogRecord(
+        "test", logging.DEBUG, "test.py", lineno, msg, (), None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+def test_rate_limit_filter(mocker) -> None:
+    """
+    Tests rate limited records from a call site are let through once per interval,
+    with a count of those dropped, and other records always let through
+    :return: None
+    """
+    monotonic = mocker.patch(
+        "growth_job_pipeline.logger.time.monotonic", return_value=100.0
+    )
+    rate_limit_filter = RateLimitFilter(interval=1.0)
+    assert rate_limit_filter.filter(make_record("batch", **RATE_LIMITED))
+    assert not rate_limit_filter.filter(make_record("batch", **RATE_LIMITED))
+    assert not rate_limit_filter.filter(make_record("batch", **RATE_LIMITED))
+    assert rate_limit_filter.filter(
+        make_record("other site", lineno=2, **RATE_LIMITED)
+    )
+    assert rate_limit_filter.filter(make_record("not rate limited"))
+
+    monotonic.return_value = 101.5
+    record = make_record("batch", **RATE_LIMITED)
+    assert rate_limit_filter.filter(record)
+    assert record.getMessage() == "batch (2 similar suppressed)"
+
+
+def test_json_formatter() -> None:
+    """
+    Tests records format as a JSON object with the lazily formatted message
+    :return: None
+    """
+    record = logging.LogRecord(
+        "growth_job_pipeline.main",
+        logging.INFO,
+        "main.py",
+        10,
+        "rows=%d",
+        (5,),
+        None,
+    )
+    log_entry = json.loads(JsonFormatter().format(record))
+    assert log_entry["message"] == "rows=5"
+    assert log_entry["level"] == "INFO"
+    assert log_entry["module"] == "growth_job_pipeline.main"
+
+
+@contextmanager
+def unconfigured_root_logger():
+    """
+    Removes root logger handlers, pytest's included, restoring them and its level after
+    :return: Generator[logging.Logger, None, None]
+    """
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    level = root_logger.level
+    root_logger.handlers.clear()
+    try:
+        yield root_logger
+    finally:
+        root_logger.handlers[:] = handlers
+        root_logger.setLevel(level)
+
+
+def test_setup_logger__queued_to_file(tmp_path, valid_run_id) -> None:
+    """
+    Tests records logged go through the queue listener to the run's log file
+    :return: None
+    """
+    with unconfigured_root_logger():
+        listener = setup_logger(
+            run_output_dir_path=str(tmp_path), run_id=valid_run_id
+        )
+        assert listener is not None
+        logging.getLogger("growth_job_pipeline.test").info("rows=%d", 5)
+        listener.stop()
+        atexit.unregister(listener.stop)
+    with open(tmp_path / f"{valid_run_id}.log") as file:
+        assert "rows=5" in file.read()
+
+
+def test_setup_logger__already_configured(tmp_path, valid_run_id) -> None:
+    """
+    Tests setup_logger leaves an already configured root logger alone
+    :return: None
+    """
+    with unconfigured_root_logger() as root_logger:
+        root_logger.addHandler(logging.NullHandler())
+        assert (
+            setup_logger(
+                run_output_dir_path=str(tmp_path), run_id=valid_run_id
+            )
+            is None
+        )
+        assert len(root_logger.handlers) == 1
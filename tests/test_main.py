@@ -2,16 +2,25 @@ import datetime
 
 import pytest
 
-from growth_job_pipeline.config import config
+from growth_job_pipeline.config import get_settings
 from growth_job_pipeline.main import (
+    advance_watermark,
     create_job_to_output_rows_spec,
     get_bounding_timestamps_for_specs,
     match_yield_results_growth_jobs_gen_specs,
+    parse_args,
+    parse_run_output_dir_name,
+    read_run_config_timestamps,
+    write_run_data,
 )
 from growth_job_pipeline.models.validators.coalesced_timestamps import (
     CoalescedTimestamps,
 )
+from growth_job_pipeline.models.validators.config_timestamps import (
+    ConfigTimestamps,
+)
 from growth_job_pipeline.utils import latest_datetime_possible_for_date
+from growth_job_pipeline.watermark import read_watermark, write_watermark
 
 
 def test_create_job_to_output_rows_spec(
@@ -194,6 +203,135 @@ def test_match_yield_results_growth_jobs_gen_specs_raises__late_yield_result(
         assert "Cannot unambiguously assign yield result" in caplog.text
         assert (
             "Num growth jobs found search back minus"
-            f" {config('MAX_DAYS_DELAY_GROWTH_JOB_YIELD_RESULT')} days=0"
+            f" {get_settings().max_days_delay_growth_job_yield_result} days=0"
             in caplog.text
         )
+
+
+def test_parse_run_output_dir_name(valid_run_id, valid_timestamp) -> None:
+    """
+    Tests parse_run_output_dir_name reverses the naming in setup_run_output_dir
+    :param valid_run_id:
+    :param valid_timestamp:
+    :return: None
+    """
+    run_output_dir_path = (
+        f"/data/{valid_timestamp.isoformat()}_{str(valid_run_id)}/"
+    )
+    assert parse_run_output_dir_name(run_output_dir_path) == (
+        valid_run_id,
+        valid_timestamp,
+    )
+
+
+def test_parse_run_output_dir_name__invalid_raises(caplog) -> None:
+    """
+    Tests parse_run_output_dir_name raises and logs for a foreign dir name
+    :param caplog:
+    :return: None
+    """
+    with pytest.raises(ValueError):
+        parse_run_output_dir_name("/data/not_a_run_dir")
+    assert "ERROR" in caplog.text
+
+
+def test_parse_args__resume() -> None:
+    """
+    Tests parse_args reads --resume run dir, defaulting to None
+    :return: None
+    """
+    assert parse_args([]).resume is None
+    assert parse_args(["--resume", "/data/run"]).resume == "/data/run"
+
+
+def test_parse_args__daemon() -> None:
+    """
+    Tests parse_args reads --daemon, not allowed with --resume
+    :return: None
+    """
+    assert parse_args([]).daemon is False
+    assert parse_args(["--daemon"]).daemon is True
+    with pytest.raises(SystemExit):
+        parse_args(["--daemon", "--resume", "/data/run"])
+
+
+def test_parse_args__backfill() -> None:
+    """
+    Tests parse_args reads --backfill, not allowed with --resume or --daemon
+    :return: None
+    """
+    assert parse_args([]).backfill is False
+    assert parse_args(["--backfill"]).backfill is True
+    for other_args in [["--resume", "/data/run"], ["--daemon"]]:
+        with pytest.raises(SystemExit):
+            parse_args(["--backfill", *other_args])
+
+
+def test_advance_watermark(
+    tmp_path,
+    override_settings,
+    watermark,
+    valid_run_id,
+    valid_timestamp,
+    valid_to_timestamp,
+) -> None:
+    """
+    Tests the watermark is advanced by incremental runs only, never moved back
+    :return: None
+    """
+    override_settings(output_dir=str(tmp_path))
+    config_timestamps = ConfigTimestamps(
+        from_timestamp=None, to_timestamp=valid_to_timestamp
+    )
+    advance_watermark(config_timestamps, run_id=valid_run_id)
+    assert read_watermark(str(tmp_path)) is None
+
+    write_watermark(str(tmp_path), watermark)
+    advance_watermark(
+        config_timestamps.model_copy(
+            update={"incremental": True, "to_timestamp": valid_timestamp}
+        ),
+        run_id=valid_run_id,
+    )
+    assert read_watermark(str(tmp_path)) == watermark
+    advance_watermark(
+        config_timestamps.model_copy(update={"incremental": True}),
+        run_id=valid_run_id,
+    )
+    assert read_watermark(str(tmp_path)).to_timestamp == valid_to_timestamp
+
+
+def test_read_run_config_timestamps(
+    tmp_path,
+    valid_run_id,
+    valid_timestamp,
+    valid_to_timestamp,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests a run's config timestamps read back from its run data, None if not written
+    :return: None
+    """
+    config_timestamps = ConfigTimestamps(
+        from_timestamp=valid_timestamp,
+        to_timestamp=valid_to_timestamp,
+        incremental=True,
+    )
+    assert read_run_config_timestamps(str(tmp_path), valid_run_id) is None
+    write_run_data(
+        run_id=valid_run_id,
+        run_output_dir_path=str(tmp_path),
+        config_timestamps=config_timestamps,
+        coalesced_timestamps=CoalescedTimestamps(
+            from_timestamp=valid_timestamp, to_timestamp=valid_to_timestamp
+        ),
+        run_timestamp=valid_timestamp,
+        telemetry_type_to_fetch=valid_measurement_type,
+        telemetry_unit_to_fetch=valid_measurement_unit,
+        job_to_output_rows_specs=[],
+    )
+    assert (
+        read_run_config_timestamps(str(tmp_path), valid_run_id)
+        == config_timestamps
+    )
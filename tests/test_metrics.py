@@ -0,0 +1,182 @@
+import json
+import tracemalloc
+
+import pytest
+
+from growth_job_pipeline.metrics import count_retry, run_metrics
+from growth_job_pipeline.metrics.metrics import RunMetrics
+
+
+def test_run_metrics_stage_accumulates() -> None:
+    """
+    Tests entering a stage again adds to its calls, times and counters
+    :return: None
+    """
+    metrics = RunMetrics()
+    for _ in range(2):
+        with metrics.stage("output_write") as stage_metrics:
+            stage_metrics.counters["rows_written"] += 3
+    stage_metrics = metrics.stages["output_write"]
+    assert stage_metrics.calls == 2
+    assert stage_metrics.counters["rows_written"] == 6
+    assert stage_metrics.wall_time >= 0 and stage_metrics.cpu_time >= 0
+
+
+def test_run_metrics_increment__innermost_stage_only() -> None:
+    """
+    Tests counters go to the innermost active stage, and are ignored outside stages
+    :return: None
+    """
+    metrics = RunMetrics()
+    metrics.increment("api_calls")
+    with metrics.stage("growth_jobs_match"):
+        metrics.increment("api_calls")
+        with metrics.stage("inner"):
+            metrics.increment("api_calls", 2)
+    assert metrics.stages["growth_jobs_match"].counters["api_calls"] == 1
+    assert metrics.stages["inner"].counters["api_calls"] == 2
+
+
+def test_run_metrics_stage__exception_still_recorded() -> None:
+    """
+    Tests a stage raising is still timed, and stops being the active stage
+    :return: None
+    """
+    metrics = RunMetrics()
+    with pytest.raises(RuntimeError):
+        with metrics.stage("growth_jobs_match"):
+            raise RuntimeError
+    metrics.increment("api_calls")
+    assert metrics.stages["growth_jobs_match"].calls == 1
+    assert not metrics.stages["growth_jobs_match"].counters
+
+
+def test_run_metrics_timed_iter() -> None:
+    """
+    Tests timed_iter yields every item, timing each fetch plus the final one
+    :return: None
+    """
+    metrics = RunMetrics()
+
+    def batches():
+        metrics.increment("retries")
+        yield [1, 2]
+        yield [3]
+
+    assert list(metrics.timed_iter(batches(), "telemetry_fetch")) == [
+        [1, 2],
+        [3],
+    ]
+    assert metrics.stages["telemetry_fetch"].calls == 3
+    assert metrics.stages["telemetry_fetch"].counters["retries"] == 1
+
+
+def test_run_metrics_to_dict_serializable() -> None:
+    """
+    Tests to_dict is JSON serializable with run totals and stages in order entered
+    :return: None
+    """
+    metrics = RunMetrics()
+    with metrics.stage("yield_results_read") as stage_metrics:
+        stage_metrics.counters["yield_results"] += 4
+    with metrics.stage("growth_jobs_match"):
+        pass
+    metrics_dict = json.loads(json.dumps(metrics.to_dict()))
+    assert list(metrics_dict["stages"]) == [
+        "yield_results_read",
+        "growth_jobs_match",
+    ]
+    assert metrics_dict["stages"]["yield_results_read"]["yield_results"] == 4
+    assert metrics_dict["wall_time_seconds"] >= 0
+    metrics.reset()
+    assert metrics.stages == {}
+
+
+def test_count_retry() -> None:
+    """
+    Tests the backoff handler counts retries on the shared run metrics
+    :return: None
+    """
+    run_metrics.reset()
+    with run_metrics.stage("telemetry_fetch"):
+        count_retry({"tries": 1})
+    assert run_metrics.stages["telemetry_fetch"].counters["retries"] == 1
+    run_metrics.reset()
+
+
+def test_run_metrics_stage__records_memory() -> None:
+    """
+    Tests leaving a stage records RSS and, while tracing, the Python heap
+    :return: None
+    """
+    metrics = RunMetrics()
+    with metrics.stage("yield_results_read"):
+        pass
+    stage_metrics = metrics.stages["yield_results_read"]
+    assert stage_metrics.rss_high_water > 0
+    assert stage_metrics.peak_rss_increase >= 0
+    assert stage_metrics.python_heap_high_water is None
+
+    tracemalloc.start()
+    try:
+        with metrics.stage("yield_results_read"):
+            allocated = [str(i) for i in range(10000)]
+    finally:
+        tracemalloc.stop()
+    assert allocated
+    assert stage_metrics.python_heap_high_water > 0
+    assert stage_metrics.to_dict()["rss_high_water_bytes"] > 0
+
+
+def test_run_metrics_stage__memory_budget_exceeded_raises(caplog) -> None:
+    """
+    Tests leaving a stage over the memory budget raises MemoryError and logs
+    :return: None
+    """
+    metrics = RunMetrics(memory_budget=1024)
+    with pytest.raises(MemoryError):
+        with metrics.stage("telemetry_fetch"):
+            pass
+    assert (
+        "ERROR" in caplog.text
+        and "over memory budget=1024 bytes in stage=telemetry_fetch"
+        in caplog.text
+    )
+    metrics.reset()
+    with metrics.stage("telemetry_fetch"):
+        pass
+
+
+def test_run_metrics_stage__memory_budget_not_masking_errors() -> None:
+    """
+    Tests a stage raising its own error is not turned into MemoryError
+    :return: None
+    """
+    metrics = RunMetrics(memory_budget=1024)
+    with pytest.raises(RuntimeError):
+        with metrics.stage("telemetry_fetch"):
+            raise RuntimeError
+
+
+def test_run_metrics_merge_stages() -> None:
+    """
+    Tests stages from another RunMetrics add their calls and counters, keeping the
+    higher memory high water mark
+    :return: None
+    """
+    metrics, worker_metrics = RunMetrics(), RunMetrics()
+    with metrics.stage("output_write") as stage_metrics:
+        metrics.increment("rows_written", 3)
+    stage_metrics.rss_high_water = 100
+    for _ in range(2):
+        with worker_metrics.stage("output_write") as worker_stage_metrics:
+            worker_metrics.increment("rows_written", 5)
+        with worker_metrics.stage("telemetry_fetch"):
+            worker_metrics.increment("batches")
+    worker_stage_metrics.rss_high_water = 200
+    metrics.merge_stages(worker_metrics.stages)
+    assert list(metrics.stages) == ["output_write", "telemetry_fetch"]
+    assert metrics.stages["output_write"].calls == 3
+    assert metrics.stages["output_write"].counters["rows_written"] == 13
+    assert metrics.stages["output_write"].rss_high_water == 200
+    assert metrics.stages["telemetry_fetch"].counters["batches"] == 2
@@ -0,0 +1,132 @@
+import csv
+import gzip
+
+import pytest
+
+from growth_job_pipeline.output_writers import (
+    get_compression_summary,
+    OutputFile,
+)
+
+ROWS = [["timestamp", "value"]] + [
+    [f"2022-01-01T00:00:{i % 60:02d}", str(i / 7)] for i in range(2000)
+]
+
+
+def decompress(path: str, compression: str) -> bytes:
+    """
+    Returns the decompressed contents of path, across every gzip member or zstd frame
+    :param path: str
+    :param compression: str
+    :return: bytes
+    """
+    with open(path, "rb") as file:
+        if compression == "gzip":
+            return gzip.decompress(file.read())
+        if compression == "zstd":
+            import zstandard
+
+            return (
+                zstandard.ZstdDecompressor()
+                .stream_reader(file, read_across_frames=True)
+                .read()
+            )
+        return file.read()
+
+
+@pytest.fixture(params=["none", "gzip", "zstd"])
+def compression(request) -> str:
+    """
+    Returns each output compression, skipping zstd if zstandard is not installed
+    :param request:
+    :return: str
+    """
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+    return request.param
+
+
+def test_output_file__round_trip(tmp_path, compression) -> None:
+    """
+    Tests rows written in small chunks decompress to the bytes csv.writer writes,
+    counting uncompressed and compressed bytes
+    :return: None
+    """
+    path = str(tmp_path / "data.csv")
+    with OutputFile(path, compression=compression, chunk_size=1000) as file:
+        csv.writer(file).writerows(ROWS)
+    with open(tmp_path / "expected.csv", "w") as expected_file:
+        csv.writer(expected_file).writerows(ROWS)
+
+    expected = (tmp_path / "expected.csv").read_bytes()
+    assert decompress(path, compression) == expected
+    assert file.bytes_written == len(expected)
+    if compression != "none":
+        counters = file.compress_metrics.counters
+        assert counters["uncompressed_bytes"] == len(expected)
+        assert counters["compressed_bytes"] == len(open(path, "rb").read())
+
+
+def test_output_file__resume_at_synced_offset(tmp_path, compression) -> None:
+    """
+    Tests the file truncated to a synced offset and appended to decompresses to the
+    rows before the sync and the rows appended, dropping rows after
+    :return: None
+    """
+    path = str(tmp_path / "data.csv")
+    synced_offsets = []
+    with OutputFile(path, compression=compression) as file:
+        writer = csv.writer(file)
+        writer.writerows(ROWS[:1000])
+        file.sync(synced_offsets.append)
+        writer.writerows(ROWS[1000:1500])
+    with OutputFile(
+        path, compression=compression, file_offset=synced_offsets[0]
+    ) as file:
+        csv.writer(file).writerows(ROWS[1000:])
+    with open(tmp_path / "expected.csv", "w") as expected_file:
+        csv.writer(expected_file).writerows(ROWS)
+
+    assert decompress(path, compression) == (
+        (tmp_path / "expected.csv").read_bytes()
+    )
+
+
+def test_output_file__compression_error_raised(tmp_path, mocker) -> None:
+    """
+    Tests an error on the compression thread is raised to the writer, not hanging it
+    :return: None
+    """
+    path = str(tmp_path / "data.csv")
+    mocker.patch(
+        "growth_job_pipeline.output_writers.output_file.MAX_QUEUED_CHUNKS", 1
+    )
+
+    def failing_callback(file_offset: int) -> None:
+        raise OSError("disk full")
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        with OutputFile(path, compression="gzip", chunk_size=10) as file:
+            file.sync(failing_callback)
+            csv.writer(file).writerows(ROWS)
+
+
+def test_get_compression_summary() -> None:
+    """
+    Tests ratio and throughput are computed from the compress stage's metrics
+    :return: None
+    """
+    assert get_compression_summary(
+        compression="gzip",
+        compress_stage={
+            "wall_time_seconds": 0.5,
+            "uncompressed_bytes": 1000,
+            "compressed_bytes": 250,
+        },
+    ) == {
+        "compression": "gzip",
+        "uncompressed_bytes": 1000,
+        "compressed_bytes": 250,
+        "ratio": 4.0,
+        "throughput_bytes_per_second": 2000,
+    }
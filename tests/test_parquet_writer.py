@@ -0,0 +1,177 @@
+import csv
+import io
+from array import array
+
+import pytest
+
+from growth_job_pipeline.models.records.job_to_output_rows_spec import (
+    JobToOutputRowsSpecRecord,
+)
+from growth_job_pipeline.models.records.telemetry_columns import (
+    TelemetryColumns,
+)
+from growth_job_pipeline.models.records.telemetry_entry import (
+    TelemetryEntryRecord,
+)
+from growth_job_pipeline.models.validators.output_row import output_columns
+from growth_job_pipeline.output_writers import (
+    ParquetOutputWriter,
+    telemetry_columns_to_output_rows,
+    write_parquet_output,
+)
+from growth_job_pipeline.output_writers.parquet_writer import (
+    batch_to_telemetry_columns,
+    get_output_row_indexes,
+    get_output_schema,
+)
+
+
+@pytest.fixture()
+def specs(
+    job_to_output_rows_spec,
+    job_to_output_rows_spec2,
+    job_to_output_rows_spec__overlapping,
+) -> list:
+    """
+    Returns specs for two jobs of one crop and another crop overlapping both
+    :return: list[JobToOutputRowsSpec]
+    """
+    return [
+        job_to_output_rows_spec2,
+        job_to_output_rows_spec,
+        job_to_output_rows_spec__overlapping,
+    ]
+
+
+def test_get_output_row_indexes__matches_csv_rows(
+    telemetry_columns, specs
+) -> None:
+    """
+    Tests output row indexes give the rows, in order, the CSV writer writes
+    :return: None
+    """
+    spec_records = [JobToOutputRowsSpecRecord.from_spec(s) for s in specs]
+    csv_file = io.StringIO()
+    telemetry_columns_to_output_rows(
+        writer=csv.writer(csv_file),
+        columns=telemetry_columns,
+        job_to_output_rows_specs=spec_records,
+    )
+    entry_indexes, spec_indexes = get_output_row_indexes(
+        telemetry_columns.timestamps, specs
+    )
+    csv_rows = list(csv.reader(io.StringIO(csv_file.getvalue())))
+    assert len(entry_indexes) == len(spec_indexes) == len(csv_rows) > 0
+    for row, i, spec_index in zip(csv_rows, entry_indexes, spec_indexes):
+        assert row[0] == telemetry_columns.timestamps[i].isoformat()
+        assert int(row[2]) == specs[spec_index].growth_job_id
+
+
+def test_batch_to_telemetry_columns__rows(telemetry_entry) -> None:
+    """
+    Tests a row-wise batch is returned column-wise
+    :return: None
+    """
+    record = TelemetryEntryRecord(**telemetry_entry.model_dump())
+    assert batch_to_telemetry_columns([record]) == TelemetryColumns(
+        timestamps=[record.timestamp],
+        values=[record.value],
+        type=record.type,
+        unit=record.unit,
+    )
+
+
+def test_get_output_schema__output_columns() -> None:
+    """
+    Tests the Parquet schema's columns are output_columns, spec columns dictionary
+    encoded
+    :return: None
+    """
+    pyarrow = pytest.importorskip("pyarrow")
+    schema = get_output_schema()
+    assert schema.names == output_columns
+    assert pyarrow.types.is_dictionary(schema.field("growth_job_id").type)
+    assert schema.field("timestamp").type == pyarrow.timestamp("us")
+    assert schema.field("telemetry_measurement_value").type == (
+        pyarrow.float64()
+    )
+
+
+def test_parquet_output_writer__row_group_per_batch(
+    tmp_path, telemetry_columns, specs
+) -> None:
+    """
+    Tests each batch is written as a row group, read back with native types and the
+    same rows as the CSV writer
+    :return: None
+    """
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = str(tmp_path / "data.parquet")
+    writer = ParquetOutputWriter(
+        file=path,
+        job_to_output_rows_specs=specs,
+        telemetry_type=telemetry_columns.type,
+        telemetry_unit=telemetry_columns.unit,
+    )
+    half = telemetry_columns.num_rows // 2
+    rows_written = sum(
+        writer.write_batch(
+            telemetry_columns._replace(
+                timestamps=telemetry_columns.timestamps[start:end],
+                values=telemetry_columns.values[start:end],
+            )
+        )
+        for start, end in [(0, half), (half, telemetry_columns.num_rows)]
+    )
+    writer.close()
+
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 2
+    table = parquet_file.read()
+    assert table.num_rows == rows_written
+    entry_indexes, spec_indexes = get_output_row_indexes(
+        telemetry_columns.timestamps, specs
+    )
+    for row, i, spec_index in zip(
+        table.to_pylist(), entry_indexes, spec_indexes
+    ):
+        spec = specs[spec_index]
+        assert row == {
+            "timestamp": telemetry_columns.timestamps[i],
+            **{
+                column: getattr(spec, column)
+                for column in output_columns[1:-3]
+            },
+            "telemetry_measurement_type": telemetry_columns.type,
+            "telemetry_measurement_unit": telemetry_columns.unit,
+            "telemetry_measurement_value": telemetry_columns.values[i],
+        }
+
+
+def test_write_parquet_output__no_rows(
+    tmp_path, valid_timestamp, job_to_output_rows_spec, telemetry_columns
+) -> None:
+    """
+    Tests a run writing no rows leaves a readable, empty Parquet file
+    :return: None
+    """
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = str(tmp_path / "data.parquet")
+    assert write_parquet_output(
+        output_file=path,
+        telemetry_batches=[
+            telemetry_columns._replace(
+                timestamps=[valid_timestamp], values=array("d", [20.0])
+            )
+        ],
+        job_to_output_rows_specs=[job_to_output_rows_spec],
+        telemetry_type_to_fetch=telemetry_columns.type,
+        telemetry_unit_to_fetch=telemetry_columns.unit,
+    ) == (0, valid_timestamp)
+    table = pyarrow.parquet.read_table(path)
+    assert table.num_rows == 0
+    assert table.schema.names == output_columns
@@ -0,0 +1,84 @@
+import os
+import pstats
+import tracemalloc
+
+import pytest
+
+from growth_job_pipeline.profiling import profile_run
+
+
+@pytest.fixture()
+def profiling_config(override_settings):
+    """
+    Returns a function switching profiling settings on, all off unless passed
+    :param override_settings:
+    :return: Callable
+    """
+
+    def set_profiling_config(**values):
+        override_settings(
+            **{
+                "profile_cprofile": False,
+                "profile_tracemalloc": False,
+                **values,
+            }
+        )
+
+    return set_profiling_config
+
+
+def test_profile_run__disabled_writes_nothing(
+    tmp_path, valid_run_id, profiling_config
+) -> None:
+    """
+    Tests profile_run leaves the run dir untouched when switched off
+    :return: None
+    """
+    profiling_config()
+    with profile_run(run_output_dir_path=str(tmp_path), run_id=valid_run_id):
+        sum(range(1000))
+    assert os.listdir(tmp_path) == []
+
+
+def test_profile_run__writes_pstats_and_tracemalloc_report(
+    tmp_path, valid_run_id, profiling_config
+) -> None:
+    """
+    Tests profile_run writes loadable cProfile stats and a tracemalloc report
+    :return: None
+    """
+    profiling_config(
+        profile_cprofile=True,
+        profile_tracemalloc=True,
+        profile_tracemalloc_top=5,
+    )
+    with profile_run(run_output_dir_path=str(tmp_path), run_id=valid_run_id):
+        allocated = [str(i) for i in range(10000)]
+    assert allocated
+    assert not tracemalloc.is_tracing()
+    assert sorted(os.listdir(tmp_path)) == [
+        f"profile_{valid_run_id}.pstats",
+        f"tracemalloc_{valid_run_id}.txt",
+    ]
+    stats = pstats.Stats(str(tmp_path / f"profile_{valid_run_id}.pstats"))
+    assert stats.total_calls > 0
+    with open(tmp_path / f"tracemalloc_{valid_run_id}.txt") as file:
+        lines = file.read().splitlines()
+    assert lines[0].startswith("current_bytes=")
+    assert 0 < len(lines[2:]) <= 5
+
+
+def test_profile_run__writes_on_exception(
+    tmp_path, valid_run_id, profiling_config
+) -> None:
+    """
+    Tests profile_run still writes stats when the profiled block raises
+    :return: None
+    """
+    profiling_config(profile_cprofile=True)
+    with pytest.raises(RuntimeError):
+        with profile_run(
+            run_output_dir_path=str(tmp_path), run_id=valid_run_id
+        ):
+            raise RuntimeError
+    assert os.listdir(tmp_path) == [f"profile_{valid_run_id}.pstats"]
@@ -0,0 +1,129 @@
+import datetime
+import os
+
+from growth_job_pipeline.metrics import export_prometheus_metrics
+from growth_job_pipeline.metrics.metrics import RunMetrics
+from growth_job_pipeline.metrics.prometheus import (
+    escape_label_value,
+    format_prometheus_metrics,
+    write_prometheus_textfile,
+)
+
+
+def get_run_metrics_dict() -> dict:
+    """
+    Returns metrics of a run that fetched and wrote one batch
+    :return: dict
+    """
+    metrics = RunMetrics()
+    with metrics.stage("growth_jobs_match") as stage_metrics:
+        stage_metrics.counters["api_calls"] += 2
+        stage_metrics.counters["specs"] += 2
+    with metrics.stage("telemetry_fetch") as stage_metrics:
+        stage_metrics.counters["batches"] += 1
+        stage_metrics.counters["rows_fetched"] += 10
+        stage_metrics.counters["retries"] += 1
+    with metrics.stage("output_write") as stage_metrics:
+        stage_metrics.counters["rows_written"] += 12
+    return metrics.to_dict()
+
+
+def test_format_prometheus_metrics() -> None:
+    """
+    Tests every metric has help and type lines and labelled samples
+    :return: None
+    """
+    text = format_prometheus_metrics(
+        metrics=get_run_metrics_dict(),
+        labels={"environment": "staging"},
+        succeeded=True,
+        finished_at=datetime.datetime(2022, 1, 1),
+    )
+    lines = text.splitlines()
+    assert text.endswith("\n")
+    samples = dict(
+        line.rsplit(" ", 1) for line in lines if not line.startswith("#")
+    )
+    assert (
+        samples['growth_job_pipeline_last_run_success{environment="staging"}']
+        == "1"
+    )
+    assert (
+        samples['growth_job_pipeline_api_calls{environment="staging"}'] == "2"
+    )
+    assert samples['growth_job_pipeline_retries{environment="staging"}'] == "1"
+    assert (
+        samples[
+            'growth_job_pipeline_matched_yield_results{environment="staging"}'
+        ]
+        == "2"
+    )
+    assert (
+        'growth_job_pipeline_stage_duration_seconds{environment="staging",'
+        'stage="telemetry_fetch"}'
+        in samples
+    )
+    metric_names = {
+        line.split()[2] for line in lines if line.startswith("# TYPE")
+    }
+    assert {
+        line.split("{")[0] for line in lines if not line.startswith("#")
+    } == metric_names
+
+
+def test_escape_label_value() -> None:
+    """
+    Tests backslashes, quotes and newlines are escaped in label values
+    :return: None
+    """
+    assert escape_label_value('a\\b"c\nd') == 'a\\\\b\\"c\\nd'
+
+
+def test_write_prometheus_textfile__atomic(tmp_path) -> None:
+    """
+    Tests the textfile is replaced whole, leaving no temp file behind
+    :return: None
+    """
+    path = str(tmp_path / "growth_job_pipeline.prom")
+    write_prometheus_textfile(path, "old 1\n")
+    write_prometheus_textfile(path, "new 1\n")
+    assert os.listdir(tmp_path) == ["growth_job_pipeline.prom"]
+    with open(path) as file:
+        assert file.read() == "new 1\n"
+
+
+def test_export_prometheus_metrics(
+    tmp_path, override_settings, valid_run_id
+) -> None:
+    """
+    Tests metrics are written to the textfile dir and run dir only when configured
+    :return: None
+    """
+    run_dir = tmp_path / "run"
+    textfile_dir = tmp_path / "textfile"
+    run_dir.mkdir()
+    textfile_dir.mkdir()
+    override_settings(
+        deploy_environment="staging",
+        prometheus_textfile_dir=None,
+        measurement_type=None,
+        measurement_unit=None,
+    )
+    kwargs = dict(
+        run_output_dir_path=str(run_dir),
+        run_id=valid_run_id,
+        metrics=get_run_metrics_dict(),
+        succeeded=False,
+    )
+    export_prometheus_metrics(**kwargs)
+    assert os.listdir(run_dir) == [] and os.listdir(textfile_dir) == []
+
+    override_settings(prometheus_textfile_dir=str(textfile_dir))
+    export_prometheus_metrics(**kwargs)
+    assert os.listdir(run_dir) == [f"metrics_{valid_run_id}.prom"]
+    with open(textfile_dir / "growth_job_pipeline.prom") as file:
+        assert (
+            'growth_job_pipeline_last_run_success{environment="staging",'
+            'measurement_type="",measurement_unit=""} 0'
+            in file.read()
+        )
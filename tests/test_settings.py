@@ -0,0 +1,155 @@
+import pytest
+from pydantic import ValidationError
+
+from growth_job_pipeline.config import config, get_settings, load_settings
+from growth_job_pipeline.models.validators.settings import Settings
+
+
+@pytest.fixture()
+def unloaded_settings(mocker) -> None:
+    """
+    Discards loaded settings for the test, restoring them after
+    :param mocker:
+    :return: None
+    """
+    mocker.patch("growth_job_pipeline.config.settings._settings", None)
+
+
+def test_load_settings__env_file(unloaded_settings) -> None:
+    """
+    Tests settings are read from the .env file, cast to their types
+    :return: None
+    """
+    settings = load_settings()
+    assert isinstance(settings, Settings)
+    assert settings.deploy_environment == "staging"
+    assert settings.telemetry_db_port == 1433
+    assert settings.telemetry_db_batch_size == 1000
+    assert settings.telemetry_db_columnar is False
+    assert settings.telemetry_db_pagination == "offset"
+    assert settings.output_dir == "/growth_job_pipeline_data"
+    assert settings.memory_budget_mb is None
+
+
+def test_load_settings__env_overrides(monkeypatch, unloaded_settings) -> None:
+    """
+    Tests environment variables override the .env file, empty ones are unset
+    :return: None
+    """
+    monkeypatch.setenv("TELEMETRY_DB_BATCH_SIZE", "10")
+    monkeypatch.setenv("TELEMETRY_DB_COLUMNAR", "true")
+    monkeypatch.setenv("MEASUREMENT_TYPE", "temp")
+    monkeypatch.setenv("MEMORY_BUDGET_MB", "")
+    monkeypatch.setenv("FROM_TIMESTAMP", "auto")
+    settings = load_settings()
+    assert settings.from_timestamp == "auto"
+    assert settings.telemetry_db_batch_size == 10
+    assert settings.telemetry_db_columnar is True
+    assert settings.measurement_type == "temp"
+    assert settings.memory_budget_mb is None
+
+
+def test_get_settings__loaded_once(mocker, unloaded_settings) -> None:
+    """
+    Tests get_settings reads config on first call only
+    :return: None
+    """
+    config_spy = mocker.patch(
+        "growth_job_pipeline.config.settings.config", wraps=config
+    )
+    settings = get_settings()
+    assert config_spy.call_count == len(Settings.model_fields)
+    assert get_settings() is settings
+    assert config_spy.call_count == len(Settings.model_fields)
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("TELEMETRY_DB_BATCH_SIZE", "lots"),
+        ("TELEMETRY_DB_BATCH_SIZE", "0"),
+        ("TELEMETRY_DB_BACKEND", "oracle"),
+        ("TELEMETRY_DB_PAGINATION", "random"),
+        ("MEASUREMENT_UNIT", "furlongs"),
+        ("FROM_TIMESTAMP", "invalid"),
+        ("LOG_FORMAT", "xml"),
+        ("OUTPUT_FORMAT", "orc"),
+    ],
+)
+def test_load_settings__invalid_raises(
+    key, value, monkeypatch, unloaded_settings, caplog
+) -> None:
+    """
+    Tests invalid config fails on load, logging the key
+    :return: None
+    """
+    monkeypatch.setenv(key, value)
+    with pytest.raises(ValidationError):
+        load_settings()
+    assert "ERROR" in caplog.text and key.lower() in caplog.text
+
+
+def test_load_settings__to_timestamp_before_from_raises(
+    monkeypatch, unloaded_settings
+) -> None:
+    """
+    Tests to_timestamp not after from_timestamp fails on load
+    :return: None
+    """
+    monkeypatch.setenv("FROM_TIMESTAMP", "2022-01-02T00:00:00")
+    monkeypatch.setenv("TO_TIMESTAMP", "2022-01-01T00:00:00")
+    with pytest.raises(ValidationError):
+        load_settings()
+
+
+def test_missing_run_keys(override_settings) -> None:
+    """
+    Tests keys a run needs are reported missing, for the backend chosen
+    :return: None
+    """
+    settings = override_settings(
+        yield_results_file=None,
+        measurement_type=None,
+        measurement_unit="C",
+        telemetry_db_backend="mssql",
+        telemetry_db_username="user",
+        telemetry_db_password=None,
+    )
+    assert settings.missing_run_keys() == [
+        "YIELD_RESULTS_FILE",
+        "MEASUREMENT_TYPE",
+        "TELEMETRY_DB_PASSWORD",
+    ]
+    settings = override_settings(
+        yield_results_file="yield_results.tsv",
+        measurement_type="temp",
+        telemetry_db_backend="sqlite",
+        telemetry_db_sqlite_path="telemetry.db",
+    )
+    assert settings.missing_run_keys() == []
+
+
+def test_load_settings__parquet_dataset_raises(
+    monkeypatch, unloaded_settings
+) -> None:
+    """
+    Tests Parquet output format with dataset output mode fails on load
+    :return: None
+    """
+    monkeypatch.setenv("OUTPUT_FORMAT", "parquet")
+    monkeypatch.setenv("OUTPUT_MODE", "dataset")
+    with pytest.raises(ValidationError):
+        load_settings()
+
+
+def test_load_settings__compressed_parquet_raises(
+    monkeypatch, unloaded_settings
+) -> None:
+    """
+    Tests output compression with Parquet output format fails on load
+    :return: None
+    """
+    monkeypatch.setenv("OUTPUT_FORMAT", "parquet")
+    monkeypatch.setenv("OUTPUT_COMPRESSION", "gzip")
+    with pytest.raises(ValidationError):
+        load_settings()
@@ -0,0 +1,311 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from growth_job_pipeline.config import get_settings
+from growth_job_pipeline.models.enums.telemetry_pagination import (
+    TelemetryPagination,
+)
+from growth_job_pipeline.telemetry_db.backends import get_telemetry_backend
+from growth_job_pipeline.telemetry_db.backends.sqlite import (
+    create_telemetry_table,
+    insert_telemetry_rows,
+    SqliteTelemetryBackend,
+)
+from growth_job_pipeline.telemetry_db.columnar import (
+    telemetry_columns_batcher,
+)
+from growth_job_pipeline.telemetry_db.db import (
+    get_row_count,
+    get_telemetry_db_cursor,
+    resumable_telemetry_entries_batcher,
+    telemetry_entries_batcher,
+    TelemetryConnection,
+)
+
+
+@pytest.fixture()
+def sqlite_timestamps(valid_timestamp) -> list[datetime.datetime]:
+    """
+    Returns ten timestamps 30 seconds apart
+    :param valid_timestamp:
+    :return: list[datetime.datetime]
+    """
+    return [
+        valid_timestamp + datetime.timedelta(seconds=30 * i) for i in range(10)
+    ]
+
+
+@pytest.fixture()
+def sqlite_backend(
+    tmp_path,
+    sqlite_timestamps,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> SqliteTelemetryBackend:
+    """
+    Returns a SQLite backend holding sqlite_timestamps readings, plus a reading
+    in another unit that should never be fetched
+    :param tmp_path:
+    :param sqlite_timestamps:
+    :param valid_measurement_type:
+    :param valid_measurement_unit:
+    :return: SqliteTelemetryBackend
+    """
+    path = str(tmp_path / "telemetry.db")
+    connection = sqlite3.connect(path)
+    create_telemetry_table(connection)
+    insert_telemetry_rows(
+        connection,
+        [
+            (
+                timestamp,
+                valid_measurement_type,
+                20.0 + i,
+                valid_measurement_unit,
+            )
+            for i, timestamp in enumerate(sqlite_timestamps)
+        ]
+        + [(sqlite_timestamps[0], valid_measurement_type, 70.0, "F")],
+    )
+    connection.close()
+    return SqliteTelemetryBackend(path=path)
+
+
+def test_sqlite_get_row_count(
+    sqlite_backend,
+    sqlite_timestamps,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests get_row_count against SQLite, including an exclusive lower bound
+    :return: None
+    """
+    cursor = get_telemetry_db_cursor(backend=sqlite_backend)
+    kwargs = dict(
+        cursor=cursor,
+        from_timestamp=sqlite_timestamps[2],
+        to_timestamp=sqlite_timestamps[5],
+        type_to_fetch=valid_measurement_type,
+        unit_to_fetch=valid_measurement_unit,
+        backend=sqlite_backend,
+    )
+    assert get_row_count(**kwargs) == 4
+    assert get_row_count(**kwargs, from_exclusive=True) == 3
+
+
+def test_sqlite_select_query__projects_columns_and_uses_index(
+    sqlite_backend,
+    sqlite_timestamps,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests the select query fetches only timestamp and value, seeking on the
+    (type, unit, timestamp) index with the enum params bound as plain values
+    :return: None
+    """
+    cursor = get_telemetry_db_cursor(backend=sqlite_backend)
+    query = sqlite_backend.select_query()
+    params = sqlite_backend.adapt_params(
+        (
+            sqlite_timestamps[0],
+            sqlite_timestamps[-1],
+            valid_measurement_type,
+            valid_measurement_unit,
+            0,
+            3,
+        )
+    )
+    plan = cursor.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    assert any("USING INDEX" in step[-1] for step in plan)
+    sqlite_backend.execute(
+        cursor,
+        query,
+        (
+            sqlite_timestamps[0],
+            sqlite_timestamps[-1],
+            valid_measurement_type,
+            valid_measurement_unit,
+            0,
+            3,
+        ),
+    )
+    assert [column[0] for column in cursor.description] == [
+        "timestamp",
+        "value",
+    ]
+
+
+@pytest.mark.parametrize("pagination", list(TelemetryPagination))
+def test_sqlite_telemetry_entries_batcher(
+    pagination,
+    sqlite_backend,
+    sqlite_timestamps,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests every pagination strategy fetches all entries in order, across batches
+    :return: None
+    """
+    batches = list(
+        telemetry_entries_batcher(
+            cursor=get_telemetry_db_cursor(backend=sqlite_backend),
+            type_to_fetch=valid_measurement_type,
+            unit_to_fetch=valid_measurement_unit,
+            from_timestamp=sqlite_timestamps[0],
+            to_timestamp=sqlite_timestamps[-1],
+            batch_size=3,
+            backend=sqlite_backend,
+            pagination=pagination,
+        )
+    )
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    entries = [entry for batch in batches for entry in batch]
+    assert [entry.timestamp for entry in entries] == sqlite_timestamps
+    assert [entry.value for entry in entries] == [20.0 + i for i in range(10)]
+    assert {entry.unit for entry in entries} == {valid_measurement_unit}
+
+
+def test_sqlite_resumable_batcher_resumes_after_timestamp(
+    sqlite_backend,
+    sqlite_timestamps,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests resumable_telemetry_entries_batcher skips entries up to resume timestamp
+    :return: None
+    """
+    batches = resumable_telemetry_entries_batcher(
+        type_to_fetch=valid_measurement_type,
+        unit_to_fetch=valid_measurement_unit,
+        from_timestamp=sqlite_timestamps[0],
+        to_timestamp=sqlite_timestamps[-1],
+        batch_size=4,
+        resume_after_timestamp=sqlite_timestamps[6],
+        backend=sqlite_backend,
+    )
+    assert [
+        entry.timestamp for batch in batches for entry in batch
+    ] == sqlite_timestamps[7:]
+
+
+def test_get_telemetry_backend__unknown_raises(mocker, caplog) -> None:
+    """
+    Tests get_telemetry_backend raises and logs for an unknown backend
+    :return: None
+    """
+    # settings validation rejects unknown backends, so bypass it
+    mocker.patch(
+        "growth_job_pipeline.config.settings._settings",
+        get_settings().model_copy(update={"telemetry_db_backend": "oracle"}),
+    )
+    with pytest.raises(ValueError):
+        get_telemetry_backend()
+    assert (
+        "ERROR" in caplog.text
+        and "Unknown TELEMETRY_DB_BACKEND" in caplog.text
+    )
+
+
+@pytest.mark.parametrize("pagination", list(TelemetryPagination))
+def test_sqlite_telemetry_columns_batcher(
+    pagination,
+    sqlite_backend,
+    sqlite_timestamps,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests the column-wise batcher falls back to DB-API rows for SQLite and
+    returns the same readings as telemetry_entries_batcher
+    :return: None
+    """
+    batches = list(
+        telemetry_columns_batcher(
+            cursor=get_telemetry_db_cursor(backend=sqlite_backend),
+            type_to_fetch=valid_measurement_type,
+            unit_to_fetch=valid_measurement_unit,
+            from_timestamp=sqlite_timestamps[0],
+            to_timestamp=sqlite_timestamps[-1],
+            batch_size=4,
+            backend=sqlite_backend,
+            pagination=pagination,
+        )
+    )
+    assert [batch.num_rows for batch in batches] == [4, 4, 2]
+    assert [
+        timestamp for batch in batches for timestamp in batch.timestamps
+    ] == sqlite_timestamps
+    assert [value for batch in batches for value in batch.values] == [
+        20.0 + i for i in range(10)
+    ]
+
+
+def test_sqlite_resumable_batcher__columnar(
+    sqlite_backend,
+    sqlite_timestamps,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests resumable_telemetry_entries_batcher resumes column-wise batches
+    :return: None
+    """
+    batches = resumable_telemetry_entries_batcher(
+        type_to_fetch=valid_measurement_type,
+        unit_to_fetch=valid_measurement_unit,
+        from_timestamp=sqlite_timestamps[0],
+        to_timestamp=sqlite_timestamps[-1],
+        batch_size=4,
+        resume_after_timestamp=sqlite_timestamps[2],
+        backend=sqlite_backend,
+        columnar=True,
+    )
+    assert [
+        timestamp for batch in batches for timestamp in batch.timestamps
+    ] == sqlite_timestamps[3:]
+
+
+def test_sqlite_resumable_batcher__reuses_connection(
+    mocker,
+    sqlite_backend,
+    sqlite_timestamps,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests a TelemetryConnection is connected once across batchers run to the end,
+    and discarded if a batcher is closed early
+    :return: None
+    """
+    connect_spy = mocker.spy(sqlite_backend, "connect")
+    connection = TelemetryConnection(backend=sqlite_backend)
+    batcher_kwargs = dict(
+        type_to_fetch=valid_measurement_type,
+        unit_to_fetch=valid_measurement_unit,
+        from_timestamp=sqlite_timestamps[0],
+        to_timestamp=sqlite_timestamps[-1],
+        batch_size=4,
+        connection=connection,
+    )
+    for _ in range(2):
+        batches = resumable_telemetry_entries_batcher(**batcher_kwargs)
+        assert [
+            entry.timestamp for batch in batches for entry in batch
+        ] == sqlite_timestamps
+    assert connect_spy.call_count == 1
+
+    batches = resumable_telemetry_entries_batcher(**batcher_kwargs)
+    next(batches)
+    batches.close()
+    assert connection._cursor is None
+    assert (
+        len(list(resumable_telemetry_entries_batcher(**batcher_kwargs))) == 3
+    )
+    assert connect_spy.call_count == 2
+    connection.close()
@@ -6,12 +6,16 @@ import pyodbc
 import pytest
 from pydantic import ValidationError
 
+from growth_job_pipeline.models.records.telemetry_entry import (
+    TelemetryEntryRecord,
+)
 from growth_job_pipeline.models.validators.telemetry_entry import (
     TelemetryEntry,
 )
 from growth_job_pipeline.telemetry_db.db import (
     get_row_count,
     get_validated_entries,
+    resumable_telemetry_entries_batcher,
     telemetry_entries_batcher,
 )
 
@@ -87,6 +91,15 @@ def test_get_db_row_count(
             valid_measurement_unit,
         ),
     )
+    # enums bound as varchar, not pyodbc's default nvarchar for str
+    cursor.setinputsizes.assert_called_with(
+        [
+            (pyodbc.SQL_TYPE_TIMESTAMP, 27, 7),
+            (pyodbc.SQL_TYPE_TIMESTAMP, 27, 7),
+            (pyodbc.SQL_VARCHAR, 50, 0),
+            (pyodbc.SQL_VARCHAR, 50, 0),
+        ]
+    )
 
 
 def test_get_db_row_error_raised_and_logged(
@@ -131,7 +144,7 @@ def test_get_validated_entries(
     valid_measurement_unit,
 ) -> None:
     """
-    Tests that get_validated_entries returns a list of TelemetryEntry
+    Tests that get_validated_entries returns a list of TelemetryEntryRecord
     :param valid_timestamp: datetime.datetime
     :param valid_timestamp__later: datetime.datetime
     :param valid_measurement_type: MeasurementType
@@ -152,8 +165,12 @@ def test_get_validated_entries(
         valid_measurement_value,
         valid_measurement_unit,
     )
-    entry1 = TelemetryEntry(**dict(zip(column_names, row1)))
-    entry2 = TelemetryEntry(**dict(zip(column_names, row2)))
+    entry1 = TelemetryEntryRecord(
+        **TelemetryEntry(**dict(zip(column_names, row1))).model_dump()
+    )
+    entry2 = TelemetryEntryRecord(
+        **TelemetryEntry(**dict(zip(column_names, row2))).model_dump()
+    )
     rows = [row1, row2]
     assert get_validated_entries(
         column_names=column_names, rows=rows, num_batches_fetched=1
@@ -205,7 +222,7 @@ def test_telemetry_entries_batcher(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     """
-    Tests that telemetry_entries_batcher returns a list of TelemetryEntry
+    Tests that telemetry_entries_batcher returns a list of TelemetryEntryRecord
     :param mocker: MockerFixture
     :param valid_timestamp: datetime.datetime
     :param valid_timestamp__later: datetime.datetime
@@ -224,20 +241,10 @@ def test_telemetry_entries_batcher(
         return_value=2,
     )
     cursor = mocker.MagicMock(spec=pyodbc.Cursor)
-    cursor.description = [("timestamp",), ("type",), ("value",), ("unit",)]
+    cursor.description = [("timestamp",), ("value",)]
     cursor.execute().fetchall.return_value = [
-        (
-            valid_timestamp,
-            valid_measurement_type,
-            valid_measurement_value,
-            valid_measurement_unit,
-        ),
-        (
-            valid_timestamp__later,
-            valid_measurement_type,
-            valid_measurement_value,
-            valid_measurement_unit,
-        ),
+        (valid_timestamp, valid_measurement_value),
+        (valid_timestamp__later, valid_measurement_value),
     ]
     batcher = telemetry_entries_batcher(
         cursor=cursor,
@@ -247,10 +254,55 @@ def test_telemetry_entries_batcher(
         to_timestamp=valid_to_timestamp,
         batch_size=1000,
     )
-    assert next(batcher) == [telemetry_entry, telemetry_entry__later]
+    assert next(batcher) == [
+        TelemetryEntryRecord(**telemetry_entry.model_dump()),
+        TelemetryEntryRecord(**telemetry_entry__later.model_dump()),
+    ]
     assert "2 rows to fetch" in caplog.text
 
 
+def test_telemetry_entries_batcher__unexpected_columns_raises(
+    mocker: MockerFixture,
+    valid_timestamp,
+    valid_to_timestamp,
+    valid_measurement_type,
+    valid_measurement_value,
+    valid_measurement_unit,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """
+    Tests that telemetry_entries_batcher raises if the result set has other columns
+    :param mocker: MockerFixture
+    :param valid_timestamp: datetime.datetime
+    :param valid_to_timestamp: datetime.datetime
+    :param valid_measurement_type: MeasurementType
+    :param valid_measurement_value: float
+    :param valid_measurement_unit: MeasurementUnit
+    :param caplog: LogCaptureFixture
+    :return: None
+    """
+    mocker.patch(
+        "growth_job_pipeline.telemetry_db.db.get_row_count",
+        return_value=1,
+    )
+    cursor = mocker.MagicMock(spec=pyodbc.Cursor)
+    cursor.description = [("value",), ("timestamp",)]
+    cursor.execute().fetchall.return_value = [
+        (valid_measurement_value, valid_timestamp)
+    ]
+    with pytest.raises(ValueError):
+        next(
+            telemetry_entries_batcher(
+                cursor=cursor,
+                type_to_fetch=valid_measurement_type,
+                unit_to_fetch=valid_measurement_unit,
+                from_timestamp=valid_timestamp,
+                to_timestamp=valid_to_timestamp,
+            )
+        )
+    assert "ERROR" in caplog.text and "expected columns" in caplog.text
+
+
 def test_telemetry_entries_batcher_raises_and_logs(
     mocker: MockerFixture,
     valid_timestamp,
@@ -274,7 +326,7 @@ def test_telemetry_entries_batcher_raises_and_logs(
         return_value=2,
     )
     cursor = mocker.MagicMock(spec=pyodbc.Cursor, side_effect=pyodbc.Error)
-    cursor.description = [("timestamp",), ("type",), ("value",), ("unit",)]
+    cursor.description = [("timestamp",), ("value",)]
     cursor.execute = mocker.MagicMock(side_effect=pyodbc.Error)
     with pytest.raises(pyodbc.Error):
         batcher = telemetry_entries_batcher(
@@ -291,3 +343,94 @@ def test_telemetry_entries_batcher_raises_and_logs(
         and "Could not fetch batch from telemetry DB. Batches fetched=0"
         in caplog.text
     )
+
+
+def test_resumable_telemetry_entries_batcher_reconnects_after_last_batch(
+    mocker: MockerFixture,
+    valid_timestamp,
+    valid_to_timestamp,
+    valid_measurement_type,
+    valid_measurement_unit,
+    telemetry_entry,
+    telemetry_entry__later,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """
+    Tests that resumable_telemetry_entries_batcher reconnects on pyodbc.Error
+    and resumes after the last timestamp consumed
+    :param mocker: MockerFixture
+    :param valid_timestamp: datetime.datetime
+    :param valid_to_timestamp: datetime.datetime
+    :param valid_measurement_type: MeasurementType
+    :param valid_measurement_unit: MeasurementUnit
+    :param telemetry_entry: TelemetryEntry
+    :param telemetry_entry__later: TelemetryEntry
+    :param caplog: LogCaptureFixture
+    :return: None
+    """
+
+    def failing_batcher(**kwargs):
+        yield [telemetry_entry]
+        raise pyodbc.Error("connection lost")
+
+    def resumed_batcher(**kwargs):
+        yield [telemetry_entry__later]
+
+    get_cursor = mocker.patch(
+        "growth_job_pipeline.telemetry_db.db.get_telemetry_db_cursor"
+    )
+    batcher = mocker.patch(
+        "growth_job_pipeline.telemetry_db.db.telemetry_entries_batcher",
+        side_effect=[failing_batcher(), resumed_batcher()],
+    )
+    batches = list(
+        resumable_telemetry_entries_batcher(
+            type_to_fetch=valid_measurement_type,
+            unit_to_fetch=valid_measurement_unit,
+            from_timestamp=valid_timestamp,
+            to_timestamp=valid_to_timestamp,
+            max_reconnects=1,
+        )
+    )
+    assert batches == [[telemetry_entry], [telemetry_entry__later]]
+    assert get_cursor.call_count == 2
+    resumed_kwargs = batcher.call_args_list[1].kwargs
+    assert resumed_kwargs["from_timestamp"] == telemetry_entry.timestamp
+    assert resumed_kwargs["from_exclusive"] is True
+    assert "WARNING" in caplog.text and "Reconnecting" in caplog.text
+
+
+def test_resumable_telemetry_entries_batcher_gives_up(
+    mocker: MockerFixture,
+    valid_timestamp,
+    valid_to_timestamp,
+    valid_measurement_type,
+    valid_measurement_unit,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """
+    Tests that resumable_telemetry_entries_batcher raises once max_reconnects used
+    :param mocker: MockerFixture
+    :param valid_timestamp: datetime.datetime
+    :param valid_to_timestamp: datetime.datetime
+    :param valid_measurement_type: MeasurementType
+    :param valid_measurement_unit: MeasurementUnit
+    :param caplog: LogCaptureFixture
+    :return: None
+    """
+    mocker.patch("growth_job_pipeline.telemetry_db.db.get_telemetry_db_cursor")
+    mocker.patch(
+        "growth_job_pipeline.telemetry_db.db.telemetry_entries_batcher",
+        side_effect=pyodbc.Error("connection lost"),
+    )
+    with pytest.raises(pyodbc.Error):
+        list(
+            resumable_telemetry_entries_batcher(
+                type_to_fetch=valid_measurement_type,
+                unit_to_fetch=valid_measurement_unit,
+                from_timestamp=valid_timestamp,
+                to_timestamp=valid_to_timestamp,
+                max_reconnects=2,
+            )
+        )
+    assert "Giving up after 2 reconnects" in caplog.text
@@ -0,0 +1,80 @@
+import datetime
+from array import array
+
+import pytest
+
+from growth_job_pipeline.models.records.telemetry_columns import (
+    TelemetryColumns,
+    validate_telemetry_columns,
+)
+
+
+@pytest.fixture()
+def telemetry_columns(
+    valid_timestamp,
+    valid_timestamp__later,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> TelemetryColumns:
+    """
+    Returns valid telemetry columns with two entries
+    :return: TelemetryColumns
+    """
+    return TelemetryColumns(
+        timestamps=[valid_timestamp, valid_timestamp__later],
+        values=array("d", [20.5, 21.0]),
+        type=valid_measurement_type,
+        unit=valid_measurement_unit,
+    )
+
+
+def test_validate_telemetry_columns__valid(
+    telemetry_columns, valid_timestamp, valid_to_timestamp
+) -> None:
+    """
+    Tests valid telemetry columns are returned unchanged
+    :return: None
+    """
+    assert (
+        validate_telemetry_columns(
+            telemetry_columns, valid_timestamp, valid_to_timestamp
+        )
+        is telemetry_columns
+    )
+    assert telemetry_columns.num_rows == 2
+
+
+@pytest.mark.parametrize(
+    "replacements",
+    [
+        {"values": array("d", [20.5])},
+        {"values": array("d", [20.5, float("nan")])},
+        {
+            "timestamps": [
+                datetime.datetime(2022, 1, 1, 0, 0, 30),
+                datetime.datetime(2022, 1, 1, 0, 0, 0),
+            ]
+        },
+        {"timestamps": ["2022-01-01T00:00:00", "2022-01-01T00:00:30"]},
+        {
+            "timestamps": [
+                datetime.datetime(2021, 12, 31),
+                datetime.datetime(2022, 1, 1),
+            ]
+        },
+    ],
+)
+def test_validate_telemetry_columns__invalid_raises(
+    replacements, telemetry_columns, valid_timestamp, valid_to_timestamp
+) -> None:
+    """
+    Tests mismatched lengths, NaN values, unordered, non-datetime and out of range
+    timestamps raise ValueError
+    :return: None
+    """
+    with pytest.raises(ValueError):
+        validate_telemetry_columns(
+            telemetry_columns._replace(**replacements),
+            valid_timestamp,
+            valid_to_timestamp,
+        )
@@ -0,0 +1,75 @@
+import pytest
+from pydantic import ValidationError
+
+from growth_job_pipeline.models.records.telemetry_entry import (
+    TelemetryEntryRecord,
+    validate_telemetry_rows,
+)
+
+
+def test_validate_telemetry_rows__constant_fields(
+    telemetry_entry,
+    telemetry_entry__later,
+    valid_measurement_type,
+    valid_measurement_unit,
+) -> None:
+    """
+    Tests rows are validated to records as TelemetryEntry would, with constant fields
+    filled in and enums as their values
+    :return: None
+    """
+    records = validate_telemetry_rows(
+        column_names=["timestamp", "value"],
+        rows=[
+            (telemetry_entry.timestamp.isoformat(), telemetry_entry.value),
+            (
+                telemetry_entry__later.timestamp,
+                int(telemetry_entry__later.value),
+            ),
+        ],
+        constant_fields={
+            "type": valid_measurement_type,
+            "unit": valid_measurement_unit,
+        },
+    )
+    assert records == [
+        TelemetryEntryRecord(**telemetry_entry.model_dump()),
+        TelemetryEntryRecord(
+            **telemetry_entry__later.model_dump(),
+        )._replace(value=float(int(telemetry_entry__later.value))),
+    ]
+    assert all(type(record.type) is str for record in records)
+    assert isinstance(records[1].value, float)
+
+
+def test_validate_telemetry_rows__all_columns(telemetry_entry) -> None:
+    """
+    Tests rows holding every field are validated without constant fields
+    :return: None
+    """
+    assert validate_telemetry_rows(
+        column_names=["timestamp", "type", "value", "unit"],
+        rows=[tuple(telemetry_entry.model_dump().values())],
+    ) == [TelemetryEntryRecord(**telemetry_entry.model_dump())]
+
+
+@pytest.mark.parametrize(
+    "row, constant_fields",
+    [
+        (("2022-01-01", 20.0), {"type": "temp", "unit": "C"}),
+        (("2022-01-01T00:00:00", "warm"), {"type": "temp", "unit": "C"}),
+        (("2022-01-01T00:00:00", 20.0), {"type": "humidity", "unit": "C"}),
+        (("2022-01-01T00:00:00", 20.0), {"type": "temp", "unit": "K"}),
+    ],
+)
+def test_validate_telemetry_rows__invalid_raises(row, constant_fields) -> None:
+    """
+    Tests an invalid row or constant field raises ValidationError
+    :return: None
+    """
+    with pytest.raises(ValidationError):
+        validate_telemetry_rows(
+            column_names=["timestamp", "value"],
+            rows=[row],
+            constant_fields=constant_fields,
+        )
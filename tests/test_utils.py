@@ -14,12 +14,13 @@ from growth_job_pipeline.utils import (
     split_line_on_whitespace,
     latest_datetime_possible_for_date,
 )
+from growth_job_pipeline.watermark import write_watermark
 
 
-def test_get_config_timestamps__defined(mocker):
-    mocker.patch(
-        "growth_job_pipeline.utils.utils.config",
-        return_value="2021-01-01T00:00:00",
+def test_get_config_timestamps__defined(override_settings):
+    override_settings(
+        from_timestamp="2021-01-01T00:00:00",
+        to_timestamp="2021-01-02T00:00:00",
     )
     config_timestamps = get_config_timestamps()
     assert isinstance(config_timestamps, ConfigTimestamps)
@@ -27,35 +28,25 @@ def test_get_config_timestamps__defined(mocker):
         2021, 1, 1, 0, 0
     )
     assert config_timestamps.to_timestamp == datetime.datetime(
-        2021, 1, 1, 0, 0
+        2021, 1, 2, 0, 0
     )
 
 
-def test_get_config_timestamps__undefined(mocker):
-    mocker.patch(
-        "growth_job_pipeline.utils.utils.config",
-        return_value=None,
-    )
+def test_get_config_timestamps__undefined(override_settings):
+    override_settings(from_timestamp=None, to_timestamp=None)
     config_timestamps = get_config_timestamps()
     assert isinstance(config_timestamps, ConfigTimestamps)
     assert config_timestamps.from_timestamp is None
     assert config_timestamps.to_timestamp is None
 
 
-def test_get_config_timestamps__invalid(mocker):
-    mocker.patch(
-        "growth_job_pipeline.utils.utils.config",
-        return_value="invalid",
-    )
+def test_get_config_timestamps__invalid(override_settings):
     with pytest.raises(ValueError):
-        get_config_timestamps()
+        override_settings(from_timestamp="invalid")
 
 
-def test_get_config_timestamps__from_null_to_defined(mocker):
-    mocker.patch(
-        "growth_job_pipeline.utils.utils.config",
-        side_effect=[None, "2021-01-01T00:00:00"],
-    )
+def test_get_config_timestamps__from_null_to_defined(override_settings):
+    override_settings(from_timestamp=None, to_timestamp="2021-01-01T00:00:00")
     config_timestamps = get_config_timestamps()
     assert isinstance(config_timestamps, ConfigTimestamps)
     assert config_timestamps.from_timestamp is None
@@ -64,6 +55,43 @@ def test_get_config_timestamps__from_null_to_defined(mocker):
     )
 
 
+def test_get_config_timestamps__auto(
+    tmp_path, override_settings, watermark, valid_timestamp
+):
+    override_settings(
+        from_timestamp="auto", to_timestamp=None, output_dir=str(tmp_path)
+    )
+    before = datetime.datetime.now()
+    config_timestamps = get_config_timestamps()
+    assert config_timestamps.incremental
+    assert config_timestamps.from_timestamp is None
+    assert before <= config_timestamps.to_timestamp <= datetime.datetime.now()
+
+    write_watermark(str(tmp_path), watermark)
+    config_timestamps = get_config_timestamps()
+    assert config_timestamps.from_timestamp == valid_timestamp
+    assert config_timestamps.to_timestamp >= before
+
+
+def test_get_config_timestamps__auto_capped(
+    tmp_path, override_settings, watermark, valid_to_timestamp
+):
+    override_settings(
+        from_timestamp="auto",
+        to_timestamp=valid_to_timestamp,
+        output_dir=str(tmp_path),
+    )
+    write_watermark(str(tmp_path), watermark)
+    config_timestamps = get_config_timestamps()
+    assert config_timestamps.to_timestamp == valid_to_timestamp
+    with pytest.raises(ValueError):
+        coalesce_run_timestamps(
+            config_timestamps.model_copy(
+                update={"from_timestamp": valid_to_timestamp}
+            )
+        )
+
+
 def test_coalesce_run_timestamps__from_timestamp_defined_to_timestamp_defined():
     config_timestamps = ConfigTimestamps(
         from_timestamp=datetime.datetime(2021, 1, 1, 0, 0),
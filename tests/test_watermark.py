@@ -0,0 +1,46 @@
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from growth_job_pipeline.watermark import read_watermark, write_watermark
+from growth_job_pipeline.watermark.watermark import get_watermark_path
+
+
+def test_write_read_watermark_round_trip(tmp_path, watermark) -> None:
+    """
+    Tests that a written watermark reads back unchanged, with no temp file left
+    :param tmp_path:
+    :param watermark:
+    :return: None
+    """
+    write_watermark(str(tmp_path), watermark)
+    assert read_watermark(str(tmp_path)) == watermark
+    assert os.listdir(tmp_path) == ["watermark.json"]
+
+
+def test_read_watermark__missing_returns_none(tmp_path) -> None:
+    """
+    Tests that read_watermark returns None when no watermark written
+    :param tmp_path:
+    :return: None
+    """
+    assert read_watermark(str(tmp_path)) is None
+
+
+def test_read_watermark__invalid_raises_and_logs(
+    tmp_path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """
+    Tests that read_watermark raises and logs on an invalid watermark file
+    :param tmp_path:
+    :param caplog:
+    :return: None
+    """
+    with open(get_watermark_path(str(tmp_path)), "w") as file:
+        file.write('{"to_timestamp": "yesterday"}')
+    with pytest.raises(ValidationError):
+        read_watermark(str(tmp_path))
+    assert (
+        "ERROR" in caplog.text and "Cannot validate watermark" in caplog.text
+    )
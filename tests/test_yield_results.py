@@ -2,7 +2,11 @@ import pytest
 from pydantic import ValidationError
 from pytest_mock import MockerFixture
 
-from growth_job_pipeline.yield_tsv_reader import get_ascending_yield_results
+from growth_job_pipeline.yield_tsv_reader import (
+    get_ascending_yield_results,
+    YieldResultsFileCache,
+)
+from growth_job_pipeline.yield_tsv_reader import yield_results
 
 
 @pytest.fixture()
@@ -59,16 +63,14 @@ def invalid_data_line(
 
 def test_get_yield_results__happy_path(
     mocker: MockerFixture,
+    override_settings,
     data_lines,
     valid_timestamp,
     valid_to_timestamp,
     yield_result__job1,
     yield_result__job2,
 ):
-    mocker.patch(
-        "growth_job_pipeline.yield_tsv_reader.yield_results.config",
-        return_value="whatever.csv",
-    )
+    override_settings(yield_results_file="whatever.csv")
     yield_results_file_mock = mocker.mock_open(read_data="\n".join(data_lines))
     mocker.patch("builtins.open", yield_results_file_mock)
     assert get_ascending_yield_results(
@@ -78,16 +80,14 @@ def test_get_yield_results__happy_path(
 
 def test_get_yield_results__invalid_data_raises(
     mocker: MockerFixture,
+    override_settings,
     data_lines,
     invalid_data_line,
     valid_timestamp,
     valid_to_timestamp,
     caplog,
 ):
-    mocker.patch(
-        "growth_job_pipeline.yield_tsv_reader.yield_results.config",
-        return_value="whatever.csv",
-    )
+    override_settings(yield_results_file="whatever.csv")
     yield_results_file_mock = mocker.mock_open(
         read_data="\n".join(data_lines + [invalid_data_line])
     )
@@ -104,16 +104,14 @@ def test_get_yield_results__invalid_data_raises(
 
 def test_get_yield_results__io_error(
     mocker: MockerFixture,
+    override_settings,
     data_lines,
     invalid_data_line,
     valid_timestamp,
     valid_to_timestamp,
     caplog,
 ):
-    mocker.patch(
-        "growth_job_pipeline.yield_tsv_reader.yield_results.config",
-        return_value="whatever.csv",
-    )
+    override_settings(yield_results_file="whatever.csv")
     mock = mocker.patch("builtins.open")
     mock.side_effect = IOError()
     with pytest.raises(IOError):
@@ -124,3 +122,69 @@ def test_get_yield_results__io_error(
         "ERROR" in caplog.text
         and "Cannot read from yield results file" in caplog.text
     )
+
+
+def test_yield_results_file_cache__parses_appended_lines(
+    mocker: MockerFixture,
+    tmp_path,
+    data_lines,
+    valid_timestamp,
+    valid_to_timestamp,
+    yield_result__job1,
+    yield_result__job2,
+):
+    """
+    Tests YieldResultsFileCache parses only lines appended since the last read, and a
+    trailing line without newline again on the next read
+    """
+    yield_results_file = tmp_path / "yield_results.tsv"
+    yield_results_file.write_text("\n".join(data_lines[:2]) + "\n")
+    cache = YieldResultsFileCache(yield_results_file=str(yield_results_file))
+    validate_spy = mocker.spy(yield_results, "validate_yield_results")
+    assert cache.get_ascending_yield_results(
+        from_timestamp=valid_timestamp, to_timestamp=valid_to_timestamp
+    ) == [yield_result__job1]
+
+    with open(yield_results_file, "a") as file:
+        file.write(data_lines[2])
+    for _ in range(2):
+        assert cache.get_ascending_yield_results(
+            from_timestamp=valid_timestamp, to_timestamp=valid_to_timestamp
+        ) == [yield_result__job1, yield_result__job2]
+    assert cache.num_results == 1
+
+    with open(yield_results_file, "a") as file:
+        file.write("\n")
+    assert cache.get_ascending_yield_results(
+        from_timestamp=valid_timestamp, to_timestamp=valid_to_timestamp
+    ) == [yield_result__job1, yield_result__job2]
+    assert cache.num_results == 2
+    parsed_lines = [
+        line for call in validate_spy.call_args_list for line in call.args[1]
+    ]
+    assert len(parsed_lines) == 4
+
+
+def test_yield_results_file_cache__rereads_replaced_file(
+    tmp_path,
+    data_lines,
+    valid_timestamp,
+    valid_to_timestamp,
+    yield_result__job2,
+):
+    """
+    Tests YieldResultsFileCache reads a file replaced with fewer lines afresh
+    """
+    yield_results_file = tmp_path / "yield_results.tsv"
+    yield_results_file.write_text("\n".join(data_lines) + "\n")
+    cache = YieldResultsFileCache(yield_results_file=str(yield_results_file))
+    cache.get_ascending_yield_results(
+        from_timestamp=valid_timestamp, to_timestamp=valid_to_timestamp
+    )
+    yield_results_file.write_text(
+        "\n".join([data_lines[0], data_lines[2]]) + "\n"
+    )
+    assert cache.get_ascending_yield_results(
+        from_timestamp=valid_timestamp, to_timestamp=valid_to_timestamp
+    ) == [yield_result__job2]
+    assert cache.num_results == 1